@@ -197,7 +197,7 @@ def generate_media_id_from_key(object_key: str) -> str:
     base_name = filename.rsplit('.', 1)[0] if '.' in filename else filename
     
     # Use hash of full path for consistency
-    path_hash = hashlib.md5(object_key.encode()).hexdigest()[:8]
+    path_hash = hashlib.md5(object_key.encode(), usedforsecurity=False).hexdigest()[:8]
     return f"{base_name}_{path_hash}"
 
 def generate_audit_id() -> str:
@@ -2,10 +2,12 @@ import json
 import boto3
 import os
 import uuid
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logger = logging.getLogger()
@@ -26,6 +28,20 @@ MODERATOR_ALERTS_TOPIC_ARN = os.environ['MODERATOR_ALERTS_TOPIC_ARN']
 moderator_profile_table = dynamodb.Table(MODERATOR_PROFILE_TABLE_NAME)
 review_queue_table = dynamodb.Table(REVIEW_QUEUE_TABLE_NAME)
 
+# Concurrent review limits per moderator role
+ROLE_MAX_CONCURRENT_REVIEWS = {'junior': 3, 'senior': 5, 'lead': 7}
+
+# Short-lived per-container cache of workload counts keyed by moderatorId,
+# holding (monotonic fetch time, count); a statistics request reads the
+# same moderator's workload more than once
+WORKLOAD_CACHE_TTL_SECONDS = 5.0
+workload_cache: Dict[str, Tuple[float, int]] = {}
+
+# Worker pool for per-moderator workload queries, reused across warm
+# invocations; sized to botocore's default connection pool
+MAX_WORKLOAD_WORKERS = 10
+workload_executor = ThreadPoolExecutor(max_workers=MAX_WORKLOAD_WORKERS)
+
 def handler(event, context):
     """
     Lambda function for moderator account management.
@@ -523,9 +539,13 @@ def list_moderators_direct(params: Dict[str, Any]) -> Dict[str, Any]:
         response = moderator_profile_table.scan(**scan_params)
         moderators = response.get('Items', [])
         
-        # Add current workload for each moderator
-        for moderator in moderators:
-            moderator['statistics']['currentWorkload'] = get_current_workload(moderator['moderatorId'])
+        # Add current workload for each moderator, querying concurrently
+        workloads = workload_executor.map(
+            lambda moderator: get_current_workload(moderator['moderatorId']),
+            moderators
+        )
+        for moderator, workload in zip(moderators, workloads):
+            moderator['statistics']['currentWorkload'] = workload
         
         return {
             'success': True,
@@ -602,15 +622,14 @@ def generate_temporary_password() -> str:
 
 def get_max_concurrent_reviews(role: str) -> int:
     """Get maximum concurrent reviews for a role."""
-    role_limits = {
-        'junior': 3,
-        'senior': 5,
-        'lead': 7
-    }
-    return role_limits.get(role, 3)
+    return ROLE_MAX_CONCURRENT_REVIEWS.get(role, 3)
 
 def get_current_workload(moderator_id: str) -> int:
-    """Get current number of active reviews for a moderator."""
+    """Get current number of active reviews for a moderator, cached briefly per container."""
+    cached = workload_cache.get(moderator_id)
+    if cached and time.monotonic() - cached[0] < WORKLOAD_CACHE_TTL_SECONDS:
+        return cached[1]
+    
     try:
         response = review_queue_table.query(
             IndexName='ModeratorIndex',
@@ -623,6 +642,7 @@ def get_current_workload(moderator_id: str) -> int:
                 ':in_progress': 'in_progress'
             }
         )
+        workload_cache[moderator_id] = (time.monotonic(), response['Count'])
         return response['Count']
     except Exception as e:
         logger.error(f"Error getting current workload: {str(e)}")
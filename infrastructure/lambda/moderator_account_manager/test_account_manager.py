@@ -17,13 +17,15 @@ from index import (
     update_moderator_profile_direct, delete_moderator_account_direct,
     list_moderators_direct, get_moderator_statistics,
     generate_temporary_password, get_max_concurrent_reviews,
-    decimal_to_float
+    get_current_workload, workload_cache, decimal_to_float
 )
 
 class TestModeratorAccountManager(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        workload_cache.clear()
+        
         self.mock_cognito = Mock()
         self.mock_dynamodb = Mock()
         self.mock_sns = Mock()
@@ -125,6 +127,16 @@ class TestModeratorAccountManager(unittest.TestCase):
         self.assertIn('profile', result)
         self.assertEqual(result['profile']['moderatorId'], 'mod_123456789abc')
 
+    @patch('index.review_queue_table')
+    def test_get_current_workload_cached(self, mock_review_table):
+        """Test that back-to-back workload reads share one query."""
+        mock_review_table.query.return_value = {'Count': 2}
+        
+        self.assertEqual(get_current_workload('mod_123456789abc'), 2)
+        self.assertEqual(get_current_workload('mod_123456789abc'), 2)
+        
+        self.assertEqual(mock_review_table.query.call_count, 1)
+
     @patch('index.moderator_profile_table')
     def test_get_moderator_profile_not_found(self, mock_table):
         """Test moderator profile retrieval when moderator doesn't exist."""
@@ -205,18 +217,27 @@ class TestModeratorAccountManager(unittest.TestCase):
     def test_list_moderators_success(self, mock_table, mock_workload):
         """Test successful moderator listing."""
         # Mock scan response
+        other_profile = {
+            **self.sample_profile,
+            'moderatorId': 'mod_other',
+            'statistics': dict(self.sample_profile['statistics'])
+        }
         mock_table.scan.return_value = {
-            'Items': [self.sample_profile]
+            'Items': [self.sample_profile, other_profile]
         }
         
         # Mock workload calculation
-        mock_workload.return_value = 2
+        mock_workload.side_effect = lambda moderator_id: {'mod_123456789abc': 2, 'mod_other': 4}[moderator_id]
         
         result = list_moderators_direct({'status': 'active'})
         
         self.assertTrue(result['success'])
-        self.assertEqual(result['count'], 1)
+        self.assertEqual(result['count'], 2)
         self.assertIn('moderators', result)
+        
+        # Concurrent workload queries land on the right moderators
+        workloads = [moderator['statistics']['currentWorkload'] for moderator in result['moderators']]
+        self.assertEqual(workloads, [2, 4])
 
     @patch('index.count_reviews_in_period')
     @patch('index.calculate_average_response_time')
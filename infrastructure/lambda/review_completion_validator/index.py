@@ -1,4 +1,8 @@
 import json
+try:
+    import orjson
+except ImportError:  # Code.fromAsset does not bundle requirements.txt; fall back to stdlib json
+    orjson = None
 import boto3
 import os
 import uuid
@@ -7,17 +11,16 @@ from typing import Dict, Any, List, Optional
 import logging
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-lambda_client = boto3.client('lambda')
-sns_client = boto3.client('sns')
-bedrock_client = boto3.client('bedrock-runtime')
-
 # Environment variables
 REVIEW_QUEUE_TABLE_NAME = os.environ['REVIEW_QUEUE_TABLE_NAME']
 MODERATOR_PROFILE_TABLE_NAME = os.environ['MODERATOR_PROFILE_TABLE_NAME']
@@ -26,11 +29,75 @@ AUDIT_TABLE_NAME = os.environ['AUDIT_TABLE_NAME']
 TRUST_SCORE_CALCULATOR_FUNCTION_NAME = os.environ.get('TRUST_SCORE_CALCULATOR_FUNCTION_NAME')
 MODERATOR_ALERTS_TOPIC_ARN = os.environ['MODERATOR_ALERTS_TOPIC_ARN']
 
-# DynamoDB tables
-review_queue_table = dynamodb.Table(REVIEW_QUEUE_TABLE_NAME)
-moderator_profile_table = dynamodb.Table(MODERATOR_PROFILE_TABLE_NAME)
-review_decision_table = dynamodb.Table(REVIEW_DECISION_TABLE_NAME)
-audit_table = dynamodb.Table(AUDIT_TABLE_NAME)
+# Shared client configuration: keep-alive connections reused across warm
+# invocations, a pool large enough for the side-effect workers, and adaptive
+# retries for throttling
+BOTO_CONFIG = Config(
+    max_pool_connections=16,
+    tcp_keepalive=True,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# AWS clients and tables are created on first use and cached for the life of
+# the container, so an invocation only builds what its code path touches
+@lru_cache(maxsize=None)
+def get_dynamodb():
+    """Shared DynamoDB resource for all tables."""
+    return boto3.resource('dynamodb', config=BOTO_CONFIG)
+
+@lru_cache(maxsize=None)
+def get_lambda_client():
+    return boto3.client('lambda', config=BOTO_CONFIG)
+
+@lru_cache(maxsize=None)
+def get_sns_client():
+    return boto3.client('sns', config=BOTO_CONFIG)
+
+@lru_cache(maxsize=None)
+def get_review_queue_table():
+    return get_dynamodb().Table(REVIEW_QUEUE_TABLE_NAME)
+
+@lru_cache(maxsize=None)
+def get_moderator_profile_table():
+    return get_dynamodb().Table(MODERATOR_PROFILE_TABLE_NAME)
+
+@lru_cache(maxsize=None)
+def get_audit_table():
+    return get_dynamodb().Table(AUDIT_TABLE_NAME)
+
+# Worker pool for the independent post-completion side effects, reused across
+# warm invocations
+side_effect_executor = ThreadPoolExecutor(max_workers=5)
+
+# Marshaller for low-level client calls (TransactWriteItems)
+type_serializer = TypeSerializer()
+
+# Static SNS message attribute shared by every completion notification
+REVIEW_COMPLETED_ATTRIBUTE = {'DataType': 'String', 'StringValue': 'REVIEW_COMPLETED'}
+
+# Static DynamoDB expressions; calls only build their value payloads
+STATUS_ATTRIBUTE_NAMES = {'#status': 'status'}
+COMPLETE_UPDATE_EXPRESSION = (
+    'SET #status = :status, completedAt = :completed_at, completedBy = :completed_by, updatedAt = :updated_at '
+    'REMOVE activeSortKey, timeoutShard'
+)
+# Re-checks the status and assignee read earlier, so a review expired or
+# reassigned in the meantime is not completed (or released) twice
+COMPLETE_CONDITION_EXPRESSION = (
+    '#status IN (:assigned, :in_progress) AND assignedModerator = :moderator_id '
+    'AND attribute_not_exists(completedAt)'
+)
+STATISTICS_COUNTERS_EXPRESSION = (
+    'ADD statistics.totalReviews :one, statistics.totalProcessingTime :processing_time, '
+    'statistics.currentWorkload :release'
+)
+STATISTICS_SET_EXPRESSION = ' SET statistics.lastReviewAt = :last_review, lastActive = :last_active'
+STATISTICS_UPDATE_EXPRESSION = STATISTICS_COUNTERS_EXPRESSION + STATISTICS_SET_EXPRESSION
+STATISTICS_ACCURACY_UPDATE_EXPRESSION = (
+    STATISTICS_COUNTERS_EXPRESSION + ', statistics.accurateDecisions :accurate' + STATISTICS_SET_EXPRESSION
+)
+AVERAGE_UPDATE_EXPRESSION = 'SET statistics.averageProcessingTime = :average'
+AVERAGE_ACCURACY_UPDATE_EXPRESSION = AVERAGE_UPDATE_EXPRESSION + ', statistics.accuracyScore = :accuracy'
 
 class DecisionType(Enum):
     CONFIRM = "confirm"
@@ -45,13 +112,26 @@ class ConfidenceLevel(Enum):
     HIGH = "high"
     VERY_HIGH = "very_high"
 
+# Precomputed validation sets for validate_decision_data
+REQUIRED_DECISION_FIELDS = frozenset({'decisionType', 'confidenceLevel', 'justification'})
+VALID_DECISION_TYPES = frozenset(e.value for e in DecisionType)
+VALID_CONFIDENCE_LEVELS = frozenset(e.value for e in ConfidenceLevel)
+VALID_THREAT_LEVELS = frozenset({'none', 'low', 'medium', 'high', 'critical'})
+
+# Thresholds for check_decision_consistency
+LARGE_SCORE_DIFFERENCE = 30.0
+CONFIRM_MAX_SCORE_DIFFERENCE = 10.0
+OVERRIDE_MIN_SCORE_DIFFERENCE = 15.0
+HIGH_AI_CONFIDENCE = 0.8
+LOW_CONFIDENCE_LEVELS = frozenset({ConfidenceLevel.VERY_LOW.value, ConfidenceLevel.LOW.value})
+
 def handler(event, context):
     """
     Lambda function for review completion validation and processing.
     Handles decision validation, trust score updates, and quality assurance.
     """
     try:
-        logger.info(f"Processing review completion validation: {json.dumps(event)}")
+        logger.info(f"Processing review completion validation: {json_dumps(event)}")
         
         # Determine event type and process accordingly
         if 'action' in event:
@@ -68,7 +148,7 @@ def handler(event, context):
         logger.error(f"Error in review completion validation: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': 'Review completion validation failed',
                 'message': str(e)
             })
@@ -96,7 +176,7 @@ def handle_direct_action(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         else:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': f'Unknown action: {action}'})
+                'body': json_dumps({'error': f'Unknown action: {action}'})
             }
             
     except Exception as e:
@@ -113,15 +193,15 @@ def validate_review_completion(event: Dict[str, Any]) -> Dict[str, Any]:
         if not all([review_id, moderator_id, decision_data]):
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': 'reviewId, moderatorId, and decisionData are required'})
+                'body': json_dumps({'error': 'reviewId, moderatorId, and decisionData are required'})
             }
         
         # Get the review
-        review_response = review_queue_table.get_item(Key={'reviewId': review_id})
+        review_response = get_review_queue_table().get_item(Key={'reviewId': review_id})
         if 'Item' not in review_response:
             return {
                 'statusCode': 404,
-                'body': json.dumps({'error': 'Review not found'})
+                'body': json_dumps({'error': 'Review not found'})
             }
         
         review = review_response['Item']
@@ -130,14 +210,14 @@ def validate_review_completion(event: Dict[str, Any]) -> Dict[str, Any]:
         if review.get('status') not in ['assigned', 'in_progress']:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': f'Review cannot be completed in status: {review.get("status")}'})
+                'body': json_dumps({'error': f'Review cannot be completed in status: {review.get("status")}'})
             }
         
         # Validate moderator assignment
         if review.get('assignedModerator') != moderator_id:
             return {
                 'statusCode': 403,
-                'body': json.dumps({'error': 'Review is not assigned to this moderator'})
+                'body': json_dumps({'error': 'Review is not assigned to this moderator'})
             }
         
         # Validate decision data structure
@@ -145,7 +225,7 @@ def validate_review_completion(event: Dict[str, Any]) -> Dict[str, Any]:
         if not validation_result['valid']:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': f'Invalid decision data: {validation_result["errors"]}'})
+                'body': json_dumps({'error': f'Invalid decision data: {validation_result["errors"]}'})
             }
         
         # Perform consistency checks
@@ -154,11 +234,19 @@ def validate_review_completion(event: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning(f"Consistency issues found for review {review_id}: {consistency_result['warnings']}")
         
         # Process the completion
-        completion_result = process_review_completion(review_id, moderator_id, decision_data, review)
+        try:
+            completion_result = process_review_completion(review_id, moderator_id, decision_data, review)
+        except ClientError as e:
+            if not is_conditional_check_cancellation(e):
+                raise
+            return {
+                'statusCode': 409,
+                'body': json_dumps({'error': 'Review was completed, expired or reassigned concurrently'})
+            }
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': json_dumps({
                 'message': 'Review completion validated and processed',
                 'reviewId': review_id,
                 'validationResult': validation_result,
@@ -171,9 +259,19 @@ def validate_review_completion(event: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Error validating review completion: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': json_dumps({'error': str(e)})
         }
 
+def is_conditional_check_cancellation(error: ClientError) -> bool:
+    """Check whether a transaction was cancelled because a condition failed."""
+    if error.response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+        return False
+    
+    return any(
+        reason.get('Code') == 'ConditionalCheckFailed'
+        for reason in error.response.get('CancellationReasons', [])
+    )
+
 def validate_decision_data(decision_data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate the structure and content of decision data."""
     try:
@@ -181,30 +279,24 @@ def validate_decision_data(decision_data: Dict[str, Any]) -> Dict[str, Any]:
         warnings = []
         
         # Required fields
-        required_fields = ['decisionType', 'confidenceLevel', 'justification']
-        for field in required_fields:
-            if field not in decision_data:
-                errors.append(f'Missing required field: {field}')
+        for field in sorted(REQUIRED_DECISION_FIELDS - decision_data.keys()):
+            errors.append(f'Missing required field: {field}')
         
         # Validate decision type
         decision_type = decision_data.get('decisionType')
-        if decision_type:
-            try:
-                DecisionType(decision_type)
-            except ValueError:
-                errors.append(f'Invalid decision type: {decision_type}')
+        if decision_type and (not isinstance(decision_type, str) or decision_type not in VALID_DECISION_TYPES):
+            errors.append(f'Invalid decision type: {decision_type}')
         
         # Validate confidence level
         confidence_level = decision_data.get('confidenceLevel')
-        if confidence_level:
-            try:
-                ConfidenceLevel(confidence_level)
-            except ValueError:
-                errors.append(f'Invalid confidence level: {confidence_level}')
+        if confidence_level and (not isinstance(confidence_level, str) or confidence_level not in VALID_CONFIDENCE_LEVELS):
+            errors.append(f'Invalid confidence level: {confidence_level}')
         
         # Validate justification
         justification = decision_data.get('justification', '')
-        if len(justification.strip()) < 10:
+        if not isinstance(justification, str):
+            errors.append('Justification must be a string')
+        elif len(justification.strip()) < 10:
             errors.append('Justification must be at least 10 characters')
         elif len(justification) > 2000:
             errors.append('Justification cannot exceed 2000 characters')
@@ -212,14 +304,14 @@ def validate_decision_data(decision_data: Dict[str, Any]) -> Dict[str, Any]:
         # Validate trust score adjustment if present
         trust_score_adjustment = decision_data.get('trustScoreAdjustment')
         if trust_score_adjustment is not None:
-            if not isinstance(trust_score_adjustment, (int, float)):
+            if isinstance(trust_score_adjustment, bool) or not isinstance(trust_score_adjustment, (int, float, Decimal)):
                 errors.append('Trust score adjustment must be a number')
             elif not (0 <= trust_score_adjustment <= 100):
                 errors.append('Trust score adjustment must be between 0 and 100')
         
         # Validate threat level if present
         threat_level = decision_data.get('threatLevel')
-        if threat_level and threat_level not in ['none', 'low', 'medium', 'high', 'critical']:
+        if threat_level and (not isinstance(threat_level, str) or threat_level not in VALID_THREAT_LEVELS):
             errors.append(f'Invalid threat level: {threat_level}')
         
         # Validate tags if present
@@ -263,25 +355,27 @@ def check_decision_consistency(review: Dict[str, Any], decision_data: Dict[str,
         decision_type = decision_data.get('decisionType')
         human_confidence = decision_data.get('confidenceLevel')
         
-        # Check for significant score differences
+        # Check for significant score differences (coerce DynamoDB Decimals once)
         score_difference = abs(float(human_trust_score) - float(ai_trust_score))
-        if score_difference > 30:
+        if score_difference >= LARGE_SCORE_DIFFERENCE:
             warnings.append(f'Large trust score difference: AI={ai_trust_score}, Human={human_trust_score}')
         
         # Check for confidence mismatches
-        if decision_type == 'confirm' and score_difference > 10:
-            warnings.append('Confirmed decision with significant score adjustment')
-        
-        if decision_type == 'override' and score_difference < 15:
-            warnings.append('Override decision with minimal score change')
+        if decision_type == DecisionType.CONFIRM.value:
+            if score_difference > CONFIRM_MAX_SCORE_DIFFERENCE:
+                warnings.append('Confirmed decision with significant score adjustment')
         
-        # Check for low confidence overrides
-        if decision_type == 'override' and human_confidence in ['very_low', 'low']:
-            warnings.append('Override decision with low human confidence')
-        
-        # Check for high AI confidence overrides
-        if decision_type == 'override' and ai_confidence > 0.8:
-            warnings.append('Override of high-confidence AI decision')
+        elif decision_type == DecisionType.OVERRIDE.value:
+            if score_difference < OVERRIDE_MIN_SCORE_DIFFERENCE:
+                warnings.append('Override decision with minimal score change')
+            
+            # Check for low confidence overrides
+            if human_confidence in LOW_CONFIDENCE_LEVELS:
+                warnings.append('Override decision with low human confidence')
+            
+            # Check for high AI confidence overrides
+            if float(ai_confidence) > HIGH_AI_CONFIDENCE:
+                warnings.append('Override of high-confidence AI decision')
         
         return {
             'consistent': len(warnings) == 0,
@@ -302,49 +396,84 @@ def check_decision_consistency(review: Dict[str, Any], decision_data: Dict[str,
 def process_review_completion(review_id: str, moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any]) -> Dict[str, Any]:
     """Process the complete review completion workflow."""
     try:
-        completion_time = datetime.utcnow().isoformat()
-        
-        # 1. Update review status to completed
-        review_queue_table.update_item(
-            Key={'reviewId': review_id},
-            UpdateExpression="""
-                SET #status = :status,
-                    completedAt = :completed_at,
-                    completedBy = :completed_by,
-                    updatedAt = :updated_at
-            """,
-            ExpressionAttributeNames={'#status': 'status'},
-            ExpressionAttributeValues={
-                ':status': 'completed',
-                ':completed_at': completion_time,
-                ':completed_by': moderator_id,
-                ':updated_at': completion_time
-            }
+        completed_at = datetime.utcnow()
+        completion_time = completed_at.isoformat()
+        processing_time = calculate_processing_time(review, completed_at)
+        
+        # 1. Mark review completed, store decision record and completion audit
+        # atomically; the condition rejects a second completion of the same review
+        # and one racing an expiry or reassignment
+        decision_record = create_decision_record(review_id, moderator_id, decision_data, review, completed_at, processing_time)
+        audit_record = create_completion_audit_record(review_id, moderator_id, decision_data, completion_time)
+        get_dynamodb().meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    'Update': {
+                        'TableName': REVIEW_QUEUE_TABLE_NAME,
+                        'Key': marshal_item({'reviewId': review_id}),
+                        'UpdateExpression': COMPLETE_UPDATE_EXPRESSION,
+                        'ConditionExpression': COMPLETE_CONDITION_EXPRESSION,
+                        'ExpressionAttributeNames': STATUS_ATTRIBUTE_NAMES,
+                        'ExpressionAttributeValues': marshal_item({
+                            ':status': 'completed',
+                            ':completed_at': completion_time,
+                            ':completed_by': moderator_id,
+                            ':updated_at': completion_time,
+                            ':assigned': 'assigned',
+                            ':in_progress': 'in_progress',
+                            ':moderator_id': moderator_id
+                        })
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': REVIEW_DECISION_TABLE_NAME,
+                        'Item': marshal_item(decision_record)
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': AUDIT_TABLE_NAME,
+                        'Item': marshal_item(audit_record)
+                    }
+                }
+            ]
         )
         
-        # 2. Store decision record
-        decision_record = create_decision_record(review_id, moderator_id, decision_data, review)
-        review_decision_table.put_item(Item=decision_record)
+        # 2-6. The remaining side effects are independent of each other, so run
+        # them concurrently. Clients are resolved here first because boto3
+        # client creation is not thread-safe.
+        get_lambda_client()
+        get_sns_client()
+        get_moderator_profile_table()
+        get_audit_table()
         
-        # 3. Update trust score if needed
-        trust_score_result = None
+        # 2. Update trust score if needed
+        trust_score_future = None
         if decision_data.get('trustScoreAdjustment') is not None:
-            trust_score_result = trigger_trust_score_update(review, decision_data)
+            trust_score_future = side_effect_executor.submit(trigger_trust_score_update, review, decision_data)
         
-        # 4. Update moderator statistics
-        update_moderator_statistics(moderator_id, decision_data, review)
+        # 3. Update moderator statistics (best effort, outside the transaction)
+        statistics_future = side_effect_executor.submit(
+            update_moderator_statistics, moderator_id, decision_data, review, processing_time, completion_time
+        )
         
-        # 5. Process AI feedback loop
-        feedback_result = process_ai_feedback(review, decision_data)
+        # 4. Process AI feedback loop
+        feedback_future = side_effect_executor.submit(process_ai_feedback, review, decision_data)
         
-        # 6. Process threat intelligence
-        threat_intel_result = process_threat_intelligence(review, decision_data, moderator_id)
+        # 5. Process threat intelligence
+        threat_intel_future = side_effect_executor.submit(process_threat_intelligence, review, decision_data, moderator_id)
         
-        # 7. Store audit record
-        store_completion_audit(review_id, moderator_id, decision_data, completion_time)
+        # 6. Send completion notifications
+        notification_future = side_effect_executor.submit(
+            send_completion_notifications, review_id, moderator_id, decision_data, review, completion_time
+        )
         
-        # 8. Send completion notifications
-        send_completion_notifications(review_id, moderator_id, decision_data, review)
+        trust_score_result = trust_score_future.result() if trust_score_future else None
+        statistics_future.result()
+        feedback_result = feedback_future.result()
+        threat_intel_result = threat_intel_future.result()
+        notification_future.result()
         
         logger.info(f"Successfully processed completion for review {review_id}")
         
@@ -361,14 +490,15 @@ def process_review_completion(review_id: str, moderator_id: str, decision_data:
         logger.error(f"Error processing review completion: {str(e)}")
         raise
 
-def create_decision_record(review_id: str, moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any]) -> Dict[str, Any]:
+def create_decision_record(review_id: str, moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any],
+                           completed_at: datetime, processing_time: float) -> Dict[str, Any]:
     """Create a comprehensive decision record."""
     try:
         decision_id = str(uuid.uuid4())
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = completed_at.isoformat()
         
-        # Calculate TTL (2 years from now)
-        ttl = int((datetime.utcnow() + timedelta(days=730)).timestamp())
+        # Calculate TTL (2 years from completion)
+        ttl = int((completed_at + timedelta(days=730)).timestamp())
         
         decision_record = {
             'decisionId': decision_id,
@@ -387,7 +517,7 @@ def create_decision_record(review_id: str, moderator_id: str, decision_data: Dic
                     'assignedAt': review.get('assignedAt'),
                     'completedAt': timestamp
                 },
-                'processingTime': calculate_processing_time(review, timestamp)
+                'processingTime': processing_time
             },
             'ttl': ttl
         }
@@ -422,10 +552,10 @@ def trigger_trust_score_update(review: Dict[str, Any], decision_data: Dict[str,
         }
         
         # Invoke trust score calculator
-        response = lambda_client.invoke(
+        response = get_lambda_client().invoke(
             FunctionName=TRUST_SCORE_CALCULATOR_FUNCTION_NAME,
             InvocationType='Event',  # Asynchronous
-            Payload=json.dumps(update_event)
+            Payload=json_dumps(update_event)
         )
         
         logger.info(f"Triggered trust score update for media {review.get('mediaId')}")
@@ -443,44 +573,47 @@ def trigger_trust_score_update(review: Dict[str, Any], decision_data: Dict[str,
             'error': str(e)
         }
 
-def update_moderator_statistics(moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any]):
+def update_moderator_statistics(moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any],
+                                processing_time: float, completion_time: str):
     """Update moderator performance statistics."""
     try:
-        # Calculate review processing time
-        processing_time = calculate_processing_time(review, datetime.utcnow().isoformat())
-        
         # Determine if decision was accurate (placeholder logic)
         decision_accuracy = calculate_decision_accuracy(decision_data, review)
         
-        # Update moderator profile statistics
-        moderator_profile_table.update_item(
+        # Update moderator profile counters and release the completed review
+        # from the workload counter used for assignment. Update expressions
+        # cannot divide, so the derived averages are set from the new totals.
+        update_expression = STATISTICS_UPDATE_EXPRESSION
+        expression_values = {
+            ':one': 1,
+            ':release': -1,
+            ':processing_time': Decimal(str(processing_time)),
+            ':last_review': completion_time,
+            ':last_active': completion_time
+        }
+        if decision_accuracy is not None:
+            update_expression = STATISTICS_ACCURACY_UPDATE_EXPRESSION
+            expression_values[':accurate'] = 1 if decision_accuracy else 0
+        
+        response = get_moderator_profile_table().update_item(
             Key={'moderatorId': moderator_id},
-            UpdateExpression="""
-                ADD statistics.totalReviews :one,
-                    statistics.totalProcessingTime :processing_time
-                SET statistics.lastReviewAt = :last_review,
-                    statistics.averageProcessingTime = (statistics.totalProcessingTime + :processing_time) / (statistics.totalReviews + :one),
-                    lastActive = :last_active
-            """,
-            ExpressionAttributeValues={
-                ':one': 1,
-                ':processing_time': Decimal(str(processing_time)),
-                ':last_review': datetime.utcnow().isoformat(),
-                ':last_active': datetime.utcnow().isoformat()
-            }
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=expression_values,
+            ReturnValues='UPDATED_NEW'
         )
         
-        # Update accuracy if we can determine it
-        if decision_accuracy is not None:
-            moderator_profile_table.update_item(
+        statistics = response.get('Attributes', {}).get('statistics', {})
+        total_reviews = statistics.get('totalReviews')
+        if total_reviews:
+            average_update = AVERAGE_UPDATE_EXPRESSION
+            average_values = {':average': statistics['totalProcessingTime'] / total_reviews}
+            if decision_accuracy is not None:
+                average_update = AVERAGE_ACCURACY_UPDATE_EXPRESSION
+                average_values[':accuracy'] = statistics['accurateDecisions'] / total_reviews
+            get_moderator_profile_table().update_item(
                 Key={'moderatorId': moderator_id},
-                UpdateExpression="""
-                    ADD statistics.accurateDecisions :accurate
-                    SET statistics.accuracyScore = statistics.accurateDecisions / statistics.totalReviews
-                """,
-                ExpressionAttributeValues={
-                    ':accurate': 1 if decision_accuracy else 0
-                }
+                UpdateExpression=average_update,
+                ExpressionAttributeValues=average_values
             )
         
         logger.info(f"Updated statistics for moderator {moderator_id}")
@@ -512,7 +645,7 @@ def process_ai_feedback(review: Dict[str, Any], decision_data: Dict[str, Any]) -
         }
         
         # Store in audit table for now (could be separate feedback table)
-        audit_table.put_item(Item=feedback_record)
+        get_audit_table().put_item(Item=to_dynamodb_item(feedback_record))
         
         # Check if this feedback triggers model retraining
         retraining_trigger = check_retraining_trigger(feedback_data)
@@ -553,6 +686,7 @@ def process_threat_intelligence(review: Dict[str, Any], decision_data: Dict[str,
             }
         
         # Prepare payload for threat intelligence processor
+        analysis_results = review.get('analysisResults', {})
         threat_intel_payload = {
             'operation': 'process_review_decision',
             'reviewId': review.get('reviewId'),
@@ -568,21 +702,21 @@ def process_threat_intelligence(review: Dict[str, Any], decision_data: Dict[str,
                     'techniqueDetails': decision_data.get('techniqueDetails', {})
                 },
                 'metadata': {
-                    'contentHash': review.get('analysisResults', {}).get('contentHash'),
-                    'sourceDomain': review.get('analysisResults', {}).get('sourceDomain'),
-                    'fileType': review.get('analysisResults', {}).get('fileType'),
-                    'fileSignature': review.get('analysisResults', {}).get('fileSignature'),
-                    'aiConfidence': review.get('analysisResults', {}).get('trustScore', {}).get('compositeScore', 0.0)
+                    'contentHash': analysis_results.get('contentHash'),
+                    'sourceDomain': analysis_results.get('sourceDomain'),
+                    'fileType': analysis_results.get('fileType'),
+                    'fileSignature': analysis_results.get('fileSignature'),
+                    'aiConfidence': analysis_results.get('trustScore', {}).get('compositeScore', 0.0)
                 }
             },
             'timestamp': datetime.utcnow().isoformat()
         }
         
         # Invoke threat intelligence processor asynchronously
-        response = lambda_client.invoke(
+        response = get_lambda_client().invoke(
             FunctionName=threat_intel_function_name,
             InvocationType='Event',  # Asynchronous invocation
-            Payload=json.dumps(threat_intel_payload)
+            Payload=json_dumps(threat_intel_payload)
         )
         
         logger.info(f"Triggered threat intelligence processing for review {review.get('reviewId')}")
@@ -605,17 +739,17 @@ def process_threat_intelligence(review: Dict[str, Any], decision_data: Dict[str,
 
 # Helper functions
 
-def calculate_processing_time(review: Dict[str, Any], completion_time: str) -> float:
+def calculate_processing_time(review: Dict[str, Any], completed_at: datetime) -> float:
     """Calculate review processing time in minutes."""
     try:
         assigned_at = review.get('assignedAt')
         if not assigned_at:
             return 0.0
         
-        assigned_time = datetime.fromisoformat(assigned_at.replace('Z', '+00:00'))
-        completed_time = datetime.fromisoformat(completion_time.replace('Z', '+00:00'))
+        # Timestamps are UTC; compare naive values against the naive completion time
+        assigned_time = datetime.fromisoformat(assigned_at.replace('Z', '+00:00')).replace(tzinfo=None)
         
-        processing_time = (completed_time - assigned_time).total_seconds() / 60
+        processing_time = (completed_at - assigned_time).total_seconds() / 60
         return max(processing_time, 0.0)
         
     except Exception as e:
@@ -655,47 +789,42 @@ def check_retraining_trigger(feedback_data: Dict[str, Any]) -> Dict[str, Any]:
         'nextCheck': (datetime.utcnow() + timedelta(days=7)).isoformat()
     }
 
-def store_completion_audit(review_id: str, moderator_id: str, decision_data: Dict[str, Any], completion_time: str):
-    """Store completion audit record."""
-    try:
-        audit_record = {
-            'mediaId': f"review_{review_id}",
-            'timestamp': completion_time,
-            'eventType': 'review_completed',
-            'eventSource': 'review_completion_validator',
-            'data': {
-                'reviewId': review_id,
-                'moderatorId': moderator_id,
-                'decisionData': decision_data,
-                'completedAt': completion_time
-            }
+def create_completion_audit_record(review_id: str, moderator_id: str, decision_data: Dict[str, Any], completion_time: str) -> Dict[str, Any]:
+    """Create the completion audit record."""
+    return {
+        'mediaId': f"review_{review_id}",
+        'timestamp': completion_time,
+        'eventType': 'review_completed',
+        'eventSource': 'review_completion_validator',
+        'data': {
+            'reviewId': review_id,
+            'moderatorId': moderator_id,
+            'decisionData': decision_data,
+            'completedAt': completion_time
         }
-        
-        audit_table.put_item(Item=audit_record)
-        
-    except Exception as e:
-        logger.error(f"Error storing completion audit: {str(e)}")
+    }
 
-def send_completion_notifications(review_id: str, moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any]):
+def send_completion_notifications(review_id: str, moderator_id: str, decision_data: Dict[str, Any], review: Dict[str, Any], completion_time: str):
     """Send completion notifications."""
     try:
+        decision_type = decision_data.get('decisionType')
         message = {
             'notification_type': 'REVIEW_COMPLETED',
             'review_id': review_id,
             'moderator_id': moderator_id,
-            'decision_type': decision_data.get('decisionType'),
+            'decision_type': decision_type,
             'media_id': review.get('mediaId'),
-            'completed_at': datetime.utcnow().isoformat()
+            'completed_at': completion_time
         }
         
-        sns_client.publish(
+        get_sns_client().publish(
             TopicArn=MODERATOR_ALERTS_TOPIC_ARN,
             Subject=f'Review Completed - {review_id}',
-            Message=json.dumps(message),
+            Message=json_dumps(message),
             MessageAttributes={
-                'notification_type': {'DataType': 'String', 'StringValue': 'REVIEW_COMPLETED'},
+                'notification_type': REVIEW_COMPLETED_ATTRIBUTE,
                 'review_id': {'DataType': 'String', 'StringValue': review_id},
-                'decision_type': {'DataType': 'String', 'StringValue': decision_data.get('decisionType', 'unknown')}
+                'decision_type': {'DataType': 'String', 'StringValue': decision_type or 'unknown'}
             }
         )
         
@@ -735,8 +864,36 @@ def get_completion_statistics(event):
     """Get completion statistics."""
     return {'statusCode': 200, 'message': 'Statistics retrieved'}
 
-def decimal_to_float(obj):
-    """Convert Decimal objects to float for JSON serialization."""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
\ No newline at end of file
+def json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string; DynamoDB Decimals are emitted as numbers."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=float).decode()
+    return json.dumps(obj, default=float, separators=(',', ':'))
+
+def to_dynamodb_item(value: Any) -> Any:
+    """Recursively convert floats to Decimals so the value can be written to DynamoDB."""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {key: to_dynamodb_item(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_dynamodb_item(item) for item in value]
+    return value
+
+def marshal_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a plain item to DynamoDB attribute-value format for the low-level client."""
+    return {key: type_serializer.serialize(value) for key, value in to_dynamodb_item(item).items()}
+
+# Exercise the validation path once during Lambda init so the first invocation
+# does not pay for it; skipped outside Lambda (tests, scripts)
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    try:
+        warmup_decision = {
+            'decisionType': DecisionType.CONFIRM.value,
+            'confidenceLevel': ConfidenceLevel.HIGH.value,
+            'justification': 'init warmup'
+        }
+        validate_decision_data(warmup_decision)
+        check_decision_consistency({}, warmup_decision)
+    except Exception:
+        pass
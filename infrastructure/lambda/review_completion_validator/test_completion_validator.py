@@ -1,9 +1,10 @@
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, DEFAULT
 import json
 import os
 from datetime import datetime, timedelta
 from decimal import Decimal
+from botocore.exceptions import ClientError
 
 # Mock environment variables
 os.environ['REVIEW_QUEUE_TABLE_NAME'] = 'test-review-queue-table'
@@ -17,37 +18,69 @@ os.environ['TRUST_SCORE_CALCULATOR_FUNCTION_NAME'] = 'test-trust-score-calculato
 from index import (
     handler, validate_review_completion, validate_decision_data,
     check_decision_consistency, process_review_completion,
-    DecisionType, ConfidenceLevel
+    update_moderator_statistics, json_dumps, DecisionType, ConfidenceLevel
 )
 
 class TestReviewCompletionValidator(unittest.TestCase):
     
+    # Shared read-only fixtures; tests that mutate them take a copy first
+    SAMPLE_REVIEW = {
+        'reviewId': 'review-123',
+        'mediaId': 'media-456',
+        'status': 'in_progress',
+        'assignedModerator': 'mod-123',
+        'priority': 'normal',
+        'createdAt': '2024-01-01T10:00:00.000000',
+        'assignedAt': '2024-01-01T10:30:00.000000',
+        'analysisResults': {
+            'trustScore': 45.0,
+            'confidence': 0.75,
+            'deepfakeDetected': True
+        }
+    }
+    
+    SAMPLE_DECISION_DATA = {
+        'decisionType': 'override',
+        'confidenceLevel': 'high',
+        'justification': 'After careful analysis, I believe this is actually authentic content.',
+        'trustScoreAdjustment': 75.0,
+        'threatLevel': 'low',
+        'tags': ['false-positive', 'authentic'],
+        'additionalEvidence': []
+    }
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.sample_review = {
-            'reviewId': 'review-123',
-            'mediaId': 'media-456',
-            'status': 'in_progress',
-            'assignedModerator': 'mod-123',
-            'priority': 'normal',
-            'createdAt': '2024-01-01T10:00:00.000000',
-            'assignedAt': '2024-01-01T10:30:00.000000',
-            'analysisResults': {
-                'trustScore': 45.0,
-                'confidence': 0.75,
-                'deepfakeDetected': True
-            }
-        }
-        
-        self.sample_decision_data = {
-            'decisionType': 'override',
-            'confidenceLevel': 'high',
-            'justification': 'After careful analysis, I believe this is actually authentic content.',
-            'trustScoreAdjustment': 75.0,
-            'threatLevel': 'low',
-            'tags': ['false-positive', 'authentic'],
-            'additionalEvidence': []
-        }
+        self.sample_review = self.SAMPLE_REVIEW
+        self.sample_decision_data = self.SAMPLE_DECISION_DATA
+        
+        # Install all AWS client/table accessor mocks in a single patch.multiple pass
+        patcher = patch.multiple(
+            'index',
+            get_lambda_client=DEFAULT,
+            get_sns_client=DEFAULT,
+            get_dynamodb=DEFAULT,
+            get_review_queue_table=DEFAULT,
+            get_moderator_profile_table=DEFAULT,
+            get_audit_table=DEFAULT
+        )
+        self.mocks = {name[len('get_'):]: accessor.return_value for name, accessor in patcher.start().items()}
+        self.addCleanup(patcher.stop)
+        self.mock_lambda = self.mocks['lambda_client']
+        self.mock_sns = self.mocks['sns_client']
+        self.mock_dynamodb = self.mocks['dynamodb']
+        self.mock_review_table = self.mocks['review_queue_table']
+        self.mock_moderator_table = self.mocks['moderator_profile_table']
+        self.mock_audit_table = self.mocks['audit_table']
+
+    def _wire_mocks(self, mocks, review_item=None):
+        """Configure AWS mock return values for a full completion run."""
+        mocks['review_queue_table'].get_item.return_value = {'Item': review_item} if review_item else {}
+        mocks['dynamodb'].meta.client.transact_write_items.return_value = {}
+        mocks['moderator_profile_table'].update_item.return_value = {}
+        mocks['audit_table'].put_item.return_value = {}
+        mocks['sns_client'].publish.return_value = {'MessageId': 'test-message-id'}
+        mocks['lambda_client'].invoke.return_value = {'StatusCode': 202, 'ResponseMetadata': {'RequestId': 'test-request-id'}}
 
     def test_validate_decision_data_valid(self):
         """Test validation of valid decision data."""
@@ -71,8 +104,7 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_invalid_decision_type(self):
         """Test validation with invalid decision type."""
-        invalid_data = self.sample_decision_data.copy()
-        invalid_data['decisionType'] = 'invalid_type'
+        invalid_data = {**self.sample_decision_data, 'decisionType': 'invalid_type'}
         
         result = validate_decision_data(invalid_data)
         
@@ -81,8 +113,7 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_invalid_confidence_level(self):
         """Test validation with invalid confidence level."""
-        invalid_data = self.sample_decision_data.copy()
-        invalid_data['confidenceLevel'] = 'invalid_level'
+        invalid_data = {**self.sample_decision_data, 'confidenceLevel': 'invalid_level'}
         
         result = validate_decision_data(invalid_data)
         
@@ -91,8 +122,7 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_short_justification(self):
         """Test validation with too short justification."""
-        invalid_data = self.sample_decision_data.copy()
-        invalid_data['justification'] = 'Too short'
+        invalid_data = {**self.sample_decision_data, 'justification': 'Too short'}
         
         result = validate_decision_data(invalid_data)
         
@@ -101,14 +131,27 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_invalid_trust_score(self):
         """Test validation with invalid trust score adjustment."""
-        invalid_data = self.sample_decision_data.copy()
-        invalid_data['trustScoreAdjustment'] = 150  # Out of range
+        invalid_data = {**self.sample_decision_data, 'trustScoreAdjustment': 150}  # Out of range
         
         result = validate_decision_data(invalid_data)
         
         self.assertFalse(result['valid'])
         self.assertIn('Trust score adjustment must be between 0 and 100', result['errors'])
 
+    def test_validate_decision_data_wrong_field_types(self):
+        """Test validation reports type errors instead of failing on them."""
+        invalid_data = {
+            **self.sample_decision_data,
+            'decisionType': ['confirm'],
+            'justification': 12345678901
+        }
+        
+        result = validate_decision_data(invalid_data)
+        
+        self.assertFalse(result['valid'])
+        self.assertIn("Invalid decision type: ['confirm']", result['errors'])
+        self.assertIn('Justification must be a string', result['errors'])
+
     def test_check_decision_consistency_large_difference(self):
         """Test consistency check with large score difference."""
         result = check_decision_consistency(self.sample_review, self.sample_decision_data)
@@ -119,8 +162,7 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_check_decision_consistency_override_with_minimal_change(self):
         """Test consistency check for override with minimal score change."""
-        small_change_decision = self.sample_decision_data.copy()
-        small_change_decision['trustScoreAdjustment'] = 50.0  # Only 5 point difference
+        small_change_decision = {**self.sample_decision_data, 'trustScoreAdjustment': 50.0}  # Only 5 point difference
         
         result = check_decision_consistency(self.sample_review, small_change_decision)
         
@@ -129,37 +171,20 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_check_decision_consistency_confirm_with_adjustment(self):
         """Test consistency check for confirm decision with score adjustment."""
-        confirm_decision = self.sample_decision_data.copy()
-        confirm_decision['decisionType'] = 'confirm'
-        confirm_decision['trustScoreAdjustment'] = 60.0  # 15 point difference
+        confirm_decision = {
+            **self.sample_decision_data,
+            'decisionType': 'confirm',
+            'trustScoreAdjustment': 60.0  # 15 point difference
+        }
         
         result = check_decision_consistency(self.sample_review, confirm_decision)
         
         self.assertFalse(result['consistent'])
         self.assertIn('Confirmed decision with significant score adjustment', result['warnings'][0])
 
-    @patch('index.sns_client')
-    @patch('index.audit_table')
-    @patch('index.review_decision_table')
-    @patch('index.moderator_profile_table')
-    @patch('index.review_queue_table')
-    @patch('index.lambda_client')
-    def test_validate_review_completion_success(self, mock_lambda, mock_review_table, 
-                                               mock_moderator_table, mock_decision_table, 
-                                               mock_audit_table, mock_sns):
+    def test_validate_review_completion_success(self):
         """Test successful review completion validation."""
-        # Mock review table response
-        mock_review_table.get_item.return_value = {
-            'Item': self.sample_review
-        }
-        
-        # Mock update operations
-        mock_review_table.update_item.return_value = {}
-        mock_moderator_table.update_item.return_value = {}
-        mock_decision_table.put_item.return_value = {}
-        mock_audit_table.put_item.return_value = {}
-        mock_sns.publish.return_value = {'MessageId': 'test-message-id'}
-        mock_lambda.invoke.return_value = {'ResponseMetadata': {'RequestId': 'test-request-id'}}
+        self._wire_mocks(self.mocks, review_item=self.sample_review)
         
         event = {
             'reviewId': 'review-123',
@@ -177,6 +202,82 @@ class TestReviewCompletionValidator(unittest.TestCase):
         self.assertIn('validationResult', result_body)
         self.assertIn('consistencyResult', result_body)
         self.assertIn('completionResult', result_body)
+        
+        # Status update and decision record are written in one transaction
+        transact_items = self.mock_dynamodb.meta.client.transact_write_items.call_args[1]['TransactItems']
+        self.assertEqual(
+            transact_items[0]['Update']['ConditionExpression'],
+            '#status IN (:assigned, :in_progress) AND assignedModerator = :moderator_id '
+            'AND attribute_not_exists(completedAt)'
+        )
+        condition_values = transact_items[0]['Update']['ExpressionAttributeValues']
+        self.assertEqual(condition_values[':moderator_id'], {'S': 'mod-123'})
+        self.assertEqual(condition_values[':assigned'], {'S': 'assigned'})
+        self.assertEqual(condition_values[':in_progress'], {'S': 'in_progress'})
+        self.assertEqual(transact_items[1]['Put']['TableName'], 'test-review-decision-table')
+        self.assertEqual(transact_items[2]['Put']['TableName'], 'test-audit-table')
+        self.assertEqual(transact_items[2]['Put']['Item']['eventType'], {'S': 'review_completed'})
+        
+        # Post-completion side effects all ran
+        self.mock_moderator_table.update_item.assert_called_once()
+        statistics_update = self.mock_moderator_table.update_item.call_args[1]
+        self.assertIn('statistics.currentWorkload :release', statistics_update['UpdateExpression'])
+        self.assertEqual(statistics_update['ExpressionAttributeValues'][':release'], -1)
+        self.mock_audit_table.put_item.assert_called_once()
+        self.mock_sns.publish.assert_called_once()
+        self.mock_lambda.invoke.assert_called_once()
+        
+        # Trust score recalculation is fire-and-forget
+        self.assertEqual(self.mock_lambda.invoke.call_args[1]['InvocationType'], 'Event')
+        self.assertEqual(result_body['completionResult']['trustScoreResult']['status'], 'triggered')
+
+    def test_validate_review_completion_already_completed(self):
+        """Test completion validation when the review was completed, expired or reassigned concurrently."""
+        self.mock_review_table.get_item.return_value = {
+            'Item': self.sample_review
+        }
+        self.mock_dynamodb.meta.client.transact_write_items.side_effect = ClientError(
+            {
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'ConditionalCheckFailed'}, {'Code': 'None'}, {'Code': 'None'}]
+            },
+            'TransactWriteItems'
+        )
+        
+        event = {
+            'reviewId': 'review-123',
+            'moderatorId': 'mod-123',
+            'decisionData': self.sample_decision_data
+        }
+        
+        result = validate_review_completion(event)
+        
+        self.assertEqual(result['statusCode'], 409)
+        result_body = json.loads(result['body'])
+        self.assertEqual(result_body['error'], 'Review was completed, expired or reassigned concurrently')
+
+    def test_validate_review_completion_transaction_conflict(self):
+        """Test that a cancellation for a reason other than a failed condition is not reported as a conflict."""
+        self.mock_review_table.get_item.return_value = {
+            'Item': self.sample_review
+        }
+        self.mock_dynamodb.meta.client.transact_write_items.side_effect = ClientError(
+            {
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'TransactionConflict'}, {'Code': 'None'}, {'Code': 'None'}]
+            },
+            'TransactWriteItems'
+        )
+        
+        event = {
+            'reviewId': 'review-123',
+            'moderatorId': 'mod-123',
+            'decisionData': self.sample_decision_data
+        }
+        
+        result = validate_review_completion(event)
+        
+        self.assertEqual(result['statusCode'], 500)
 
     def test_validate_review_completion_missing_parameters(self):
         """Test completion validation with missing parameters."""
@@ -188,10 +289,9 @@ class TestReviewCompletionValidator(unittest.TestCase):
         result_body = json.loads(result['body'])
         self.assertIn('reviewId, moderatorId, and decisionData are required', result_body['error'])
 
-    @patch('index.review_queue_table')
-    def test_validate_review_completion_review_not_found(self, mock_review_table):
+    def test_validate_review_completion_review_not_found(self):
         """Test completion validation when review doesn't exist."""
-        mock_review_table.get_item.return_value = {}
+        self.mock_review_table.get_item.return_value = {}
         
         event = {
             'reviewId': 'nonexistent-review',
@@ -205,13 +305,11 @@ class TestReviewCompletionValidator(unittest.TestCase):
         result_body = json.loads(result['body'])
         self.assertEqual(result_body['error'], 'Review not found')
 
-    @patch('index.review_queue_table')
-    def test_validate_review_completion_invalid_status(self, mock_review_table):
+    def test_validate_review_completion_invalid_status(self):
         """Test completion validation with invalid review status."""
-        completed_review = self.sample_review.copy()
-        completed_review['status'] = 'completed'
+        completed_review = {**self.sample_review, 'status': 'completed'}
         
-        mock_review_table.get_item.return_value = {
+        self.mock_review_table.get_item.return_value = {
             'Item': completed_review
         }
         
@@ -227,10 +325,9 @@ class TestReviewCompletionValidator(unittest.TestCase):
         result_body = json.loads(result['body'])
         self.assertIn('Review cannot be completed in status: completed', result_body['error'])
 
-    @patch('index.review_queue_table')
-    def test_validate_review_completion_wrong_moderator(self, mock_review_table):
+    def test_validate_review_completion_wrong_moderator(self):
         """Test completion validation with wrong moderator."""
-        mock_review_table.get_item.return_value = {
+        self.mock_review_table.get_item.return_value = {
             'Item': self.sample_review
         }
         
@@ -246,6 +343,23 @@ class TestReviewCompletionValidator(unittest.TestCase):
         result_body = json.loads(result['body'])
         self.assertEqual(result_body['error'], 'Review is not assigned to this moderator')
 
+    def test_update_moderator_statistics_sets_average_from_new_totals(self):
+        """Test that counters are added first and the average is set from the returned totals."""
+        self.mock_moderator_table.update_item.side_effect = [
+            {'Attributes': {'statistics': {'totalReviews': Decimal('4'), 'totalProcessingTime': Decimal('10')}}},
+            {}
+        ]
+        
+        update_moderator_statistics('mod-123', self.sample_decision_data, self.sample_review,
+                                    2.5, '2024-01-01T11:00:00.000000')
+        
+        counters, average = [call[1] for call in self.mock_moderator_table.update_item.call_args_list]
+        self.assertNotIn('/', counters['UpdateExpression'])
+        self.assertIn('statistics.currentWorkload :release', counters['UpdateExpression'])
+        self.assertEqual(counters['ExpressionAttributeValues'][':release'], -1)
+        self.assertEqual(counters['ReturnValues'], 'UPDATED_NEW')
+        self.assertEqual(average['ExpressionAttributeValues'], {':average': Decimal('2.5')})
+
     def test_decision_type_enum_values(self):
         """Test DecisionType enum values."""
         self.assertEqual(DecisionType.CONFIRM.value, 'confirm')
@@ -261,6 +375,16 @@ class TestReviewCompletionValidator(unittest.TestCase):
         self.assertEqual(ConfidenceLevel.HIGH.value, 'high')
         self.assertEqual(ConfidenceLevel.VERY_HIGH.value, 'very_high')
 
+    def test_json_dumps_without_orjson(self):
+        """Test that json_dumps falls back to stdlib json when orjson is not packaged."""
+        payload = {'trustScore': Decimal('72.5'), 'tags': ['a']}
+        
+        with patch('index.orjson', None):
+            fallback = json_dumps(payload)
+        
+        self.assertEqual(fallback, '{"trustScore":72.5,"tags":["a"]}')
+        self.assertEqual(json_dumps(payload), fallback)
+
     @patch('index.handle_direct_action')
     def test_handler_direct_action(self, mock_direct_handler):
         """Test handler with direct action event."""
@@ -273,9 +397,11 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_with_warnings(self):
         """Test validation that generates warnings."""
-        data_with_warnings = self.sample_decision_data.copy()
-        data_with_warnings['tags'] = ['tag1', 'tag2', 'tag3', 'tag4', 'tag5', 
-                                     'tag6', 'tag7', 'tag8', 'tag9', 'tag10', 'tag11']  # 11 tags
+        data_with_warnings = {
+            **self.sample_decision_data,
+            'tags': ['tag1', 'tag2', 'tag3', 'tag4', 'tag5',
+                     'tag6', 'tag7', 'tag8', 'tag9', 'tag10', 'tag11']  # 11 tags
+        }
         
         result = validate_decision_data(data_with_warnings)
         
@@ -284,8 +410,7 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_invalid_tags_type(self):
         """Test validation with invalid tags type."""
-        invalid_data = self.sample_decision_data.copy()
-        invalid_data['tags'] = 'not_a_list'
+        invalid_data = {**self.sample_decision_data, 'tags': 'not_a_list'}
         
         result = validate_decision_data(invalid_data)
         
@@ -294,8 +419,7 @@ class TestReviewCompletionValidator(unittest.TestCase):
 
     def test_validate_decision_data_invalid_evidence_type(self):
         """Test validation with invalid additional evidence type."""
-        invalid_data = self.sample_decision_data.copy()
-        invalid_data['additionalEvidence'] = 'not_a_list'
+        invalid_data = {**self.sample_decision_data, 'additionalEvidence': 'not_a_list'}
         
         result = validate_decision_data(invalid_data)
         
@@ -1,22 +1,51 @@
 import json
+try:
+    import orjson
+except ImportError:  # Code.fromAsset does not bundle requirements.txt; fall back to stdlib json
+    orjson = None
 import boto3
 import os
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+import zlib
+import heapq
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Shared client config: the pool must cover the timeout sweep's worker threads,
+# and keep-alive lets warm invocations reuse established connections
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-lambda_client = boto3.client('lambda')
-sns_client = boto3.client('sns')
-eventbridge_client = boto3.client('events')
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+# Low-level client for counts and projected reads of a few attributes,
+# skipping the resource layer's per-item deserialization
+dynamodb_client = boto3.client('dynamodb', config=BOTO_CONFIG)
+sns_client = boto3.client('sns', config=BOTO_CONFIG)
+
+# Clients off the hot paths are created on first use
+@lru_cache(maxsize=None)
+def get_lambda_client():
+    return boto3.client('lambda', config=BOTO_CONFIG)
+
+@lru_cache(maxsize=None)
+def get_eventbridge_client():
+    return boto3.client('events', config=BOTO_CONFIG)
 
 # Environment variables
 REVIEW_QUEUE_TABLE_NAME = os.environ['REVIEW_QUEUE_TABLE_NAME']
@@ -30,6 +59,64 @@ review_queue_table = dynamodb.Table(REVIEW_QUEUE_TABLE_NAME)
 moderator_profile_table = dynamodb.Table(MODERATOR_PROFILE_TABLE_NAME)
 review_decision_table = dynamodb.Table(REVIEW_DECISION_TABLE_NAME)
 
+# Sparse moderator index: activeSortKey is only present while a review is
+# assigned or in progress, so the index holds just the active workload
+MODERATOR_ACTIVE_INDEX = 'ModeratorActiveIndex'
+ACTIVE_SORT_KEY_PREFIX = 'active#'
+
+# Reviews assigned before the sparse indexes existed lack their keys until
+# the backfill_review_index_keys action has run; until this is switched on,
+# reads go through the original StatusIndex and ModeratorIndex
+SPARSE_INDEXES_READY = os.environ.get('REVIEW_QUEUE_SPARSE_INDEXES_READY', 'false').lower() == 'true'
+
+# Sparse timeout index, sharded so the sweep can query partitions in
+# parallel: timeoutShard is only present while a review is active
+TIMEOUT_SHARD_INDEX = 'TimeoutShardIndex'
+TIMEOUT_SHARD_COUNT = 16
+
+# Invariant parts of the per-shard timeout query, built once per container;
+# each query only adds the current time
+TIMEOUT_SWEEP_QUERY_KWARGS = {
+    'TableName': REVIEW_QUEUE_TABLE_NAME,
+    'IndexName': TIMEOUT_SHARD_INDEX,
+    'KeyConditionExpression': 'timeoutShard = :shard AND timeoutAtEpoch <= :now',
+    'ProjectionExpression': 'reviewId, assignedModerator, #priority, mediaId',
+    'ExpressionAttributeNames': {'#priority': 'priority'}
+}
+TIMEOUT_SHARD_KEYS = tuple({'N': str(shard_id)} for shard_id in range(TIMEOUT_SHARD_COUNT))
+
+# Projections for the assignment path's point reads through the low-level
+# client: only the attributes it inspects, unwrapped by hand instead of
+# deserializing whole items (analysis results, Decimals) per read
+REVIEW_ASSIGNMENT_READ = {
+    'ProjectionExpression': 'reviewId, #status, #priority, mediaId',
+    'ExpressionAttributeNames': {'#status': 'status', '#priority': 'priority'}
+}
+MODERATOR_PROFILE_READ = {
+    'ProjectionExpression': 'moderatorId, #status, #role, statistics.currentWorkload',
+    'ExpressionAttributeNames': {'#status': 'status', '#role': 'role'}
+}
+
+# In-container cache of moderator profiles (moderatorId -> (fetched_at, profile)),
+# shared by warm invocations
+MODERATOR_CACHE_TTL_SECONDS = 30.0
+moderator_profile_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# SNS accepts at most 10 entries per PublishBatch call
+SNS_PUBLISH_BATCH_SIZE = 10
+
+# In-container min-heap of assignment candidates, ordered by
+# (currentWorkload, -roleRank, moderatorId); rebuilt from the profile
+# table when older than the TTL
+MODERATOR_HEAP_TTL_SECONDS = 30.0
+moderator_heap: List[Tuple[int, int, str, str]] = []
+moderator_heap_refreshed_at: Optional[float] = None
+
+# Worker pool for the network-bound timeout sweep and assignment side effects,
+# reused across warm invocations
+MAX_TIMEOUT_WORKERS = 16
+timeout_executor = ThreadPoolExecutor(max_workers=MAX_TIMEOUT_WORKERS)
+
 class ReviewStatus(Enum):
     PENDING = "pending"
     ASSIGNED = "assigned"
@@ -50,13 +137,64 @@ class ModeratorRole(Enum):
     SENIOR = "senior"
     LEAD = "lead"
 
+# Plain string values for comparisons and expression values on hot paths
+PENDING = ReviewStatus.PENDING.value
+ASSIGNED = ReviewStatus.ASSIGNED.value
+IN_PROGRESS = ReviewStatus.IN_PROGRESS.value
+EXPIRED = ReviewStatus.EXPIRED.value
+CRITICAL = ReviewPriority.CRITICAL.value
+JUNIOR = ModeratorRole.JUNIOR.value
+
+# Priority-derived review handling
+DEFAULT_PRIORITY = ReviewPriority.NORMAL.value
+PRIORITY_TIMEOUT_HOURS = {'critical': 2, 'high': 4, 'normal': 8, 'low': 24}
+PRIORITY_REASSIGN = frozenset({CRITICAL, ReviewPriority.HIGH.value})
+CRITICAL_REVIEW_ROLES = frozenset({ModeratorRole.SENIOR.value, ModeratorRole.LEAD.value})
+ROLE_RANK = {ModeratorRole.JUNIOR.value: 0, ModeratorRole.SENIOR.value: 1, ModeratorRole.LEAD.value: 2}
+ROLE_MAX_WORKLOAD = {ModeratorRole.JUNIOR.value: 3, ModeratorRole.SENIOR.value: 5, ModeratorRole.LEAD.value: 7}
+DEFAULT_MAX_WORKLOAD = ROLE_MAX_WORKLOAD[JUNIOR]
+
+# Statuses a review can be (re)assigned from
+ASSIGNABLE_STATUSES = frozenset({PENDING, EXPIRED})
+
+# Static DynamoDB expressions; calls only build their value payloads.
+# botocore validates these as plain dicts, and never mutates them
+STATUS_ATTRIBUTE_NAMES = {'#status': 'status'}
+ASSIGN_UPDATE_EXPRESSION = (
+    'SET assignedModerator = :moderator_id, #status = :status, assignedAt = :assigned_at, '
+    'timeoutAt = :timeout_at, timeoutAtEpoch = :timeout_at_epoch, updatedAt = :updated_at, '
+    'activeSortKey = :active_sort_key, timeoutShard = :timeout_shard'
+)
+ASSIGN_CONDITION_EXPRESSION = (
+    'attribute_exists(reviewId) AND (attribute_not_exists(#status) OR #status IN (:pending, :expired))'
+)
+ASSIGN_STATUS_VALUES = {':status': ASSIGNED, ':pending': PENDING, ':expired': EXPIRED}
+EXPIRE_UPDATE_EXPRESSION = (
+    'SET #status = :status, expiredAt = :expired_at, updatedAt = :updated_at '
+    'REMOVE activeSortKey, timeoutShard'
+)
+EXPIRE_CONDITION_EXPRESSION = '#status IN (:assigned, :in_progress)'
+EXPIRE_STATUS_VALUES = {':status': EXPIRED, ':assigned': ASSIGNED, ':in_progress': IN_PROGRESS}
+WORKLOAD_UPDATE_EXPRESSION = 'ADD statistics.currentWorkload :change SET lastActive = :last_active'
+BACKFILL_UPDATE_EXPRESSION = (
+    'SET activeSortKey = if_not_exists(activeSortKey, :active_sort_key), '
+    'timeoutShard = if_not_exists(timeoutShard, :timeout_shard), '
+    'timeoutAt = if_not_exists(timeoutAt, :timeout_at), '
+    'timeoutAtEpoch = if_not_exists(timeoutAtEpoch, :timeout_at_epoch)'
+)
+
 def handler(event, context):
     """
     Lambda function for review assignment and lifecycle management.
     Handles automated state transitions, timeouts, and escalations.
     """
     try:
-        logger.info(f"Processing review lifecycle management event: {json.dumps(event)}")
+        logger.info(
+            "Processing review lifecycle management event: source=%s records=%d action=%s",
+            event.get('source'), len(event.get('Records', [])), event.get('action')
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Lifecycle event payload: %s", json.dumps(event, default=str))
         
         # Determine event type and process accordingly
         if 'source' in event and event['source'] == 'aws.events':
@@ -76,7 +214,7 @@ def handler(event, context):
         logger.error(f"Error in review lifecycle management: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': 'Review lifecycle management failed',
                 'message': str(e)
             })
@@ -86,18 +224,17 @@ def handle_scheduled_event(event: Dict[str, Any], context: Any) -> Dict[str, Any
     """Handle EventBridge scheduled events for periodic tasks."""
     try:
         detail_type = event.get('detail-type', '')
+        normalized = detail_type.lower()
         
-        if 'timeout-check' in detail_type.lower():
-            return check_review_timeouts()
-        elif 'reassignment-check' in detail_type.lower():
-            return check_reassignment_needs()
-        elif 'escalation-check' in detail_type.lower():
-            return check_escalation_triggers()
-        elif 'cleanup' in detail_type.lower():
-            return cleanup_expired_reviews()
-        else:
+        # Exact task names dispatch in one lookup; other detail types are
+        # matched on the task name they contain
+        task = SCHEDULED_TASKS.get(normalized)
+        if task is None:
+            task = next((handler for name, handler in SCHEDULED_TASKS.items() if name in normalized), None)
+        if task is None:
             logger.warning(f"Unknown scheduled event type: {detail_type}")
             return {'statusCode': 200, 'message': 'Unknown event type'}
+        return task()
             
     except Exception as e:
         logger.error(f"Error handling scheduled event: {str(e)}")
@@ -108,58 +245,75 @@ def handle_direct_action(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         action = event.get('action')
         
-        if action == 'assign_review':
-            return assign_review_to_moderator(event)
-        elif action == 'update_review_status':
-            return update_review_status(event)
-        elif action == 'escalate_review':
-            return escalate_review(event)
-        elif action == 'reassign_review':
-            return reassign_review(event)
-        elif action == 'complete_review':
-            return complete_review(event)
-        elif action == 'cancel_review':
-            return cancel_review(event)
-        elif action == 'get_review_status':
-            return get_review_status(event)
-        elif action == 'get_moderator_workload':
-            return get_moderator_workload(event)
-        else:
+        action_handler = DIRECT_ACTIONS.get(action)
+        if action_handler is None:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': f'Unknown action: {action}'})
+                'body': json_dumps({'error': f'Unknown action: {action}'})
             }
+        return action_handler(event)
             
     except Exception as e:
         logger.error(f"Error handling direct action: {str(e)}")
         raise
 
-def check_review_timeouts() -> Dict[str, Any]:
-    """Check for reviews that have exceeded their timeout limits."""
+def check_review_timeouts(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Check for reviews that have exceeded their timeout limits.
+    
+    The clock is read once per sweep; every query, expiry and workload
+    update uses that same timestamp.
+    """
     try:
         logger.info("Checking for review timeouts")
         
-        current_time = datetime.utcnow()
-        timeout_reviews = []
+        current_time = now or datetime.now(timezone.utc)
+        now_iso = current_time.isoformat()
+        now_epoch = int(current_time.timestamp())
         
-        # Query for assigned and in-progress reviews
-        for status in [ReviewStatus.ASSIGNED.value, ReviewStatus.IN_PROGRESS.value]:
-            response = review_queue_table.query(
-                IndexName='StatusIndex',
-                KeyConditionExpression='#status = :status',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={':status': status}
-            )
-            
-            for review in response.get('Items', []):
-                if is_review_timed_out(review, current_time):
-                    timeout_reviews.append(review)
+        if SPARSE_INDEXES_READY:
+            # Query every timeout shard concurrently; the key condition returns
+            # only reviews already past their deadline
+            review_pages = list(timeout_executor.map(
+                lambda shard_id: query_timed_out_reviews(shard_id, now_epoch),
+                range(TIMEOUT_SHARD_COUNT)
+            ))
+        else:
+            # Until the timeout keys are backfilled, read every active review
+            # from the status index and compare deadlines here
+            review_pages = list(timeout_executor.map(
+                lambda status: query_timed_out_reviews_by_status(status, current_time),
+                (ASSIGNED, IN_PROGRESS)
+            ))
+        
+        # Keyed by reviewId so a review is only handled once per sweep; a
+        # review changing status mid-sweep can appear in both status queries
+        timeout_reviews = {}
+        for reviews in review_pages:
+            for review in reviews:
+                timeout_reviews[review['reviewId']] = review
         
-        # Process timed out reviews
-        processed_timeouts = []
-        for review in timeout_reviews:
-            result = handle_review_timeout(review)
-            processed_timeouts.append(result)
+        # Process timed out reviews concurrently, preserving order; timeout
+        # notifications are collected and published in batches afterwards
+        notification_batch = []
+        processed_timeouts = list(timeout_executor.map(
+            lambda review: handle_review_timeout(review, now_iso, notification_batch),
+            timeout_reviews.values()
+        ))
+        publish_notification_batch(notification_batch)
+        
+        # Release workload once per moderator rather than once per review
+        workload_changes = Counter()
+        for result in processed_timeouts:
+            if result['action'] in ('timeout_expired', 'timeout_and_reassign'):
+                moderator_id = timeout_reviews[result['reviewId']].get('assignedModerator')
+                if moderator_id:
+                    workload_changes[moderator_id] -= 1
+        
+        # One update per moderator, issued concurrently
+        list(timeout_executor.map(
+            lambda item: update_moderator_workload(item[0], item[1], now_iso),
+            workload_changes.items()
+        ))
         
         logger.info(f"Processed {len(processed_timeouts)} timed out reviews")
         
@@ -182,118 +336,270 @@ def assign_review_to_moderator(event: Dict[str, Any]) -> Dict[str, Any]:
         if not review_id or not moderator_id:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': 'reviewId and moderatorId are required'})
+                'body': json_dumps({'error': 'reviewId and moderatorId are required'})
             }
         
-        # Get the review
-        review_response = review_queue_table.get_item(Key={'reviewId': review_id})
-        if 'Item' not in review_response:
+        # The moderator profile rides along in the same round trip unless cached
+        review, _ = get_review_and_moderator(review_id, moderator_id)
+        error_response = check_review_assignable(review)
+        if error_response:
+            return error_response
+        
+        return assign_loaded_review(review, moderator_id)
+        
+    except Exception as e:
+        logger.error(f"Error assigning review: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json_dumps({'error': str(e)})
+        }
+
+def auto_assign_review(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Assign a review to the least loaded eligible moderator."""
+    try:
+        review_id = event.get('reviewId')
+        
+        if not review_id:
             return {
-                'statusCode': 404,
-                'body': json.dumps({'error': 'Review not found'})
+                'statusCode': 400,
+                'body': json_dumps({'error': 'reviewId is required'})
             }
         
-        review = review_response['Item']
+        review = get_review_for_assignment(review_id)
+        error_response = check_review_assignable(review)
+        if error_response:
+            return error_response
         
-        # Check if moderator is available
-        if not is_moderator_available(moderator_id, review.get('priority', 'normal')):
+        moderator_id = select_moderator(review.get('priority', DEFAULT_PRIORITY))
+        if moderator_id is None:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': 'Moderator is not available for assignment'})
+                'body': json_dumps({'error': 'No moderator is available for assignment'})
             }
         
-        # Update review with assignment
-        assignment_time = datetime.utcnow().isoformat()
-        timeout_time = calculate_review_timeout(review.get('priority', 'normal'))
+        result = assign_loaded_review(review, moderator_id)
+        if result['statusCode'] != 200:
+            # The heap already counted this assignment; rebuild it next time
+            invalidate_moderator_heap()
+        return result
         
+    except Exception as e:
+        logger.error(f"Error auto-assigning review: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json_dumps({'error': str(e)})
+        }
+
+def get_review_and_moderator(review_id: str, moderator_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Read a review and its moderator's profile in one BatchGetItem.
+    
+    A fresh cached profile skips the batch; keys DynamoDB leaves unprocessed
+    fall back to single-item reads.
+    """
+    moderator = get_cached_moderator_profile(moderator_id)
+    if moderator is not None:
+        return get_review_for_assignment(review_id), moderator
+    
+    response = dynamodb_client.batch_get_item(RequestItems={
+        REVIEW_QUEUE_TABLE_NAME: {'Keys': [{'reviewId': {'S': review_id}}], **REVIEW_ASSIGNMENT_READ},
+        MODERATOR_PROFILE_TABLE_NAME: {'Keys': [{'moderatorId': {'S': moderator_id}}], **MODERATOR_PROFILE_READ}
+    })
+    responses = response.get('Responses', {})
+    unprocessed = response.get('UnprocessedKeys', {})
+    
+    if REVIEW_QUEUE_TABLE_NAME in unprocessed:
+        review = get_review_for_assignment(review_id)
+    else:
+        review_item = next(iter(responses.get(REVIEW_QUEUE_TABLE_NAME, [])), None)
+        review = unwrap_string_attributes(review_item) if review_item else None
+    
+    if MODERATOR_PROFILE_TABLE_NAME in unprocessed:
+        moderator = get_moderator_profile(moderator_id)
+    else:
+        moderator_item = next(iter(responses.get(MODERATOR_PROFILE_TABLE_NAME, [])), None)
+        moderator = unwrap_moderator_profile(moderator_item) if moderator_item else None
+        if moderator is not None:
+            moderator_profile_cache[moderator_id] = (time.monotonic(), moderator)
+    
+    return review, moderator
+
+def get_review_for_assignment(review_id: str) -> Optional[Dict[str, Any]]:
+    """Read the attributes the assignment path needs from a review."""
+    response = dynamodb_client.get_item(
+        TableName=REVIEW_QUEUE_TABLE_NAME,
+        Key={'reviewId': {'S': review_id}},
+        **REVIEW_ASSIGNMENT_READ
+    )
+    item = response.get('Item')
+    return unwrap_string_attributes(item) if item else None
+
+def check_review_assignable(review: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return an error response if the review is missing or already assigned."""
+    if review is None:
+        return {
+            'statusCode': 404,
+            'body': json_dumps({'error': 'Review not found'})
+        }
+    
+    if review.get('status', PENDING) not in ASSIGNABLE_STATUSES:
+        return {
+            'statusCode': 409,
+            'body': json_dumps({'error': 'Review is already assigned'})
+        }
+    
+    return None
+
+def assign_loaded_review(review: Dict[str, Any], moderator_id: str) -> Dict[str, Any]:
+    """Assign an already loaded, assignable review to a moderator."""
+    review_id = review['reviewId']
+    priority = review.get('priority', DEFAULT_PRIORITY)
+    
+    # Check if moderator is available
+    if not is_moderator_available(moderator_id, priority):
+        return {
+            'statusCode': 400,
+            'body': json_dumps({'error': 'Moderator is not available for assignment'})
+        }
+    
+    # Update review with assignment
+    now = datetime.now(timezone.utc)
+    assignment_time = now.isoformat()
+    timeout_deadline = calculate_review_deadline(priority, now)
+    timeout_time = timeout_deadline.isoformat()
+    
+    # The condition makes the assignment atomic: of two concurrent
+    # assignments of the same review, only the first succeeds
+    try:
         review_queue_table.update_item(
             Key={'reviewId': review_id},
-            UpdateExpression="""
-                SET assignedModerator = :moderator_id,
-                    #status = :status,
-                    assignedAt = :assigned_at,
-                    timeoutAt = :timeout_at,
-                    updatedAt = :updated_at
-            """,
-            ExpressionAttributeNames={'#status': 'status'},
+            UpdateExpression=ASSIGN_UPDATE_EXPRESSION,
+            ConditionExpression=ASSIGN_CONDITION_EXPRESSION,
+            ExpressionAttributeNames=STATUS_ATTRIBUTE_NAMES,
             ExpressionAttributeValues={
+                **ASSIGN_STATUS_VALUES,
                 ':moderator_id': moderator_id,
-                ':status': ReviewStatus.ASSIGNED.value,
                 ':assigned_at': assignment_time,
                 ':timeout_at': timeout_time,
-                ':updated_at': assignment_time
+                ':timeout_at_epoch': int(timeout_deadline.timestamp()),
+                ':updated_at': assignment_time,
+                ':active_sort_key': ACTIVE_SORT_KEY_PREFIX + assignment_time,
+                ':timeout_shard': get_timeout_shard(review_id)
             }
         )
-        
-        # Update moderator workload
-        update_moderator_workload(moderator_id, 1)
-        
-        # Send notification
-        send_assignment_notification(moderator_id, review_id, review)
-        
-        logger.info(f"Assigned review {review_id} to moderator {moderator_id}")
-        
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Review assigned successfully',
-                'reviewId': review_id,
-                'moderatorId': moderator_id,
-                'assignedAt': assignment_time,
-                'timeoutAt': timeout_time
-            })
-        }
-        
-    except Exception as e:
-        logger.error(f"Error assigning review: {str(e)}")
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+            raise
+        logger.info(f"Review {review_id} was assigned concurrently")
         return {
-            'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'statusCode': 409,
+            'body': json_dumps({'error': 'Review is already assigned'})
         }
+    
+    # The workload increment and the notification only depend on the
+    # assignment having gone through, so they are sent concurrently
+    workload_update = timeout_executor.submit(update_moderator_workload, moderator_id, 1, assignment_time)
+    send_assignment_notification(moderator_id, review_id, review, assignment_time)
+    workload_update.result()
+    
+    logger.info(f"Assigned review {review_id} to moderator {moderator_id}")
+    
+    return {
+        'statusCode': 200,
+        'body': json_dumps({
+            'message': 'Review assigned successfully',
+            'reviewId': review_id,
+            'moderatorId': moderator_id,
+            'assignedAt': assignment_time,
+            'timeoutAt': timeout_time
+        })
+    }
 
 # Helper functions
 
-def is_review_timed_out(review: Dict[str, Any], current_time: datetime) -> bool:
-    """Check if a review has timed out."""
+def get_timeout_shard(review_id: str) -> int:
+    """Get the stable timeout shard for a review (hash() is salted per process)."""
+    return zlib.crc32(review_id.encode('utf-8')) % TIMEOUT_SHARD_COUNT
+
+def unwrap_string_attributes(item: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    """Read a low-level item whose projected attributes are all strings."""
+    return {name: value['S'] for name, value in item.items()}
+
+def query_timed_out_reviews(shard_id: int, now_epoch: int) -> List[Dict[str, Any]]:
+    """Query one timeout shard for active reviews past their deadline, following pagination."""
+    query_kwargs = {
+        **TIMEOUT_SWEEP_QUERY_KWARGS,
+        'ExpressionAttributeValues': {':shard': TIMEOUT_SHARD_KEYS[shard_id], ':now': {'N': str(now_epoch)}}
+    }
+    reviews = []
+    while True:
+        response = dynamodb_client.query(**query_kwargs)
+        reviews.extend(unwrap_string_attributes(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return reviews
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def parse_review_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a review timestamp, treating naive values (older records) as UTC."""
+    if not value:
+        return None
     try:
-        timeout_at = review.get('timeoutAt')
-        if not timeout_at:
-            return False
-        
-        timeout_time = datetime.fromisoformat(timeout_at.replace('Z', '+00:00'))
-        return current_time > timeout_time
-        
-    except Exception as e:
-        logger.error(f"Error checking timeout: {str(e)}")
-        return False
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        logger.error(f"Invalid review timestamp: {value}")
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def query_timed_out_reviews_by_status(status: str, current_time: datetime) -> List[Dict[str, Any]]:
+    """Query the status index for reviews in the given status that are past their deadline."""
+    timed_out = []
+    for review in query_reviews_by_status(status):
+        deadline = parse_review_timestamp(review.get('timeoutAt'))
+        if deadline is not None and deadline <= current_time:
+            timed_out.append(review)
+    return timed_out
 
-def handle_review_timeout(review: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle a timed out review."""
+def handle_review_timeout(review: Dict[str, Any], now_iso: Optional[str] = None,
+                          notification_batch: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Handle a timed out review.
+    
+    The moderator's workload is released by the caller, which coalesces the
+    changes for all reviews expired in one sweep. When a notification batch
+    is given, the timeout notification is appended to it instead of being
+    published immediately.
+    """
     try:
         review_id = review['reviewId']
         moderator_id = review.get('assignedModerator')
+        priority = review.get('priority', DEFAULT_PRIORITY)
+        
+        now_iso = now_iso or datetime.now(timezone.utc).isoformat()
         
         logger.info(f"Handling timeout for review {review_id}")
         
-        # Update review status to expired
-        review_queue_table.update_item(
-            Key={'reviewId': review_id},
-            UpdateExpression="SET #status = :status, expiredAt = :expired_at, updatedAt = :updated_at",
-            ExpressionAttributeNames={'#status': 'status'},
-            ExpressionAttributeValues={
-                ':status': ReviewStatus.EXPIRED.value,
-                ':expired_at': datetime.utcnow().isoformat(),
-                ':updated_at': datetime.utcnow().isoformat()
+        # Update review status to expired, unless it moved on since it was queried
+        try:
+            review_queue_table.update_item(
+                Key={'reviewId': review_id},
+                UpdateExpression=EXPIRE_UPDATE_EXPRESSION,
+                ConditionExpression=EXPIRE_CONDITION_EXPRESSION,
+                ExpressionAttributeNames=STATUS_ATTRIBUTE_NAMES,
+                ExpressionAttributeValues={
+                    **EXPIRE_STATUS_VALUES,
+                    ':expired_at': now_iso,
+                    ':updated_at': now_iso
+                }
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Review {review_id} changed status before it could be expired")
+            return {
+                'reviewId': review_id,
+                'action': 'timeout_skipped'
             }
-        )
-        
-        # Update moderator workload
-        if moderator_id:
-            update_moderator_workload(moderator_id, -1)
         
         # Try to reassign if priority is high enough
-        priority = review.get('priority', 'normal')
-        if priority in ['critical', 'high']:
+        if priority in PRIORITY_REASSIGN:
             reassign_result = reassign_review_internal(review)
             return {
                 'reviewId': review_id,
@@ -302,7 +608,7 @@ def handle_review_timeout(review: Dict[str, Any]) -> Dict[str, Any]:
             }
         else:
             # Send timeout notification
-            send_timeout_notification(review_id, moderator_id, review)
+            send_timeout_notification(review_id, moderator_id, review, now_iso, notification_batch)
             return {
                 'reviewId': review_id,
                 'action': 'timeout_expired'
@@ -320,26 +626,25 @@ def is_moderator_available(moderator_id: str, priority: str) -> bool:
     """Check if a moderator is available for assignment."""
     try:
         # Get moderator profile
-        response = moderator_profile_table.get_item(Key={'moderatorId': moderator_id})
-        if 'Item' not in response:
+        moderator = get_moderator_profile(moderator_id)
+        if moderator is None:
             return False
         
-        moderator = response['Item']
-        
         # Check if moderator is active
         if moderator.get('status') != 'active':
             return False
         
-        # Check current workload
-        current_workload = get_current_workload(moderator_id)
-        max_workload = get_max_workload_for_role(moderator.get('role', 'junior'))
+        # Check current workload from the profile's counter; the hourly
+        # workload-reconcile schedule keeps it in line with the review queue
+        moderator_role = moderator.get('role', JUNIOR)
+        current_workload = int(moderator.get('statistics', {}).get('currentWorkload', 0))
+        max_workload = ROLE_MAX_WORKLOAD.get(moderator_role, DEFAULT_MAX_WORKLOAD)
         
         if current_workload >= max_workload:
             return False
         
         # Check if moderator can handle this priority
-        moderator_role = moderator.get('role', 'junior')
-        if priority == 'critical' and moderator_role not in ['senior', 'lead']:
+        if priority == CRITICAL and moderator_role not in CRITICAL_REVIEW_ROLES:
             return False
         
         return True
@@ -348,97 +653,272 @@ def is_moderator_available(moderator_id: str, priority: str) -> bool:
         logger.error(f"Error checking moderator availability: {str(e)}")
         return False
 
+def get_cached_moderator_profile(moderator_id: str) -> Optional[Dict[str, Any]]:
+    """Get a moderator profile from the in-container cache if still fresh."""
+    cached = moderator_profile_cache.get(moderator_id)
+    if cached and time.monotonic() - cached[0] < MODERATOR_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+def get_moderator_profile(moderator_id: str) -> Optional[Dict[str, Any]]:
+    """Get a moderator profile, served from the in-container cache while fresh."""
+    moderator = get_cached_moderator_profile(moderator_id)
+    if moderator is not None:
+        return moderator
+    
+    response = dynamodb_client.get_item(
+        TableName=MODERATOR_PROFILE_TABLE_NAME,
+        Key={'moderatorId': {'S': moderator_id}},
+        **MODERATOR_PROFILE_READ
+    )
+    item = response.get('Item')
+    moderator = unwrap_moderator_profile(item) if item else None
+    if moderator is not None:
+        moderator_profile_cache[moderator_id] = (time.monotonic(), moderator)
+    return moderator
+
+def parse_moderator_workload(item: Dict[str, Any]) -> int:
+    """Read the workload counter from a low-level moderator profile item."""
+    return int(item.get('statistics', {}).get('M', {}).get('currentWorkload', {}).get('N', '0'))
+
+def unwrap_moderator_profile(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Read a low-level moderator profile item projected with MODERATOR_PROFILE_READ."""
+    profile = unwrap_string_attributes({name: item[name] for name in ('moderatorId', 'status', 'role') if name in item})
+    profile['statistics'] = {'currentWorkload': parse_moderator_workload(item)}
+    return profile
+
+def refresh_moderator_heap():
+    """Rebuild the assignment candidate heap from active moderator profiles."""
+    global moderator_heap, moderator_heap_refreshed_at
+    
+    # Low-level scan: the workload counter is parsed straight to int rather
+    # than through a Decimal per moderator
+    scan_kwargs = {
+        'TableName': MODERATOR_PROFILE_TABLE_NAME,
+        'ProjectionExpression': 'moderatorId, #role, statistics.currentWorkload',
+        'FilterExpression': '#status = :active',
+        'ExpressionAttributeNames': {'#role': 'role', '#status': 'status'},
+        'ExpressionAttributeValues': {':active': {'S': 'active'}}
+    }
+    candidates = []
+    while True:
+        response = dynamodb_client.scan(**scan_kwargs)
+        for moderator in response.get('Items', []):
+            role = moderator.get('role', {}).get('S', JUNIOR)
+            workload = parse_moderator_workload(moderator)
+            candidates.append((workload, -ROLE_RANK.get(role, 0), moderator['moderatorId']['S'], role))
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    heapq.heapify(candidates)
+    moderator_heap = candidates
+    moderator_heap_refreshed_at = time.monotonic()
+
+def invalidate_moderator_heap():
+    """Force the next selection to rebuild the candidate heap."""
+    global moderator_heap_refreshed_at
+    moderator_heap_refreshed_at = None
+
+def select_moderator(priority: str) -> Optional[str]:
+    """Pick the least loaded moderator who can take a review of this priority.
+    
+    The chosen moderator is pushed back with one more review, so repeated
+    selections within the TTL spread work instead of piling onto one person.
+    """
+    if (moderator_heap_refreshed_at is None
+            or time.monotonic() - moderator_heap_refreshed_at >= MODERATOR_HEAP_TTL_SECONDS):
+        refresh_moderator_heap()
+    
+    skipped = []
+    chosen = None
+    while moderator_heap:
+        candidate = heapq.heappop(moderator_heap)
+        workload, _, _, role = candidate
+        if (workload >= ROLE_MAX_WORKLOAD.get(role, DEFAULT_MAX_WORKLOAD)
+                or (priority == CRITICAL and role not in CRITICAL_REVIEW_ROLES)):
+            skipped.append(candidate)
+            continue
+        chosen = candidate
+        break
+    
+    for candidate in skipped:
+        heapq.heappush(moderator_heap, candidate)
+    
+    if chosen is None:
+        return None
+    workload, negative_rank, moderator_id, role = chosen
+    heapq.heappush(moderator_heap, (workload + 1, negative_rank, moderator_id, role))
+    return moderator_id
+
 def get_current_workload(moderator_id: str) -> int:
-    """Get current workload for a moderator."""
+    """Get current workload for a moderator.
+    
+    Counts the moderator's entries in the sparse active index, so finished
+    reviews are neither read nor billed. Until the index has been backfilled
+    it filters the moderator's reviews on ModeratorIndex instead.
+    """
     try:
-        response = review_queue_table.query(
-            IndexName='ModeratorIndex',
-            KeyConditionExpression='assignedModerator = :moderator_id',
-            FilterExpression='#status IN (:assigned, :in_progress)',
-            ExpressionAttributeNames={'#status': 'status'},
-            ExpressionAttributeValues={
-                ':moderator_id': moderator_id,
-                ':assigned': ReviewStatus.ASSIGNED.value,
-                ':in_progress': ReviewStatus.IN_PROGRESS.value
-            }
-        )
-        return response['Count']
+        return count_active_reviews(moderator_id)
         
     except Exception as e:
         logger.error(f"Error getting current workload: {str(e)}")
         return 0
 
+def count_active_reviews(moderator_id: str) -> int:
+    """Count a moderator's assigned and in-progress reviews, letting query errors propagate."""
+    if SPARSE_INDEXES_READY:
+        query_kwargs = {
+            'IndexName': MODERATOR_ACTIVE_INDEX,
+            'KeyConditionExpression': 'assignedModerator = :moderator_id AND begins_with(activeSortKey, :active)',
+            'ExpressionAttributeValues': {
+                ':moderator_id': {'S': moderator_id},
+                ':active': {'S': ACTIVE_SORT_KEY_PREFIX}
+            }
+        }
+    else:
+        query_kwargs = {
+            'IndexName': 'ModeratorIndex',
+            'KeyConditionExpression': 'assignedModerator = :moderator_id',
+            'FilterExpression': '#status IN (:assigned, :in_progress)',
+            'ExpressionAttributeNames': STATUS_ATTRIBUTE_NAMES,
+            'ExpressionAttributeValues': {
+                ':moderator_id': {'S': moderator_id},
+                ':assigned': {'S': ASSIGNED},
+                ':in_progress': {'S': IN_PROGRESS}
+            }
+        }
+    return count_review_queue_query(query_kwargs)
+
+def count_review_queue_query(query_kwargs: Dict[str, Any]) -> int:
+    """Count the items matched by a review queue index query, following pagination."""
+    query_kwargs = {**query_kwargs, 'TableName': REVIEW_QUEUE_TABLE_NAME, 'Select': 'COUNT'}
+    count = 0
+    while True:
+        response = dynamodb_client.query(**query_kwargs)
+        count += response['Count']
+        if 'LastEvaluatedKey' not in response:
+            return count
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
 def get_max_workload_for_role(role: str) -> int:
     """Get maximum workload for a moderator role."""
-    return {'junior': 3, 'senior': 5, 'lead': 7}.get(role, 3)
+    return ROLE_MAX_WORKLOAD.get(role, DEFAULT_MAX_WORKLOAD)
 
-def calculate_review_timeout(priority: str) -> str:
+def calculate_review_deadline(priority: str, now: Optional[datetime] = None) -> datetime:
     """Calculate timeout deadline for a review based on priority."""
-    timeout_hours = {'critical': 2, 'high': 4, 'normal': 8, 'low': 24}.get(priority, 8)
-    timeout_time = datetime.utcnow() + timedelta(hours=timeout_hours)
-    return timeout_time.isoformat()
+    timeout_hours = PRIORITY_TIMEOUT_HOURS.get(priority, PRIORITY_TIMEOUT_HOURS[DEFAULT_PRIORITY])
+    return (now or datetime.now(timezone.utc)) + timedelta(hours=timeout_hours)
+
+def calculate_review_timeout(priority: str, now: Optional[datetime] = None) -> str:
+    """Calculate timeout deadline for a review as an ISO timestamp."""
+    return calculate_review_deadline(priority, now).isoformat()
 
-def update_moderator_workload(moderator_id: str, change: int):
+def update_moderator_workload(moderator_id: str, change: int, last_active: Optional[str] = None):
     """Update moderator workload count."""
+    # Workload-sensitive checks must re-read the profile after this
+    moderator_profile_cache.pop(moderator_id, None)
     try:
         moderator_profile_table.update_item(
             Key={'moderatorId': moderator_id},
-            UpdateExpression="ADD statistics.currentWorkload :change SET lastActive = :last_active",
+            UpdateExpression=WORKLOAD_UPDATE_EXPRESSION,
             ExpressionAttributeValues={
                 ':change': change,
-                ':last_active': datetime.utcnow().isoformat()
+                ':last_active': last_active or datetime.now(timezone.utc).isoformat()
             }
         )
     except Exception as e:
         logger.error(f"Error updating moderator workload: {str(e)}")
 
-def send_assignment_notification(moderator_id: str, review_id: str, review: Dict[str, Any]):
+def json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string; DynamoDB Decimals are emitted as numbers."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=float).decode()
+    return json.dumps(obj, default=float, separators=(',', ':'))
+
+def build_notification_entry(subject: str, message: Dict[str, Any], moderator_id: Optional[str],
+                             priority: str) -> Dict[str, Any]:
+    """Build an SNS PublishBatch entry for a moderator alert."""
+    return {
+        'Id': uuid.uuid4().hex,
+        'Subject': subject,
+        'Message': json_dumps(message),
+        'MessageAttributes': {
+            'notification_type': {'DataType': 'String', 'StringValue': message['notification_type']},
+            'moderator_id': {'DataType': 'String', 'StringValue': moderator_id or 'system'},
+            'priority': {'DataType': 'String', 'StringValue': priority}
+        }
+    }
+
+def publish_notification(entry: Dict[str, Any]):
+    """Publish a single notification entry."""
+    sns_client.publish(
+        TopicArn=MODERATOR_ALERTS_TOPIC_ARN,
+        Subject=entry['Subject'],
+        Message=entry['Message'],
+        MessageAttributes=entry['MessageAttributes']
+    )
+
+def publish_notification_chunk(chunk: List[Dict[str, Any]]):
+    """Publish up to 10 notification entries in one PublishBatch call."""
+    try:
+        response = sns_client.publish_batch(
+            TopicArn=MODERATOR_ALERTS_TOPIC_ARN,
+            PublishBatchRequestEntries=chunk
+        )
+        for failure in response.get('Failed', []):
+            logger.error(f"Error sending notification {failure.get('Id')}: {failure.get('Message')}")
+    except Exception as e:
+        logger.error(f"Error sending notification batch: {str(e)}")
+
+def publish_notification_batch(entries: List[Dict[str, Any]]):
+    """Publish notification entries in concurrent PublishBatch calls of up to 10."""
+    chunks = [entries[start:start + SNS_PUBLISH_BATCH_SIZE]
+              for start in range(0, len(entries), SNS_PUBLISH_BATCH_SIZE)]
+    if len(chunks) == 1:
+        publish_notification_chunk(chunks[0])
+    else:
+        list(timeout_executor.map(publish_notification_chunk, chunks))
+
+def send_assignment_notification(moderator_id: str, review_id: str, review: Dict[str, Any], assigned_at: str):
     """Send assignment notification to moderator."""
     try:
+        priority = review.get('priority', DEFAULT_PRIORITY)
         message = {
             'notification_type': 'REVIEW_ASSIGNED',
             'moderator_id': moderator_id,
             'review_id': review_id,
-            'priority': review.get('priority', 'normal'),
+            'priority': priority,
             'media_id': review.get('mediaId'),
-            'assigned_at': datetime.utcnow().isoformat()
+            'assigned_at': assigned_at
         }
         
-        sns_client.publish(
-            TopicArn=MODERATOR_ALERTS_TOPIC_ARN,
-            Subject=f'New Review Assignment - {review_id}',
-            Message=json.dumps(message),
-            MessageAttributes={
-                'notification_type': {'DataType': 'String', 'StringValue': 'REVIEW_ASSIGNED'},
-                'moderator_id': {'DataType': 'String', 'StringValue': moderator_id},
-                'priority': {'DataType': 'String', 'StringValue': review.get('priority', 'normal')}
-            }
-        )
+        publish_notification(build_notification_entry(
+            f'New Review Assignment - {review_id}', message, moderator_id, priority
+        ))
         
     except Exception as e:
         logger.error(f"Error sending assignment notification: {str(e)}")
 
-def send_timeout_notification(review_id: str, moderator_id: str, review: Dict[str, Any]):
-    """Send timeout notification."""
+def send_timeout_notification(review_id: str, moderator_id: str, review: Dict[str, Any], timed_out_at: str,
+                              notification_batch: Optional[List[Dict[str, Any]]] = None):
+    """Send timeout notification, or queue it on the given batch."""
     try:
         message = {
             'notification_type': 'REVIEW_TIMEOUT',
             'moderator_id': moderator_id,
             'review_id': review_id,
             'media_id': review.get('mediaId'),
-            'timed_out_at': datetime.utcnow().isoformat()
+            'timed_out_at': timed_out_at
         }
         
-        sns_client.publish(
-            TopicArn=MODERATOR_ALERTS_TOPIC_ARN,
-            Subject=f'Review Timeout - {review_id}',
-            Message=json.dumps(message),
-            MessageAttributes={
-                'notification_type': {'DataType': 'String', 'StringValue': 'REVIEW_TIMEOUT'},
-                'moderator_id': {'DataType': 'String', 'StringValue': moderator_id or 'system'},
-                'priority': {'DataType': 'String', 'StringValue': review.get('priority', 'normal')}
-            }
+        entry = build_notification_entry(
+            f'Review Timeout - {review_id}', message, moderator_id, review.get('priority', DEFAULT_PRIORITY)
         )
+        if notification_batch is not None:
+            notification_batch.append(entry)
+        else:
+            publish_notification(entry)
         
     except Exception as e:
         logger.error(f"Error sending timeout notification: {str(e)}")
@@ -464,6 +944,136 @@ def cleanup_expired_reviews():
     """Clean up expired reviews."""
     return {'statusCode': 200, 'message': 'Cleanup completed'}
 
+def reconcile_moderator_workloads():
+    """Reset drifted moderator workload counters from the review queue.
+    
+    Count errors abort the run rather than being read as zero, and each
+    reset only applies if the counter still holds the value read by the
+    scan, so concurrent ADD updates are never overwritten.
+    """
+    try:
+        scan_kwargs = {
+            'ProjectionExpression': 'moderatorId, statistics.currentWorkload'
+        }
+        corrected = 0
+        skipped = 0
+        while True:
+            response = moderator_profile_table.scan(**scan_kwargs)
+            for moderator in response.get('Items', []):
+                moderator_id = moderator['moderatorId']
+                recorded = moderator.get('statistics', {}).get('currentWorkload')
+                actual = count_active_reviews(moderator_id)
+                if recorded is not None and int(recorded) == actual:
+                    continue
+                
+                if recorded is None:
+                    condition = 'attribute_not_exists(statistics.currentWorkload)'
+                    values = {':workload': actual}
+                else:
+                    condition = 'statistics.currentWorkload = :recorded'
+                    values = {':workload': actual, ':recorded': recorded}
+                
+                try:
+                    moderator_profile_table.update_item(
+                        Key={'moderatorId': moderator_id},
+                        UpdateExpression="SET statistics.currentWorkload = :workload",
+                        ConditionExpression=condition,
+                        ExpressionAttributeValues=values
+                    )
+                    corrected += 1
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                    # The counter moved since the scan; the next run re-checks it
+                    skipped += 1
+                moderator_profile_cache.pop(moderator_id, None)
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        logger.info(f"Reconciled workload counters, corrected {corrected} moderators, skipped {skipped} changed concurrently")
+        return {
+            'statusCode': 200,
+            'message': 'Workload reconciliation completed',
+            'corrected': corrected,
+            'skipped': skipped
+        }
+        
+    except Exception as e:
+        logger.error(f"Error reconciling moderator workloads: {str(e)}")
+        raise
+
+def query_reviews_by_status(status: str) -> List[Dict[str, Any]]:
+    """Query the status index for reviews in the given status, following pagination."""
+    query_kwargs = {
+        'IndexName': 'StatusIndex',
+        'KeyConditionExpression': '#status = :status',
+        'ExpressionAttributeNames': STATUS_ATTRIBUTE_NAMES,
+        'ExpressionAttributeValues': {':status': status}
+    }
+    reviews = []
+    while True:
+        response = review_queue_table.query(**query_kwargs)
+        reviews.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return reviews
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def backfill_review_index_keys(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Add sparse index keys to active reviews assigned before the indexes existed.
+    
+    Sets activeSortKey from assignedAt, and timeoutShard and timeoutAtEpoch
+    from timeoutAt (derived from the priority when a review has none).
+    One-off migration, run once the indexes are deployed and before
+    REVIEW_QUEUE_SPARSE_INDEXES_READY is switched on. Safe to re-run: keys
+    already present are kept, and reviews that finished since the query
+    are skipped by the condition.
+    """
+    try:
+        updated = 0
+        for status in (ASSIGNED, IN_PROGRESS):
+            for review in query_reviews_by_status(status):
+                if all(key in review for key in ('activeSortKey', 'timeoutShard', 'timeoutAtEpoch')):
+                    continue
+                
+                assigned_at = review.get('assignedAt') or review.get('createdAt') or datetime.now(timezone.utc).isoformat()
+                deadline = parse_review_timestamp(review.get('timeoutAt'))
+                if deadline is None:
+                    deadline = calculate_review_deadline(
+                        review.get('priority', DEFAULT_PRIORITY),
+                        parse_review_timestamp(assigned_at)
+                    )
+                
+                try:
+                    review_queue_table.update_item(
+                        Key={'reviewId': review['reviewId']},
+                        UpdateExpression=BACKFILL_UPDATE_EXPRESSION,
+                        ConditionExpression='#status IN (:assigned, :in_progress)',
+                        ExpressionAttributeNames=STATUS_ATTRIBUTE_NAMES,
+                        ExpressionAttributeValues={
+                            ':active_sort_key': ACTIVE_SORT_KEY_PREFIX + assigned_at,
+                            ':timeout_shard': get_timeout_shard(review['reviewId']),
+                            ':timeout_at': deadline.isoformat(),
+                            ':timeout_at_epoch': int(deadline.timestamp()),
+                            ':assigned': ASSIGNED,
+                            ':in_progress': IN_PROGRESS
+                        }
+                    )
+                    updated += 1
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+        
+        logger.info(f"Backfilled sparse index keys on {updated} reviews")
+        return {
+            'statusCode': 200,
+            'body': json_dumps({'message': 'Backfill completed', 'updated': updated})
+        }
+        
+    except Exception as e:
+        logger.error(f"Error backfilling review index keys: {str(e)}")
+        raise
+
 def reassign_review_internal(review):
     """Internal reassignment logic."""
     return {'action': 'reassigned', 'reviewId': review.get('reviewId')}
@@ -496,8 +1106,42 @@ def get_moderator_workload(event):
     """Get moderator workload."""
     return {'statusCode': 200, 'message': 'Workload retrieved'}
 
-def decimal_to_float(obj):
-    """Convert Decimal objects to float for JSON serialization."""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
\ No newline at end of file
+def prime_endpoints():
+    """Open the DynamoDB and SNS connections with one cheap call each."""
+    try:
+        dynamodb_client.describe_endpoints()
+    except Exception as e:
+        logger.warning(f"DynamoDB endpoint priming failed: {str(e)}")
+    
+    try:
+        sns_client.get_topic_attributes(TopicArn=MODERATOR_ALERTS_TOPIC_ARN)
+    except Exception as e:
+        logger.warning(f"SNS endpoint priming failed: {str(e)}")
+
+# Dispatch tables, defined after the handlers they reference
+DIRECT_ACTIONS = {
+    'assign_review': assign_review_to_moderator,
+    'auto_assign_review': auto_assign_review,
+    'update_review_status': update_review_status,
+    'escalate_review': escalate_review,
+    'reassign_review': reassign_review,
+    'complete_review': complete_review,
+    'cancel_review': cancel_review,
+    'get_review_status': get_review_status,
+    'get_moderator_workload': get_moderator_workload,
+    'backfill_review_index_keys': backfill_review_index_keys
+}
+
+# Insertion order is the match order for detail types that embed a task name
+SCHEDULED_TASKS = {
+    'timeout-check': check_review_timeouts,
+    'reassignment-check': check_reassignment_needs,
+    'escalation-check': check_escalation_triggers,
+    'cleanup': cleanup_expired_reviews,
+    'workload-reconcile': reconcile_moderator_workloads
+}
+
+# Pay the TLS handshakes during Lambda init so the first invocation reuses
+# warm connections; skipped outside Lambda (tests, scripts)
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    prime_endpoints()
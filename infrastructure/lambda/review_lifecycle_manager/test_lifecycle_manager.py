@@ -2,8 +2,10 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import json
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from botocore.exceptions import ClientError
 
 # Mock environment variables
 os.environ['REVIEW_QUEUE_TABLE_NAME'] = 'test-review-queue-table'
@@ -14,14 +16,21 @@ os.environ['MODERATOR_ALERTS_TOPIC_ARN'] = 'arn:aws:sns:us-east-1:123456789012:t
 # Import after setting environment variables
 from index import (
     handler, assign_review_to_moderator, check_review_timeouts,
-    is_review_timed_out, handle_review_timeout, is_moderator_available,
-    get_current_workload, calculate_review_timeout, ReviewStatus
+    handle_review_timeout, is_moderator_available,
+    get_current_workload, calculate_review_timeout, ReviewStatus,
+    get_moderator_profile, moderator_profile_cache, reconcile_moderator_workloads,
+    query_timed_out_reviews, get_timeout_shard, select_moderator, invalidate_moderator_heap,
+    auto_assign_review, handle_direct_action, handle_scheduled_event, prime_endpoints,
+    build_notification_entry, publish_notification_batch, json_dumps
 )
 
 class TestReviewLifecycleManager(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        moderator_profile_cache.clear()
+        invalidate_moderator_heap()
+        
         self.mock_dynamodb = Mock()
         self.mock_sns = Mock()
         self.mock_eventbridge = Mock()
@@ -50,24 +59,41 @@ class TestReviewLifecycleManager(unittest.TestCase):
                 'accuracyScore': Decimal('0.85')
             }
         }
+        
+        # Low-level shapes of the same items, as projected by the assignment reads
+        self.review_item = {
+            'reviewId': {'S': 'review-123'},
+            'mediaId': {'S': 'media-456'},
+            'status': {'S': 'pending'},
+            'priority': {'S': 'normal'}
+        }
+        self.moderator_item = {
+            'moderatorId': {'S': 'mod-123'},
+            'status': {'S': 'active'},
+            'role': {'S': 'senior'},
+            'statistics': {'M': {'currentWorkload': {'N': '2'}}}
+        }
+
+    def batch_get_response(self, review=None, moderator=None):
+        """Build a BatchGetItem response holding the given review and moderator."""
+        return {
+            'Responses': {
+                'test-review-queue-table': [review] if review else [],
+                'test-moderator-profile-table': [moderator] if moderator else []
+            },
+            'UnprocessedKeys': {}
+        }
 
     @patch('index.sns_client')
+    @patch('index.dynamodb_client')
     @patch('index.review_queue_table')
     @patch('index.moderator_profile_table')
-    def test_assign_review_to_moderator_success(self, mock_moderator_table, mock_review_table, mock_sns):
+    def test_assign_review_to_moderator_success(self, mock_moderator_table, mock_review_table, mock_dynamodb_client, mock_sns):
         """Test successful review assignment."""
-        # Mock review table response
-        mock_review_table.get_item.return_value = {
-            'Item': self.sample_review
-        }
-        
-        # Mock moderator availability check
-        mock_moderator_table.get_item.return_value = {
-            'Item': self.sample_moderator
-        }
-        
-        # Mock workload query
-        mock_review_table.query.return_value = {'Count': 2}
+        # Review and moderator profile come back from one batch read
+        mock_dynamodb_client.batch_get_item.return_value = self.batch_get_response(
+            self.review_item, self.moderator_item
+        )
         
         # Mock update operations
         mock_review_table.update_item.return_value = {}
@@ -79,7 +105,8 @@ class TestReviewLifecycleManager(unittest.TestCase):
             'moderatorId': 'mod-123'
         }
         
-        result = assign_review_to_moderator(event)
+        with patch('index.boto3') as mock_boto3:
+            result = assign_review_to_moderator(event)
         
         # Parse the result
         result_body = json.loads(result['body'])
@@ -89,10 +116,167 @@ class TestReviewLifecycleManager(unittest.TestCase):
         self.assertEqual(result_body['moderatorId'], 'mod-123')
         self.assertIn('assignedAt', result_body)
         
+        # The hot path reuses the clients built during init
+        mock_boto3.client.assert_not_called()
+        mock_boto3.resource.assert_not_called()
+        
         # Verify database operations
+        mock_dynamodb_client.batch_get_item.assert_called_once()
+        mock_dynamodb_client.get_item.assert_not_called()
+        
+        # Both reads are projected to the attributes assignment inspects
+        request_items = mock_dynamodb_client.batch_get_item.call_args[1]['RequestItems']
+        self.assertEqual(request_items['test-review-queue-table']['Keys'], [{'reviewId': {'S': 'review-123'}}])
+        self.assertIn('ProjectionExpression', request_items['test-review-queue-table'])
+        self.assertIn('ProjectionExpression', request_items['test-moderator-profile-table'])
         mock_review_table.update_item.assert_called_once()
         mock_moderator_table.update_item.assert_called_once()
         mock_sns.publish.assert_called_once()
+        
+        # The status check is re-applied atomically by the write, which must
+        # not recreate a review deleted since the read
+        update_kwargs = mock_review_table.update_item.call_args[1]
+        self.assertTrue(update_kwargs['ConditionExpression'].startswith('attribute_exists(reviewId) AND '))
+        
+        # The epoch deadline matches the ISO one returned to the caller
+        update_values = update_kwargs['ExpressionAttributeValues']
+        self.assertEqual(
+            update_values[':timeout_at_epoch'],
+            int(datetime.fromisoformat(result_body['timeoutAt']).timestamp())
+        )
+
+    @patch('index.sns_client')
+    @patch('index.dynamodb_client')
+    @patch('index.review_queue_table')
+    @patch('index.moderator_profile_table')
+    def test_assign_review_concurrent_assignment(self, mock_moderator_table, mock_review_table, mock_dynamodb_client, mock_sns):
+        """Test that losing an assignment race returns 409 without side effects."""
+        mock_dynamodb_client.batch_get_item.return_value = self.batch_get_response(
+            self.review_item, self.moderator_item
+        )
+        mock_review_table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+            'UpdateItem'
+        )
+        
+        result = assign_review_to_moderator({'reviewId': 'review-123', 'moderatorId': 'mod-123'})
+        
+        self.assertEqual(result['statusCode'], 409)
+        mock_moderator_table.update_item.assert_not_called()
+        mock_sns.publish.assert_not_called()
+
+    @patch('index.sns_client')
+    @patch('index.dynamodb_client')
+    @patch('index.review_queue_table')
+    @patch('index.moderator_profile_table')
+    def test_assign_review_to_moderator_parallel(self, mock_moderator_table, mock_review_table, mock_dynamodb_client,
+                                                 mock_sns):
+        """Test that the workload update and notification are sent concurrently."""
+        mock_dynamodb_client.batch_get_item.return_value = self.batch_get_response(
+            self.review_item, self.moderator_item
+        )
+        # The workload update only completes once the notification is sent,
+        # which would time out if the two ran one after the other
+        published = threading.Event()
+        mock_sns.publish.side_effect = lambda **kwargs: published.set()
+        waited = []
+        mock_moderator_table.update_item.side_effect = lambda **kwargs: waited.append(published.wait(5))
+        
+        result = assign_review_to_moderator({'reviewId': 'review-123', 'moderatorId': 'mod-123'})
+        
+        self.assertEqual(result['statusCode'], 200)
+        mock_review_table.update_item.assert_called_once()
+        mock_moderator_table.update_item.assert_called_once()
+        mock_sns.publish.assert_called_once()
+        self.assertEqual(waited, [True])
+
+    @patch('index.dynamodb_client')
+    @patch('index.review_queue_table')
+    def test_assign_review_already_assigned(self, mock_review_table, mock_dynamodb_client):
+        """Test that an already assigned review is rejected before any write."""
+        mock_dynamodb_client.batch_get_item.return_value = self.batch_get_response(
+            {**self.review_item, 'status': {'S': 'assigned'}},
+            self.moderator_item
+        )
+        
+        result = assign_review_to_moderator({'reviewId': 'review-123', 'moderatorId': 'mod-123'})
+        
+        self.assertEqual(result['statusCode'], 409)
+        mock_review_table.update_item.assert_not_called()
+
+    @patch('index.dynamodb_client')
+    def test_select_moderator_prefers_least_loaded(self, mock_dynamodb_client):
+        """Test that selection pops the least loaded eligible moderator and spreads work."""
+        mock_dynamodb_client.scan.return_value = {
+            'Items': [
+                {'moderatorId': {'S': 'mod-busy'}, 'role': {'S': 'senior'}, 'statistics': {'M': {'currentWorkload': {'N': '4'}}}},
+                {'moderatorId': {'S': 'mod-idle'}, 'role': {'S': 'senior'}, 'statistics': {'M': {'currentWorkload': {'N': '0'}}}},
+                {'moderatorId': {'S': 'mod-junior'}, 'role': {'S': 'junior'}, 'statistics': {'M': {'currentWorkload': {'N': '1'}}}}
+            ]
+        }
+        
+        # Ties on workload go to the more senior role
+        self.assertEqual(select_moderator('normal'), 'mod-idle')
+        self.assertEqual(select_moderator('normal'), 'mod-idle')
+        self.assertEqual(select_moderator('normal'), 'mod-junior')
+        mock_dynamodb_client.scan.assert_called_once()
+
+    @patch('index.dynamodb_client')
+    def test_select_moderator_critical_requires_senior(self, mock_dynamodb_client):
+        """Test that juniors are skipped for critical reviews and none at capacity are picked."""
+        mock_dynamodb_client.scan.return_value = {
+            'Items': [
+                {'moderatorId': {'S': 'mod-junior'}, 'role': {'S': 'junior'}, 'statistics': {'M': {'currentWorkload': {'N': '0'}}}},
+                {'moderatorId': {'S': 'mod-full'}, 'role': {'S': 'senior'}, 'statistics': {'M': {'currentWorkload': {'N': '5'}}}}
+            ]
+        }
+        
+        self.assertIsNone(select_moderator('critical'))
+        self.assertEqual(select_moderator('normal'), 'mod-junior')
+
+    @patch('index.sns_client')
+    @patch('index.dynamodb_client')
+    @patch('index.review_queue_table')
+    @patch('index.moderator_profile_table')
+    def test_auto_assign_review(self, mock_moderator_table, mock_review_table, mock_dynamodb_client, mock_sns):
+        """Test automatic assignment to the selected moderator."""
+        # The review read, then the availability check's profile read
+        mock_dynamodb_client.get_item.side_effect = [{'Item': self.review_item}, {'Item': self.moderator_item}]
+        mock_dynamodb_client.scan.return_value = {
+            'Items': [{'moderatorId': {'S': 'mod-123'}, 'role': {'S': 'senior'}, 'statistics': {'M': {'currentWorkload': {'N': '2'}}}}]
+        }
+        
+        result = auto_assign_review({'reviewId': 'review-123'})
+        
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(json.loads(result['body'])['moderatorId'], 'mod-123')
+        self.assertEqual(mock_dynamodb_client.get_item.call_count, 2)
+        mock_review_table.get_item.assert_not_called()
+
+    @patch('index.sns_client')
+    @patch('index.dynamodb_client')
+    @patch('index.review_queue_table')
+    @patch('index.moderator_profile_table')
+    def test_assign_review_unprocessed_keys_fall_back(self, mock_moderator_table, mock_review_table, mock_dynamodb_client,
+                                                      mock_sns):
+        """Test that keys left unprocessed by BatchGetItem are read individually."""
+        mock_dynamodb_client.batch_get_item.return_value = {
+            'Responses': {'test-moderator-profile-table': [self.moderator_item]},
+            'UnprocessedKeys': {'test-review-queue-table': {'Keys': [{'reviewId': {'S': 'review-123'}}]}}
+        }
+        mock_dynamodb_client.get_item.return_value = {'Item': self.review_item}
+        
+        result = assign_review_to_moderator({'reviewId': 'review-123', 'moderatorId': 'mod-123'})
+        
+        self.assertEqual(result['statusCode'], 200)
+        mock_dynamodb_client.get_item.assert_called_once()
+        get_kwargs = mock_dynamodb_client.get_item.call_args[1]
+        self.assertEqual(get_kwargs['TableName'], 'test-review-queue-table')
+        
+        # The fallback read keeps the batch read's projection
+        request_items = mock_dynamodb_client.batch_get_item.call_args[1]['RequestItems']
+        self.assertEqual(get_kwargs['ProjectionExpression'],
+                         request_items['test-review-queue-table']['ProjectionExpression'])
 
     def test_assign_review_missing_parameters(self):
         """Test assignment with missing parameters."""
@@ -104,10 +288,10 @@ class TestReviewLifecycleManager(unittest.TestCase):
         result_body = json.loads(result['body'])
         self.assertIn('reviewId and moderatorId are required', result_body['error'])
 
-    @patch('index.review_queue_table')
-    def test_assign_review_not_found(self, mock_review_table):
+    @patch('index.dynamodb_client')
+    def test_assign_review_not_found(self, mock_dynamodb_client):
         """Test assignment when review doesn't exist."""
-        mock_review_table.get_item.return_value = {}
+        mock_dynamodb_client.batch_get_item.return_value = self.batch_get_response(moderator=self.moderator_item)
         
         event = {
             'reviewId': 'nonexistent-review',
@@ -120,20 +304,15 @@ class TestReviewLifecycleManager(unittest.TestCase):
         result_body = json.loads(result['body'])
         self.assertEqual(result_body['error'], 'Review not found')
 
-    @patch('index.review_queue_table')
-    def test_check_review_timeouts(self, mock_review_table):
+    @patch('index.SPARSE_INDEXES_READY', True)
+    @patch('index.dynamodb_client')
+    def test_check_review_timeouts(self, mock_dynamodb_client):
         """Test timeout checking functionality."""
-        # Mock query responses for different statuses
-        timed_out_review = self.sample_review.copy()
-        timed_out_review['timeoutAt'] = (datetime.utcnow() - timedelta(hours=1)).isoformat()
-        
-        mock_review_table.query.return_value = {
-            'Items': [timed_out_review]
+        # Every shard returns the same review; it must be handled once
+        mock_dynamodb_client.query.return_value = {
+            'Items': [{'reviewId': {'S': 'review-123'}, 'priority': {'S': 'normal'}}]
         }
         
-        # Mock update operation
-        mock_review_table.update_item.return_value = {}
-        
         with patch('index.handle_review_timeout') as mock_handle_timeout:
             mock_handle_timeout.return_value = {
                 'reviewId': 'review-123',
@@ -145,99 +324,380 @@ class TestReviewLifecycleManager(unittest.TestCase):
             self.assertEqual(result['statusCode'], 200)
             self.assertIn('Processed 1 timed out reviews', result['message'])
             mock_handle_timeout.assert_called_once()
+        
+        # The sweep time is computed once and bound to every shard query
+        now_values = {call[1]['ExpressionAttributeValues'][':now']['N']
+                      for call in mock_dynamodb_client.query.call_args_list}
+        self.assertEqual(mock_dynamodb_client.query.call_count, 16)
+        self.assertEqual(len(now_values), 1)
+        
+        # The deadline is a key condition on the sparse index, not a filter
+        query_kwargs = mock_dynamodb_client.query.call_args[1]
+        self.assertEqual(query_kwargs['IndexName'], 'TimeoutShardIndex')
+        self.assertIn('timeoutAtEpoch <= :now', query_kwargs['KeyConditionExpression'])
+        self.assertNotIn('FilterExpression', query_kwargs)
+
+    @patch('index.SPARSE_INDEXES_READY', False)
+    @patch('index.update_moderator_workload')
+    @patch('index.handle_review_timeout')
+    @patch('index.review_queue_table')
+    def test_check_review_timeouts_before_backfill(self, mock_review_table, mock_handle_timeout,
+                                                   mock_update_workload):
+        """Test that the sweep pages through StatusIndex until the timeout keys are backfilled."""
+        now = datetime(2024, 1, 1, 20, 0, tzinfo=timezone.utc)
+        pages = {
+            'assigned': [
+                {
+                    'Items': [{'reviewId': 'review-1', 'assignedModerator': 'mod-1',
+                               'timeoutAt': '2024-01-01T18:00:00.000000'}],
+                    'LastEvaluatedKey': {'reviewId': 'review-1'}
+                },
+                {'Items': [{'reviewId': 'review-2', 'assignedModerator': 'mod-1',
+                            'timeoutAt': '2024-01-01T22:00:00+00:00'}]}
+            ],
+            'in_progress': [
+                {'Items': [{'reviewId': 'review-3', 'assignedModerator': 'mod-2',
+                            'timeoutAt': '2024-01-01T19:59:00Z'}]}
+            ]
+        }
+        mock_review_table.query.side_effect = (
+            lambda **kwargs: pages[kwargs['ExpressionAttributeValues'][':status']].pop(0)
+        )
+        mock_handle_timeout.side_effect = (
+            lambda review, now_iso, batch: {'reviewId': review['reviewId'], 'action': 'timeout_expired'}
+        )
+        
+        result = check_review_timeouts(now)
+        
+        handled = sorted(call[0][0]['reviewId'] for call in mock_handle_timeout.call_args_list)
+        self.assertEqual(handled, ['review-1', 'review-3'])
+        self.assertEqual(mock_review_table.query.call_count, 3)
+        for call in mock_review_table.query.call_args_list:
+            self.assertEqual(call[1]['IndexName'], 'StatusIndex')
+        self.assertIn('Processed 2 timed out reviews', result['message'])
 
-    def test_is_review_timed_out_true(self):
-        """Test timeout detection for timed out review."""
-        review = {
-            'timeoutAt': (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    @patch('index.SPARSE_INDEXES_READY', True)
+    @patch('index.update_moderator_workload')
+    @patch('index.handle_review_timeout')
+    @patch('index.dynamodb_client')
+    def test_check_review_timeouts_uses_given_time(self, mock_dynamodb_client, mock_handle_timeout,
+                                                   mock_update_workload):
+        """Test that a supplied sweep time is used for the queries, expiry and workload."""
+        mock_dynamodb_client.query.return_value = {
+            'Items': [{'reviewId': {'S': 'review-123'}, 'assignedModerator': {'S': 'mod-123'}}]
         }
-        current_time = datetime.utcnow()
+        mock_handle_timeout.return_value = {'reviewId': 'review-123', 'action': 'timeout_expired'}
+        now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
         
-        result = is_review_timed_out(review, current_time)
+        check_review_timeouts(now)
         
-        self.assertTrue(result)
+        query_values = mock_dynamodb_client.query.call_args[1]['ExpressionAttributeValues']
+        self.assertEqual(query_values[':now'], {'N': str(int(now.timestamp()))})
+        self.assertEqual(mock_handle_timeout.call_args[0][1], now.isoformat())
+        mock_update_workload.assert_called_once_with('mod-123', -1, now.isoformat())
 
-    def test_is_review_timed_out_false(self):
-        """Test timeout detection for active review."""
-        review = {
-            'timeoutAt': (datetime.utcnow() + timedelta(hours=1)).isoformat()
+    @patch('index.SPARSE_INDEXES_READY', True)
+    @patch('index.sns_client')
+    @patch('index.moderator_profile_table')
+    @patch('index.review_queue_table')
+    @patch('index.dynamodb_client')
+    def test_check_review_timeouts_coalesces_workload(self, mock_dynamodb_client, mock_review_table,
+                                                      mock_moderator_table, mock_sns):
+        """Test that one workload update is issued per moderator per sweep."""
+        assigned_reviews = [
+            {'reviewId': {'S': review_id}, 'assignedModerator': {'S': 'mod-123'},
+             'priority': {'S': 'normal'}, 'mediaId': {'S': 'media-456'}}
+            for review_id in ('review-1', 'review-2')
+        ]
+        mock_dynamodb_client.query.side_effect = lambda **kwargs: {
+            'Items': assigned_reviews if kwargs['ExpressionAttributeValues'][':shard'] == {'N': '0'} else []
         }
-        current_time = datetime.utcnow()
         
-        result = is_review_timed_out(review, current_time)
+        result = check_review_timeouts()
         
-        self.assertFalse(result)
+        self.assertIn('Processed 2 timed out reviews', result['message'])
+        self.assertEqual(mock_review_table.update_item.call_count, 2)
+        mock_moderator_table.update_item.assert_called_once()
+        workload_values = mock_moderator_table.update_item.call_args[1]['ExpressionAttributeValues']
+        self.assertEqual(workload_values[':change'], -2)
+        
+        # Both timeout notifications go out in one batch call
+        mock_sns.publish.assert_not_called()
+        mock_sns.publish_batch.assert_called_once()
+        entries = mock_sns.publish_batch.call_args[1]['PublishBatchRequestEntries']
+        self.assertEqual(len(entries), 2)
+        message = json.loads(entries[0]['Message'])
+        self.assertEqual(message['notification_type'], 'REVIEW_TIMEOUT')
+        self.assertEqual(message['media_id'], 'media-456')
+
+    @patch('index.sns_client')
+    def test_publish_notification_batch_chunks(self, mock_sns):
+        """Test that notifications are split into PublishBatch calls of at most 10."""
+        mock_sns.publish_batch.return_value = {'Successful': [], 'Failed': []}
+        entries = [
+            build_notification_entry('Review Timeout', {'notification_type': 'REVIEW_TIMEOUT', 'review_id': f'review-{i}'},
+                                     'mod-123', 'normal')
+            for i in range(23)
+        ]
+        
+        publish_notification_batch(entries)
+        
+        chunk_sizes = sorted(len(call[1]['PublishBatchRequestEntries'])
+                             for call in mock_sns.publish_batch.call_args_list)
+        self.assertEqual(chunk_sizes, [3, 10, 10])
+        mock_sns.publish.assert_not_called()
 
-    def test_is_review_timed_out_no_timeout(self):
-        """Test timeout detection when no timeout is set."""
-        review = {}
-        current_time = datetime.utcnow()
+    @patch('index.SPARSE_INDEXES_READY', True)
+    @patch('index.sns_client')
+    @patch('index.moderator_profile_table')
+    @patch('index.review_queue_table')
+    @patch('index.dynamodb_client')
+    def test_check_review_timeouts_updates_each_moderator_once(self, mock_dynamodb_client, mock_review_table,
+                                                               mock_moderator_table, mock_sns):
+        """Test that moderators with expired reviews each get one summed workload update."""
+        expired_reviews = [
+            {'reviewId': {'S': f'review-{i}'}, 'assignedModerator': {'S': moderator_id}, 'priority': {'S': 'low'}}
+            for i, moderator_id in enumerate(['mod-1', 'mod-1', 'mod-1', 'mod-2', 'mod-3'])
+        ]
+        mock_dynamodb_client.query.side_effect = lambda **kwargs: {
+            'Items': expired_reviews if kwargs['ExpressionAttributeValues'][':shard'] == {'N': '0'} else []
+        }
         
-        result = is_review_timed_out(review, current_time)
+        check_review_timeouts()
         
-        self.assertFalse(result)
+        changes = {
+            call[1]['Key']['moderatorId']: call[1]['ExpressionAttributeValues'][':change']
+            for call in mock_moderator_table.update_item.call_args_list
+        }
+        self.assertEqual(changes, {'mod-1': -3, 'mod-2': -1, 'mod-3': -1})
+        self.assertEqual(mock_moderator_table.update_item.call_count, 3)
 
-    @patch('index.moderator_profile_table')
+    @patch('index.sns_client')
     @patch('index.review_queue_table')
-    def test_is_moderator_available_true(self, mock_review_table, mock_moderator_table):
+    def test_handle_review_timeout_already_moved_on(self, mock_review_table, mock_sns):
+        """Test that a review completed since the query is not expired."""
+        mock_review_table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+            'UpdateItem'
+        )
+        
+        result = handle_review_timeout({**self.sample_review, 'assignedModerator': 'mod-123'})
+        
+        self.assertEqual(result['action'], 'timeout_skipped')
+        mock_sns.publish.assert_not_called()
+
+    @patch('index.dynamodb_client')
+    def test_query_timed_out_reviews_paginates(self, mock_dynamodb_client):
+        """Test that a shard query follows LastEvaluatedKey to the last page."""
+        last_key = {'reviewId': {'S': 'review-1'}}
+        mock_dynamodb_client.query.side_effect = [
+            {'Items': [{'reviewId': {'S': 'review-1'}, 'priority': {'S': 'high'}}], 'LastEvaluatedKey': last_key},
+            {'Items': [{'reviewId': {'S': 'review-2'}, 'priority': {'S': 'low'}}]}
+        ]
+        
+        reviews = query_timed_out_reviews(3, 1704110400)
+        
+        self.assertEqual(reviews, [
+            {'reviewId': 'review-1', 'priority': 'high'},
+            {'reviewId': 'review-2', 'priority': 'low'}
+        ])
+        second_call = mock_dynamodb_client.query.call_args_list[1][1]
+        self.assertEqual(second_call['ExclusiveStartKey'], last_key)
+        self.assertEqual(second_call['ExpressionAttributeValues'], {':shard': {'N': '3'}, ':now': {'N': '1704110400'}})
+
+    def test_get_timeout_shard_stable(self):
+        """Test that shard assignment is deterministic and in range."""
+        shard = get_timeout_shard('review-123')
+        
+        self.assertEqual(shard, get_timeout_shard('review-123'))
+        self.assertTrue(0 <= shard < 16)
+
+    @patch('index.dynamodb_client')
+    def test_is_moderator_available_true(self, mock_dynamodb_client):
         """Test moderator availability check for available moderator."""
-        # Mock moderator profile
-        mock_moderator_table.get_item.return_value = {
-            'Item': self.sample_moderator
+        # Mock moderator profile (workload counter below max)
+        mock_dynamodb_client.get_item.return_value = {
+            'Item': self.moderator_item
         }
         
-        # Mock current workload (below max)
-        mock_review_table.query.return_value = {'Count': 2}
-        
         result = is_moderator_available('mod-123', 'normal')
         
         self.assertTrue(result)
+        # Workload comes from the profile counter, not a queue query
+        mock_dynamodb_client.query.assert_not_called()
 
-    @patch('index.moderator_profile_table')
-    def test_is_moderator_available_inactive(self, mock_moderator_table):
+    @patch('index.dynamodb_client')
+    def test_is_moderator_available_inactive(self, mock_dynamodb_client):
         """Test moderator availability check for inactive moderator."""
-        inactive_moderator = self.sample_moderator.copy()
-        inactive_moderator['status'] = 'inactive'
-        
-        mock_moderator_table.get_item.return_value = {
-            'Item': inactive_moderator
+        mock_dynamodb_client.get_item.return_value = {
+            'Item': {**self.moderator_item, 'status': {'S': 'inactive'}}
         }
         
         result = is_moderator_available('mod-123', 'normal')
         
         self.assertFalse(result)
 
-    @patch('index.moderator_profile_table')
-    @patch('index.review_queue_table')
-    def test_is_moderator_available_overloaded(self, mock_review_table, mock_moderator_table):
+    @patch('index.dynamodb_client')
+    def test_is_moderator_available_overloaded(self, mock_dynamodb_client):
         """Test moderator availability check for overloaded moderator."""
-        mock_moderator_table.get_item.return_value = {
-            'Item': self.sample_moderator
-        }
-        
         # Mock high workload (at max capacity)
-        mock_review_table.query.return_value = {'Count': 5}  # Max for senior is 5
+        mock_dynamodb_client.get_item.return_value = {
+            'Item': {**self.moderator_item, 'statistics': {'M': {'currentWorkload': {'N': '5'}}}}  # Max for senior is 5
+        }
         
         result = is_moderator_available('mod-123', 'normal')
         
         self.assertFalse(result)
 
-    @patch('index.review_queue_table')
-    def test_get_current_workload(self, mock_review_table):
+    @patch('index.dynamodb_client')
+    def test_get_moderator_profile_cached(self, mock_dynamodb_client):
+        """Test that warm lookups reuse the cached moderator profile."""
+        mock_dynamodb_client.get_item.return_value = {'Item': self.moderator_item}
+        
+        first = get_moderator_profile('mod-123')
+        second = get_moderator_profile('mod-123')
+        
+        self.assertEqual(first, {
+            'moderatorId': 'mod-123',
+            'status': 'active',
+            'role': 'senior',
+            'statistics': {'currentWorkload': 2}
+        })
+        self.assertEqual(first, second)
+        mock_dynamodb_client.get_item.assert_called_once()
+
+    @patch('index.dynamodb_client')
+    @patch('index.moderator_profile_table')
+    def test_reconcile_moderator_workloads(self, mock_moderator_table, mock_dynamodb_client):
+        """Test that drifted workload counters are reset from the queue."""
+        mock_moderator_table.scan.return_value = {
+            'Items': [
+                {'moderatorId': 'mod-123', 'statistics': {'currentWorkload': Decimal('4')}},
+                {'moderatorId': 'mod-456', 'statistics': {'currentWorkload': Decimal('1')}}
+            ]
+        }
+        mock_dynamodb_client.query.side_effect = [{'Count': 2}, {'Count': 1}]
+        
+        result = reconcile_moderator_workloads()
+        
+        self.assertEqual(result['corrected'], 1)
+        mock_moderator_table.update_item.assert_called_once()
+        call_kwargs = mock_moderator_table.update_item.call_args[1]
+        self.assertEqual(call_kwargs['Key'], {'moderatorId': 'mod-123'})
+        self.assertEqual(call_kwargs['ExpressionAttributeValues'][':workload'], 2)
+        self.assertEqual(call_kwargs['ConditionExpression'], 'statistics.currentWorkload = :recorded')
+        self.assertEqual(call_kwargs['ExpressionAttributeValues'][':recorded'], Decimal('4'))
+
+    @patch('index.dynamodb_client')
+    @patch('index.moderator_profile_table')
+    def test_reconcile_moderator_workloads_skips_concurrent_update(self, mock_moderator_table, mock_dynamodb_client):
+        """Test that a counter changed since the scan is left for the next run."""
+        mock_moderator_table.scan.return_value = {
+            'Items': [{'moderatorId': 'mod-123', 'statistics': {'currentWorkload': Decimal('4')}}]
+        }
+        mock_dynamodb_client.query.return_value = {'Count': 2}
+        mock_moderator_table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem'
+        )
+        
+        result = reconcile_moderator_workloads()
+        
+        self.assertEqual(result['corrected'], 0)
+        self.assertEqual(result['skipped'], 1)
+
+    @patch('index.dynamodb_client')
+    @patch('index.moderator_profile_table')
+    def test_reconcile_moderator_workloads_query_error(self, mock_moderator_table, mock_dynamodb_client):
+        """Test that a failed workload count aborts instead of resetting the counter to zero."""
+        mock_moderator_table.scan.return_value = {
+            'Items': [{'moderatorId': 'mod-123', 'statistics': {'currentWorkload': Decimal('4')}}]
+        }
+        mock_dynamodb_client.query.side_effect = ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'Query'
+        )
+        
+        with self.assertRaises(ClientError):
+            reconcile_moderator_workloads()
+        
+        mock_moderator_table.update_item.assert_not_called()
+
+    @patch('index.SPARSE_INDEXES_READY', True)
+    @patch('index.dynamodb_client')
+    def test_get_current_workload(self, mock_dynamodb_client):
         """Test current workload calculation."""
-        mock_review_table.query.return_value = {'Count': 3}
+        mock_dynamodb_client.query.return_value = {'Count': 3}
+        
+        result = get_current_workload('mod-123')
+        
+        self.assertEqual(result, 3)
+        mock_dynamodb_client.query.assert_called_once()
+        call_kwargs = mock_dynamodb_client.query.call_args[1]
+        self.assertEqual(call_kwargs['IndexName'], 'ModeratorActiveIndex')
+        self.assertEqual(call_kwargs['Select'], 'COUNT')
+        self.assertNotIn('FilterExpression', call_kwargs)
+
+    @patch('index.SPARSE_INDEXES_READY', False)
+    @patch('index.dynamodb_client')
+    def test_get_current_workload_before_backfill(self, mock_dynamodb_client):
+        """Test that workload is counted from ModeratorIndex until the backfill has run."""
+        mock_dynamodb_client.query.side_effect = [
+            {'Count': 2, 'LastEvaluatedKey': {'reviewId': {'S': 'review-2'}}},
+            {'Count': 1}
+        ]
         
         result = get_current_workload('mod-123')
         
         self.assertEqual(result, 3)
-        mock_review_table.query.assert_called_once()
+        first_call, second_call = mock_dynamodb_client.query.call_args_list
+        self.assertEqual(first_call[1]['IndexName'], 'ModeratorIndex')
+        self.assertEqual(first_call[1]['FilterExpression'], '#status IN (:assigned, :in_progress)')
+        self.assertEqual(first_call[1]['Select'], 'COUNT')
+        self.assertEqual(second_call[1]['ExclusiveStartKey'], {'reviewId': {'S': 'review-2'}})
+
+    @patch('index.review_queue_table')
+    def test_backfill_review_index_keys(self, mock_review_table):
+        """Test that active reviews missing the sparse index keys are backfilled."""
+        mock_review_table.query.side_effect = [
+            {
+                'Items': [{'reviewId': 'review-1', 'assignedAt': '2024-01-01T10:00:00+00:00'}],
+                'LastEvaluatedKey': {'reviewId': 'review-1'}
+            },
+            {'Items': [{
+                'reviewId': 'review-2',
+                'activeSortKey': 'active#2024-01-01T09:00:00+00:00',
+                'timeoutShard': Decimal('3'),
+                'timeoutAtEpoch': Decimal('1704128400')
+            }]},
+            {'Items': [{'reviewId': 'review-3', 'assignedAt': '2024-01-01T11:00:00+00:00'}]}
+        ]
+        mock_review_table.update_item.side_effect = [
+            None,
+            ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem')
+        ]
+        
+        result = handle_direct_action({'action': 'backfill_review_index_keys'}, {})
+        
+        self.assertEqual(json.loads(result['body'])['updated'], 1)
+        self.assertEqual(mock_review_table.query.call_count, 3)
+        self.assertEqual(mock_review_table.update_item.call_count, 2)
+        call_kwargs = mock_review_table.update_item.call_args_list[0][1]
+        self.assertEqual(call_kwargs['Key'], {'reviewId': 'review-1'})
+        values = call_kwargs['ExpressionAttributeValues']
+        self.assertEqual(values[':active_sort_key'], 'active#2024-01-01T10:00:00+00:00')
+        self.assertEqual(values[':timeout_shard'], get_timeout_shard('review-1'))
+        # No timeoutAt recorded: the normal-priority deadline is derived from assignedAt
+        self.assertEqual(values[':timeout_at'], '2024-01-01T18:00:00+00:00')
+        self.assertEqual(
+            values[':timeout_at_epoch'],
+            int(datetime(2024, 1, 1, 18, tzinfo=timezone.utc).timestamp())
+        )
 
     def test_calculate_review_timeout(self):
         """Test timeout calculation for different priorities."""
         # Test critical priority (2 hours)
         timeout_critical = calculate_review_timeout('critical')
         timeout_time = datetime.fromisoformat(timeout_critical)
-        expected_time = datetime.utcnow() + timedelta(hours=2)
+        expected_time = datetime.now(timezone.utc) + timedelta(hours=2)
         
         # Allow for small time differences in test execution
         time_diff = abs((timeout_time - expected_time).total_seconds())
@@ -246,7 +706,7 @@ class TestReviewLifecycleManager(unittest.TestCase):
         # Test normal priority (8 hours)
         timeout_normal = calculate_review_timeout('normal')
         timeout_time = datetime.fromisoformat(timeout_normal)
-        expected_time = datetime.utcnow() + timedelta(hours=8)
+        expected_time = datetime.now(timezone.utc) + timedelta(hours=8)
         
         time_diff = abs((timeout_time - expected_time).total_seconds())
         self.assertLess(time_diff, 60)
@@ -274,6 +734,46 @@ class TestReviewLifecycleManager(unittest.TestCase):
         
         mock_scheduled_handler.assert_called_once_with(event, {})
 
+    @patch('index.sns_client')
+    @patch('index.dynamodb_client')
+    def test_prime_endpoints(self, mock_dynamodb_client, mock_sns):
+        """Test that endpoint priming touches each endpoint once and never raises."""
+        mock_dynamodb_client.describe_endpoints.side_effect = Exception('Network unreachable')
+        
+        prime_endpoints()
+        
+        mock_dynamodb_client.describe_endpoints.assert_called_once_with()
+        mock_sns.get_topic_attributes.assert_called_once_with(
+            TopicArn='arn:aws:sns:us-east-1:123456789012:test-moderator-alerts'
+        )
+
+    def test_handle_direct_action_dispatch(self):
+        """Test that direct actions dispatch through the action table."""
+        mock_action = Mock(return_value={'statusCode': 200})
+        event = {'action': 'escalate_review', 'reviewId': 'review-123'}
+        
+        with patch.dict('index.DIRECT_ACTIONS', {'escalate_review': mock_action}):
+            result = handle_direct_action(event, {})
+        
+        self.assertEqual(result['statusCode'], 200)
+        mock_action.assert_called_once_with(event)
+        
+        unknown = handle_direct_action({'action': 'unknown_action'}, {})
+        self.assertEqual(unknown['statusCode'], 400)
+
+    def test_handle_scheduled_event_dispatch(self):
+        """Test that scheduled tasks match exact and embedded task names."""
+        mock_task = Mock(return_value={'statusCode': 200})
+        
+        with patch.dict('index.SCHEDULED_TASKS', {'cleanup': mock_task}):
+            handle_scheduled_event({'detail-type': 'cleanup'}, {})
+            handle_scheduled_event({'detail-type': 'Hlekkr-Review-Cleanup'}, {})
+        
+        self.assertEqual(mock_task.call_count, 2)
+        
+        unknown = handle_scheduled_event({'detail-type': 'Something Else'}, {})
+        self.assertEqual(unknown['message'], 'Unknown event type')
+
     @patch('index.sns_client')
     @patch('index.review_queue_table')
     @patch('index.moderator_profile_table')
@@ -320,5 +820,15 @@ class TestReviewLifecycleManager(unittest.TestCase):
         # Verify timeout notification was sent
         mock_sns.publish.assert_called_once()
 
+    def test_json_dumps_without_orjson(self):
+        """Test that json_dumps falls back to stdlib json when orjson is not packaged."""
+        payload = {'currentWorkload': Decimal('3'), 'reviewIds': ['review-1']}
+        
+        with patch('index.orjson', None):
+            fallback = json_dumps(payload)
+        
+        self.assertEqual(fallback, '{"currentWorkload":3.0,"reviewIds":["review-1"]}')
+        self.assertEqual(json_dumps(payload), fallback)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
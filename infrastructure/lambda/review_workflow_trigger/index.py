@@ -1,40 +1,109 @@
 import json
+try:
+    import orjson
+except ImportError:  # Code.fromAsset does not bundle requirements.txt; fall back to stdlib json
+    orjson = None
 import boto3
+import hashlib
+import math
 import os
+import random
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Shared client config: keep-alive lets warm invocations reuse established
+# connections, and the pool leaves room for concurrent calls
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
-lambda_client = boto3.client('lambda')
-stepfunctions_client = boto3.client('stepfunctions')
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+# Low-level client for the batched audit writes, skipping the resource
+# layer's per-request transformation
+dynamodb_client = boto3.client('dynamodb', config=BOTO_CONFIG)
+stepfunctions_client = boto3.client('stepfunctions', config=BOTO_CONFIG)
+
+# Only batch fan-out invokes Lambda, so its client is created on first use
+@lru_cache(maxsize=None)
+def get_lambda_client():
+    return boto3.client('lambda', config=BOTO_CONFIG)
 
 # Environment variables
 AUDIT_TABLE_NAME = os.environ['AUDIT_TABLE_NAME']
 MEDIA_BUCKET_NAME = os.environ['MEDIA_BUCKET_NAME']
+REVIEW_STATE_MACHINE_ARN = os.environ['REVIEW_STATE_MACHINE_ARN']
+
+# Deployed names of the functions this trigger invokes, resolved once at init;
+# Lambda sets AWS_LAMBDA_FUNCTION_NAME to this function's own name
+FUNCTION_NAMES = {
+    'hlekkr-review-workflow-trigger': os.environ['AWS_LAMBDA_FUNCTION_NAME']
+}
 
 # DynamoDB table
 audit_table = dynamodb.Table(AUDIT_TABLE_NAME)
 
+# Converters between Python values and low-level DynamoDB attribute values
+serialize_attribute = TypeSerializer().serialize
+deserialize_attribute = TypeDeserializer().deserialize
+
+# Worker pool for fanning out workflow starts and child invocations, reused
+# across warm invocations; it stays below the client connection pool
+MAX_FANOUT_WORKERS = 32
+fanout_executor = ThreadPoolExecutor(max_workers=MAX_FANOUT_WORKERS)
+
+# Larger batches are launched in two tiers: the trigger invokes itself once
+# per shard of about sqrt(N) items, and each shard launches its workflows
+FANOUT_TIER_THRESHOLD = 64
+
+# Audit table GSI keyed on eventType with timestamp as the sort key
+EVENT_TYPE_INDEX_NAME = 'EventTypeIndex'
+
+# BatchWriteItem takes at most 25 items; throttled or unprocessed items are
+# retried with capped exponential backoff and jitter
+AUDIT_BATCH_SIZE = 25
+AUDIT_WRITE_MAX_ATTEMPTS = 8
+RETRYABLE_WRITE_ERRORS = frozenset({
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError'
+})
+
 def handler(event, context):
     """
     Lambda function to trigger and orchestrate media review workflows.
     Handles media upload events and initiates the complete analysis pipeline.
     """
     try:
-        logger.info(f"Processing review workflow trigger: {json.dumps(event)}")
+        logger.info(
+            "Processing review workflow trigger: records=%d mediaId=%s httpMethod=%s",
+            len(event.get('Records', [])), event.get('mediaId'), event.get('httpMethod')
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Workflow trigger event payload: %s", json_dumps(event))
         
         # Determine the type of trigger
         if 'Records' in event:
             # S3 event trigger
             return process_s3_trigger(event)
+        elif 'fanoutShard' in event:
+            # Shard of a batch fanned out by another invocation
+            return process_fanout_shard(event)
         elif 'mediaId' in event or ('body' in event and event.get('httpMethod') == 'POST'):
             # API Gateway trigger
             return process_api_trigger(event)
@@ -46,7 +115,7 @@ def handler(event, context):
         logger.error(f"Error in review workflow trigger: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': 'Review workflow trigger failed',
                 'message': str(e)
             })
@@ -55,17 +124,29 @@ def handler(event, context):
 def process_s3_trigger(event: Dict[str, Any]) -> Dict[str, Any]:
     """Process S3 event triggers for uploaded media."""
     try:
-        processed_workflows = []
-        
+        # Build every workflow record first so they are written together;
+        # records without an S3 event time share the invocation's timestamp
+        timestamp = datetime.utcnow().isoformat()
+        workflow_records = []
         for record in event.get('Records', []):
             if record.get('eventSource') == 'aws:s3':
-                workflow_id = trigger_media_workflow_from_s3(record)
-                if workflow_id:
-                    processed_workflows.append(workflow_id)
+                workflow_record = trigger_media_workflow_from_s3(record, timestamp)
+                if workflow_record:
+                    workflow_records.append(workflow_record)
+        
+        # Workflows whose record could not be stored are not started
+        failed_keys = {audit_record_key(record) for record in write_audit_records(workflow_records)}
+        
+        # Start the stored workflows concurrently, preserving record order
+        workflow_ids = fanout_executor.map(
+            start_s3_workflow,
+            [record for record in workflow_records if audit_record_key(record) not in failed_keys]
+        )
+        processed_workflows = [workflow_id for workflow_id in workflow_ids if workflow_id]
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': json_dumps({
                 'message': 'S3 triggered workflows initiated successfully',
                 'workflowIds': processed_workflows,
                 'count': len(processed_workflows)
@@ -82,7 +163,7 @@ def process_api_trigger(event: Dict[str, Any]) -> Dict[str, Any]:
         # Parse request body if present
         body = {}
         if 'body' in event and event['body']:
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
+            body = json_loads(event['body']) if isinstance(event['body'], str) else event['body']
         
         # Get media ID from path parameters or body
         media_id = None
@@ -96,7 +177,7 @@ def process_api_trigger(event: Dict[str, Any]) -> Dict[str, Any]:
         if not media_id:
             return {
                 'statusCode': 400,
-                'body': json.dumps({
+                'body': json_dumps({
                     'error': 'Missing mediaId parameter'
                 })
             }
@@ -106,7 +187,7 @@ def process_api_trigger(event: Dict[str, Any]) -> Dict[str, Any]:
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': json_dumps({
                 'message': 'Media workflow initiated successfully',
                 'mediaId': media_id,
                 'workflowId': workflow_id
@@ -130,7 +211,7 @@ def process_direct_trigger(event: Dict[str, Any]) -> Dict[str, Any]:
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': json_dumps({
                 'message': 'Direct workflow initiated successfully',
                 'workflowId': workflow_id,
                 'workflowType': workflow_type
@@ -141,8 +222,8 @@ def process_direct_trigger(event: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Error processing direct trigger: {str(e)}")
         raise
 
-def trigger_media_workflow_from_s3(record: Dict[str, Any]) -> str:
-    """Trigger media analysis workflow from S3 event."""
+def trigger_media_workflow_from_s3(record: Dict[str, Any], timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Build the workflow record for an S3 event; the caller writes and starts it."""
     try:
         # Extract S3 event details
         s3_info = record['s3']
@@ -150,20 +231,23 @@ def trigger_media_workflow_from_s3(record: Dict[str, Any]) -> str:
         object_key = s3_info['object']['key']
         event_name = record.get('eventName', 'unknown')
         
-        logger.info(f"Triggering workflow for S3 object: {object_key}")
+        logger.debug("Triggering workflow for S3 object: %s", object_key)
         
         # Generate media ID
         media_id = generate_media_id_from_key(object_key)
         
-        # Create workflow execution record
-        workflow_id = str(uuid.uuid4())
+        # A redelivered S3 event maps to the same workflow ID and audit key, so
+        # its record overwrites the original and its execution start is refused
+        idempotency_key = get_s3_idempotency_key(record)
+        workflow_id = str(uuid.uuid5(uuid.NAMESPACE_URL, idempotency_key))
         
         # Store initial workflow state
         workflow_record = {
             'mediaId': media_id,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': get_s3_event_timestamp(record) or timestamp or datetime.utcnow().isoformat(),
             'eventType': 'workflow_initiated',
             'eventSource': 'hlekkr:review_workflow_trigger',
+            'idempotencyKey': idempotency_key,
             'data': {
                 'workflowId': workflow_id,
                 'trigger': 's3_event',
@@ -183,12 +267,37 @@ def trigger_media_workflow_from_s3(record: Dict[str, Any]) -> str:
             }
         }
         
-        audit_table.put_item(Item=workflow_record)
+        return workflow_record
+        
+    except Exception as e:
+        logger.error(f"Error triggering S3 workflow: {str(e)}")
+        return None
+
+def get_s3_idempotency_key(record: Dict[str, Any]) -> str:
+    """Identify an S3 event; the sequencer is unique per object key and event."""
+    s3_info = record['s3']
+    s3_object = s3_info['object']
+    event_marker = s3_object.get('sequencer') or f"{s3_object.get('eTag', '')}@{record.get('eventTime', '')}"
+    return f"s3://{s3_info['bucket']['name']}/{s3_object['key']}#{event_marker}"
+
+def get_s3_event_timestamp(record: Dict[str, Any]) -> Optional[str]:
+    """Convert an S3 eventTime to the audit table's timestamp format."""
+    try:
+        return datetime.strptime(record['eventTime'], '%Y-%m-%dT%H:%M:%S.%fZ').isoformat()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def start_s3_workflow(workflow_record: Dict[str, Any]) -> Optional[str]:
+    """Start the workflow for an S3 workflow record that has been written."""
+    try:
+        media_id = workflow_record['mediaId']
+        workflow_id = workflow_record['data']['workflowId']
+        trigger_details = workflow_record['data']['triggerDetails']
         
         # Start the workflow execution
         execute_workflow_steps(workflow_id, media_id, {
-            'bucket': bucket_name,
-            'objectKey': object_key,
+            'bucket': trigger_details['bucket'],
+            'objectKey': trigger_details['objectKey'],
             'trigger': 's3_event'
         })
         
@@ -197,7 +306,7 @@ def trigger_media_workflow_from_s3(record: Dict[str, Any]) -> str:
         return workflow_id
         
     except Exception as e:
-        logger.error(f"Error triggering S3 workflow: {str(e)}")
+        logger.error(f"Error starting S3 workflow: {str(e)}")
         return None
 
 def trigger_media_workflow_for_id(media_id: str, additional_data: Dict[str, Any] = None) -> str:
@@ -284,21 +393,28 @@ def trigger_batch_workflow(event: Dict[str, Any]) -> str:
         raise
 
 def execute_workflow_steps(workflow_id: str, media_id: str, context: Dict[str, Any]):
-    """Execute the media analysis workflow steps."""
+    """Start the review state machine, which runs detection and trust scoring."""
     try:
-        logger.info(f"Executing workflow steps for {workflow_id}")
-        
-        # Step 1: Deepfake Detection (if not already done)
-        invoke_lambda_async('hlekkr-deepfake-detector', {
-            'mediaId': media_id,
-            'workflowId': workflow_id,
-            'context': context
-        })
-        
-        # Step 2: Trust Score Calculation (will be triggered after deepfake detection)
-        # This could be done via Step Functions or Lambda chaining
+        logger.debug("Executing workflow steps for %s", workflow_id)
+        
+        # The execution is named after the workflow, so one workflow runs at most once
+        try:
+            stepfunctions_client.start_execution(
+                stateMachineArn=REVIEW_STATE_MACHINE_ARN,
+                name=workflow_id,
+                input=json_dumps({
+                    'mediaId': media_id,
+                    'workflowId': workflow_id,
+                    'context': context
+                })
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ExecutionAlreadyExists':
+                raise
+            logger.info(f"Workflow {workflow_id} was already started")
+            return
         
-        logger.info(f"Workflow steps initiated for {workflow_id}")
+        logger.debug("Workflow steps initiated for %s", workflow_id)
         
     except Exception as e:
         logger.error(f"Error executing workflow steps: {str(e)}")
@@ -312,15 +428,21 @@ def execute_batch_processing(workflow_id: str, batch_size: int):
         # Get pending media items for processing
         pending_media = get_pending_media_items(batch_size)
         
-        for media_item in pending_media:
-            media_id = media_item['mediaId']
-            
-            # Trigger individual workflow for each media item
-            invoke_lambda_async('hlekkr-review-workflow-trigger', {
-                'mediaId': media_id,
-                'workflowId': workflow_id,
-                'batchProcessing': True
-            })
+        media_ids = [media_item['mediaId'] for media_item in pending_media]
+        
+        if len(media_ids) > FANOUT_TIER_THRESHOLD:
+            # Hand each shard to a tier-1 invocation so this one returns quickly
+            shard_size = math.isqrt(len(media_ids))
+            shards = [media_ids[start:start + shard_size] for start in range(0, len(media_ids), shard_size)]
+            list(fanout_executor.map(
+                lambda shard: invoke_lambda_async('hlekkr-review-workflow-trigger', {
+                    'fanoutShard': shard,
+                    'workflowId': workflow_id
+                }),
+                shards
+            ))
+        else:
+            launch_batch_workflows(workflow_id, media_ids)
         
         # Update batch workflow status
         update_workflow_status(workflow_id, 'batch_processing', {
@@ -332,6 +454,39 @@ def execute_batch_processing(workflow_id: str, batch_size: int):
         logger.error(f"Error executing batch processing: {str(e)}")
         raise
 
+def process_fanout_shard(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Launch the workflows for one shard of a fanned-out batch."""
+    try:
+        workflow_id = event['workflowId']
+        media_ids = event['fanoutShard']
+        
+        launch_batch_workflows(workflow_id, media_ids)
+        
+        return {
+            'statusCode': 200,
+            'body': json_dumps({
+                'message': 'Batch shard workflows initiated successfully',
+                'workflowId': workflow_id,
+                'count': len(media_ids)
+            })
+        }
+        
+    except Exception as e:
+        logger.error(f"Error processing fan-out shard: {str(e)}")
+        raise
+
+def launch_batch_workflows(workflow_id: str, media_ids: List[str]):
+    """Trigger an individual workflow for each media item, concurrently."""
+    # Only the media ID differs between payloads, so the rest is encoded once
+    payload_tail = b',' + json_dumps_bytes({'workflowId': workflow_id, 'batchProcessing': True})[1:]
+    list(fanout_executor.map(
+        lambda media_id: invoke_lambda_async(
+            'hlekkr-review-workflow-trigger',
+            b'{"mediaId":' + json_dumps_bytes(media_id) + payload_tail
+        ),
+        media_ids
+    ))
+
 def get_media_info(media_id: str) -> Dict[str, Any]:
     """Get media information from audit table."""
     try:
@@ -358,12 +513,14 @@ def get_media_info(media_id: str) -> Dict[str, Any]:
 def get_pending_media_items(limit: int) -> List[Dict[str, Any]]:
     """Get media items pending analysis."""
     try:
-        # Query for media items that need processing
-        response = audit_table.scan(
-            FilterExpression='eventType = :event_type',
+        # Query the event type index, newest first; it reads only matching items
+        response = audit_table.query(
+            IndexName=EVENT_TYPE_INDEX_NAME,
+            KeyConditionExpression='eventType = :event_type',
             ExpressionAttributeValues={
                 ':event_type': 'metadata_extraction'
             },
+            ScanIndexForward=False,
             Limit=limit
         )
         
@@ -373,24 +530,87 @@ def get_pending_media_items(limit: int) -> List[Dict[str, Any]]:
         logger.error(f"Error getting pending media items: {str(e)}")
         return []
 
-def invoke_lambda_async(function_name: str, payload: Dict[str, Any]):
-    """Invoke Lambda function asynchronously."""
+def invoke_lambda_async(function_name: str, payload: Union[Dict[str, Any], bytes]):
+    """Invoke Lambda function asynchronously with a payload dict or pre-encoded JSON bytes."""
     try:
-        # Get full function name with account and region
-        full_function_name = f"{function_name}-{os.environ.get('AWS_ACCOUNT_ID', 'unknown')}-{os.environ.get('AWS_REGION', 'us-east-1')}"
-        
-        response = lambda_client.invoke(
-            FunctionName=full_function_name,
+        response = get_lambda_client().invoke(
+            FunctionName=FUNCTION_NAMES[function_name],
             InvocationType='Event',  # Async invocation
-            Payload=json.dumps(payload)
+            Payload=payload if isinstance(payload, bytes) else json_dumps_bytes(payload)
         )
         
-        logger.info(f"Invoked {function_name} asynchronously")
+        logger.debug("Invoked %s asynchronously", function_name)
         
     except Exception as e:
         logger.error(f"Error invoking Lambda {function_name}: {str(e)}")
         # Don't raise - continue with workflow
 
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, with orjson when it is packaged."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes; DynamoDB Decimals are emitted as numbers."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=float)
+    return json.dumps(obj, default=float, separators=(',', ':')).encode()
+
+def json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string; DynamoDB Decimals are emitted as numbers."""
+    return json_dumps_bytes(obj).decode()
+
+def audit_record_key(record: Dict[str, Any]) -> Tuple[str, str]:
+    """Get the primary key of an audit record."""
+    return record['mediaId'], record['timestamp']
+
+def write_audit_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Write audit records with BatchWriteItem and return those that could not be written."""
+    # Records for the same key keep the last one; BatchWriteItem rejects duplicates
+    records = list({audit_record_key(record): record for record in records}.values())
+    
+    failed_records = []
+    for start in range(0, len(records), AUDIT_BATCH_SIZE):
+        failed_records.extend(batch_write_with_retry(records[start:start + AUDIT_BATCH_SIZE]))
+    
+    if failed_records:
+        logger.error(f"Failed to write {len(failed_records)} audit records: "
+                     f"{[audit_record_key(record) for record in failed_records]}")
+    return failed_records
+
+def batch_write_with_retry(items: List[Dict[str, Any]],
+                           max_attempts: int = AUDIT_WRITE_MAX_ATTEMPTS) -> List[Dict[str, Any]]:
+    """Write up to 25 items, re-submitting unprocessed items until none are left.
+    
+    Returns the items still unwritten after max_attempts or a non-retryable error.
+    """
+    request_items = {AUDIT_TABLE_NAME: [
+        {'PutRequest': {'Item': {name: serialize_attribute(value) for name, value in item.items()}}}
+        for item in items
+    ]}
+    for attempt in range(max_attempts):
+        try:
+            response = dynamodb_client.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems', {})
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in RETRYABLE_WRITE_ERRORS:
+                logger.error(f"Error writing audit records: {str(e)}")
+                break
+        except Exception as e:
+            logger.error(f"Error writing audit records: {str(e)}")
+            break
+        
+        if not request_items.get(AUDIT_TABLE_NAME):
+            return []
+        if attempt + 1 < max_attempts:
+            time.sleep(min(2 ** attempt * 0.05 + random.random() * 0.05, 2.0))
+    
+    return [
+        {name: deserialize_attribute(value) for name, value in request['PutRequest']['Item'].items()}
+        for request in request_items.get(AUDIT_TABLE_NAME, [])
+    ]
+
 def update_workflow_status(workflow_id: str, step: str, data: Dict[str, Any]):
     """Update workflow status in audit table."""
     try:
@@ -416,11 +636,10 @@ def update_workflow_status(workflow_id: str, step: str, data: Dict[str, Any]):
 
 def generate_media_id_from_key(object_key: str) -> str:
     """Generate consistent media ID from S3 object key."""
-    import hashlib
-    
     filename = object_key.split('/')[-1]
     base_name = filename.rsplit('.', 1)[0] if '.' in filename else filename
     
-    # Use hash of full path for consistency
-    path_hash = hashlib.md5(object_key.encode()).hexdigest()[:8]
+    # Use hash of full path for consistency; audit_handler derives the same ID,
+    # so the digest must not change. MD5 is only a key fingerprint here
+    path_hash = hashlib.md5(object_key.encode(), usedforsecurity=False).hexdigest()[:8]
     return f"{base_name}_{path_hash}"
\ No newline at end of file
@@ -4,57 +4,109 @@ Comprehensive Integration Test Runner for Hlekkr Platform
 Runs all integration tests across the deepfake detection pipeline.
 """
 
+import hashlib
 import subprocess
 import sys
 import os
+import signal
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def run_command(command, description):
-    """Run a command and return the result."""
-    print(f"\n{'='*60}")
-    print(f"Running: {description}")
-    print(f"Command: {command}")
-    print(f"{'='*60}")
+# Suites run concurrently; output lines are streamed as they arrive, prefixed
+# with the suite they belong to
+print_lock = threading.Lock()
+
+COMMAND_TIMEOUT_SECONDS = 300
+# Lines kept per command to repeat in a failure report
+OUTPUT_TAIL_LINES = 200
+
+# Test dependencies, installed offline from a wheelhouse keyed on this file's
+# hash when scripts/build_wheelhouse.sh has built one
+TEST_REQUIREMENTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'requirements-test.txt')
+
+def get_install_command():
+    """Get the pip command that installs the test dependencies."""
+    with open(TEST_REQUIREMENTS, 'rb') as f:
+        requirements_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    wheelhouse = os.path.join(os.path.dirname(TEST_REQUIREMENTS), '.wheelhouse', requirements_hash)
+    
+    if os.path.isdir(wheelhouse):
+        return f'pip install --no-index --find-links="{wheelhouse}" -r "{TEST_REQUIREMENTS}"'
+    return f'pip install -r "{TEST_REQUIREMENTS}"'
+
+def print_command_header(command, description):
+    """Print the banner that introduces a command's output."""
+    with print_lock:
+        print(f"\n{'='*60}")
+        print(f"Running: {description}")
+        print(f"Command: {command}")
+        print(f"{'='*60}")
+
+def run_command(command, description, label=None):
+    """Run a command, streaming its output, and return the result."""
+    print_command_header(command, description)
+    prefix = f"[{label}] " if label else ""
     
     start_time = time.time()
     
     try:
-        result = subprocess.run(
+        # A new session lets a timeout kill the shell and everything it started
+        process = subprocess.Popen(
             command,
             shell=True,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=300  # 5 minute timeout
+            bufsize=1,
+            start_new_session=True
         )
+    except Exception as e:
+        with print_lock:
+            print(f"{prefix}❌ ERROR - {str(e)}")
+        return False, 0
+    
+    timed_out = threading.Event()
+    
+    def kill_on_timeout():
+        timed_out.set()
+        os.killpg(process.pid, signal.SIGKILL)
+    
+    timer = threading.Timer(COMMAND_TIMEOUT_SECONDS, kill_on_timeout)
+    timer.start()
+    
+    # Only the tail is kept in memory, however much the command prints
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    try:
+        for line in process.stdout:
+            tail.append(line)
+            with print_lock:
+                sys.stdout.write(prefix + line)
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+    
+    end_time = time.time()
+    duration = end_time - start_time
+    
+    with print_lock:
+        if timed_out.is_set():
+            print(f"{prefix}❌ TIMEOUT - Test took longer than 5 minutes")
+            return False, COMMAND_TIMEOUT_SECONDS
         
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        print(f"Duration: {duration:.2f} seconds")
+        print(f"{prefix}Duration: {duration:.2f} seconds")
         
-        if result.returncode == 0:
-            print("✅ SUCCESS")
-            if result.stdout:
-                print("STDOUT:")
-                print(result.stdout)
+        if returncode == 0:
+            print(f"{prefix}✅ SUCCESS")
         else:
-            print("❌ FAILED")
-            if result.stderr:
-                print("STDERR:")
-                print(result.stderr)
-            if result.stdout:
-                print("STDOUT:")
-                print(result.stdout)
-        
-        return result.returncode == 0, duration
-        
-    except subprocess.TimeoutExpired:
-        print("❌ TIMEOUT - Test took longer than 5 minutes")
-        return False, 300
-    except Exception as e:
-        print(f"❌ ERROR - {str(e)}")
-        return False, 0
+            print(f"{prefix}❌ FAILED")
+            if tail:
+                print(f"{prefix}Last {len(tail)} lines of output:")
+                sys.stdout.writelines(prefix + line for line in tail)
+    
+    return returncode == 0, duration
 
 def main():
     """Run all integration tests."""
@@ -102,7 +154,7 @@ def main():
     # Install dependencies first
     print("\n📦 Installing test dependencies...")
     deps_success, deps_duration = run_command(
-        "pip install pytest moto boto3 pillow exifread mutagen",
+        get_install_command(),
         "Installing test dependencies"
     )
     
@@ -110,13 +162,21 @@ def main():
         print("❌ Failed to install dependencies. Exiting.")
         sys.exit(1)
     
-    # Run each test suite
-    for suite in test_suites:
-        success, duration = run_command(
-            suite['command'],
-            f"{suite['name']} - {suite['description']}"
-        )
-        
+    # Run the test suites concurrently; each keeps its own pytest process,
+    # since every Lambda directory has its own top-level index module
+    suites_start = time.time()
+    with ThreadPoolExecutor(max_workers=len(test_suites)) as executor:
+        outcomes = list(executor.map(
+            lambda suite: run_command(
+                suite['command'],
+                f"{suite['name']} - {suite['description']}",
+                label=suite['name']
+            ),
+            test_suites
+        ))
+    wall_duration = time.time() - suites_start
+    
+    for suite, (success, duration) in zip(test_suites, outcomes):
         results.append({
             'name': suite['name'],
             'success': success,
@@ -124,9 +184,6 @@ def main():
         })
         
         total_duration += duration
-        
-        # Short pause between test suites
-        time.sleep(1)
     
     # Print summary
     print(f"\n{'='*80}")
@@ -140,6 +197,7 @@ def main():
     print(f"Passed: {passed} ✅")
     print(f"Failed: {failed} ❌")
     print(f"Total Duration: {total_duration:.2f} seconds")
+    print(f"Wall Clock Duration: {wall_duration:.2f} seconds")
     print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Detailed results
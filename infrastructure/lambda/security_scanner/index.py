@@ -1,13 +1,22 @@
 import json
 import boto3
 import os
+import mmap
 import hashlib
+import re
 import tempfile
+import shutil
+import socket
+import struct
 import subprocess
 import requests
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from boto3.s3.transfer import TransferConfig
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logger = logging.getLogger()
@@ -17,6 +26,7 @@ logger.setLevel(logging.INFO)
 s3_client = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
 sns_client = boto3.client('sns')
+sqs_client = boto3.client('sqs')
 
 # Environment variables
 AUDIT_TABLE_NAME = os.environ['AUDIT_TABLE_NAME']
@@ -24,9 +34,104 @@ MEDIA_BUCKET_NAME = os.environ['MEDIA_BUCKET_NAME']
 QUARANTINE_BUCKET_NAME = os.environ['QUARANTINE_BUCKET_NAME']
 SECURITY_ALERTS_TOPIC_ARN = os.environ.get('SECURITY_ALERTS_TOPIC_ARN')
 VIRUSTOTAL_API_KEY = os.environ.get('VIRUSTOTAL_API_KEY')
+VT_UPLOAD_QUEUE_URL = os.environ.get('VT_UPLOAD_QUEUE_URL')
+VT_CACHE_TABLE_NAME = os.environ.get('VT_CACHE_TABLE_NAME')
+CLAMD_SOCKET_PATH = os.environ.get('CLAMD_SOCKET_PATH', '/var/run/clamav/clamd.sock')
 
-# DynamoDB table
+# ClamAV settings; clamscan is used when no clamd socket is present
+CLAMD_CHUNK_SIZE = 64 * 1024  # 64KB
+CLAMD_TIMEOUT_SECONDS = 300  # 5 minute timeout
+
+# VirusTotal verdicts are keyed by SHA-256, so they can be reused across scans
+VT_CACHE_TTL_DAYS = 7
+
+# DynamoDB tables
 audit_table = dynamodb.Table(AUDIT_TABLE_NAME)
+vt_cache_table = dynamodb.Table(VT_CACHE_TABLE_NAME) if VT_CACHE_TABLE_NAME else None
+
+# hashlib.file_digest (Python 3.11+) runs the read/update loop in C; older
+# runtimes fall back to reading in HASH_CHUNK_SIZE blocks
+_HAS_FILE_DIGEST = hasattr(hashlib, 'file_digest')
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Objects above the multipart threshold are fetched with parallel ranged GETs
+MULTIPART_THRESHOLD = 8 * 1024 * 1024  # 8MB
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Common file signatures
+FILE_SIGNATURES = {
+    b'\xFF\xD8\xFF': 'jpeg',
+    b'\x89PNG\r\n\x1a\n': 'png',
+    b'GIF87a': 'gif',
+    b'GIF89a': 'gif',
+    b'\x00\x00\x00\x18ftypmp4': 'mp4',
+    b'\x00\x00\x00\x20ftypM4V': 'mp4',
+    b'RIFF': 'avi',  # Could also be WAV
+    b'ID3': 'mp3',
+    b'\xFF\xFB': 'mp3',
+    b'MZ': 'exe',
+    b'PK\x03\x04': 'zip'
+}
+
+# Signatures grouped by their first two bytes for header lookups
+_FILE_SIGNATURES_BY_PREFIX: Dict[bytes, List[Tuple[bytes, str]]] = {}
+for _signature, _file_type in FILE_SIGNATURES.items():
+    _FILE_SIGNATURES_BY_PREFIX.setdefault(_signature[:2], []).append((_signature, _file_type))
+
+# Shared VirusTotal session so warm invocations reuse the TLS connection
+vt_session = requests.Session()
+vt_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+# Local scanners run side by side on the downloaded file
+scanner_executor = ThreadPoolExecutor(max_workers=2)
+
+# Worker pool for the independent post-scan side effects, reused across
+# warm invocations
+side_effect_executor = ThreadPoolExecutor(max_workers=2)
+
+# Signatures looked for near the start of media files, as (regex, threat) pairs
+SUSPICIOUS_SIGNATURES = [
+    (rb'MZ', {
+        'type': 'embedded_executable',
+        'description': 'Windows executable signature found in media file',
+        'severity': 'high'
+    }),
+    (rb'\x7fELF', {
+        'type': 'embedded_executable',
+        'description': 'Linux executable signature found in media file',
+        'severity': 'high'
+    }),
+    (rb'(?i:<script)', {
+        'type': 'embedded_script',
+        'description': 'Script tags found in media file',
+        'severity': 'medium'
+    }),
+    (rb'(?i:<\?php)', {
+        'type': 'embedded_script',
+        'description': 'PHP code found in media file',
+        'severity': 'medium'
+    }),
+    (rb'\xD0\xCF\x11\xE0', {
+        'type': 'embedded_document',
+        'description': 'OLE compound document signature found in media file',
+        'severity': 'medium'
+    })
+]
+
+# One alternation with a group per signature, so a single pass finds them all
+_SUSPICIOUS_SIGNATURE_RE = re.compile(
+    b'|'.join(b'(' + pattern + b')' for pattern, _ in SUSPICIOUS_SIGNATURES)
+)
+_PE_SIGNATURE_RE = re.compile(b'MZ')
 
 def handler(event, context):
     """
@@ -51,12 +156,23 @@ def handler(event, context):
         # Process scan results and take appropriate actions
         action_taken = process_scan_results(media_id, bucket, key, scan_results)
         
-        # Store security audit record
-        store_security_audit(media_id, scan_results, action_taken)
+        # Upload files unknown to VirusTotal in the background, from wherever they ended up
+        virustotal_result = scan_results['scanners'].get('virustotal', {})
+        if virustotal_result.get('status') == 'not_found':
+            upload_location = scan_results.get('quarantineLocation', {'bucket': bucket, 'key': key})
+            if queue_virustotal_upload(media_id, scan_results['fileHash'], upload_location):
+                virustotal_result['status'] = 'queued'
         
-        # Send alerts if threats detected
+        # Store security audit record and send alerts if threats detected, concurrently
+        audit_future = side_effect_executor.submit(store_security_audit, media_id, scan_results, action_taken)
+        alert_future = None
         if scan_results['threatDetected']:
-            send_security_alert(media_id, scan_results)
+            alert_future = side_effect_executor.submit(send_security_alert, media_id, scan_results)
+        
+        # Both must finish before returning; Lambda freezes the environment afterwards
+        audit_future.result()
+        if alert_future:
+            alert_future.result()
         
         return {
             'statusCode': 200,
@@ -100,31 +216,28 @@ def perform_security_scan(media_id: str, bucket: str, key: str) -> Dict[str, Any
         
         # Download file for scanning
         with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+            temp_file_path = temp_file.name
             try:
-                # Download file from S3
-                s3_client.download_fileobj(bucket, key, temp_file)
-                temp_file_path = temp_file.name
+                # Stream file from S3, hashing it on the way to disk
+                file_hash, file_size = download_and_hash(bucket, key, temp_file)
+                temp_file.flush()
                 
-                # Get file information
-                file_stats = os.stat(temp_file_path)
-                scan_results['fileSize'] = file_stats.st_size
+                scan_results['fileSize'] = file_size
+                scan_results['fileHash'] = file_hash
                 
-                # Calculate file hash
-                scan_results['fileHash'] = calculate_file_hash(temp_file_path)
+                # Perform ClamAV scanning and custom threat analysis concurrently;
+                # ClamAV (clamd or clamscan) runs out of process while the custom checks read the file
+                clamav_future = scanner_executor.submit(scan_with_clamav, temp_file_path)
+                custom_future = scanner_executor.submit(perform_custom_threat_analysis, temp_file_path, key)
                 
-                # Perform ClamAV scanning
-                clamav_result = scan_with_clamav(temp_file_path)
-                scan_results['scanners']['clamav'] = clamav_result
+                scan_results['scanners']['clamav'] = clamav_future.result()
+                scan_results['scanners']['custom'] = custom_future.result()
                 
-                # Perform VirusTotal scanning
-                if VIRUSTOTAL_API_KEY:
-                    virustotal_result = scan_with_virustotal(temp_file_path, scan_results['fileHash'])
+                # Consult VirusTotal unless a completed ClamAV scan and the custom checks came back clean
+                if VIRUSTOTAL_API_KEY and should_consult_virustotal(scan_results['scanners']):
+                    virustotal_result = scan_with_virustotal(file_hash)
                     scan_results['scanners']['virustotal'] = virustotal_result
                 
-                # Perform custom threat analysis
-                custom_analysis = perform_custom_threat_analysis(temp_file_path, key)
-                scan_results['scanners']['custom'] = custom_analysis
-                
                 # Aggregate results
                 scan_results = aggregate_scan_results(scan_results)
                 
@@ -153,40 +266,123 @@ def perform_security_scan(media_id: str, bucket: str, key: str) -> Dict[str, Any
             'error': str(e)
         }
 
+def download_and_hash(bucket: str, key: str, file_obj) -> Tuple[str, int]:
+    """Stream an S3 object into file_obj, returning its SHA-256 hash and size.
+    
+    Small objects are hashed while the bytes are written, avoiding a second
+    read from disk. Objects above MULTIPART_THRESHOLD are downloaded with
+    concurrent ranged GETs instead, which arrive out of order and so are
+    hashed from the file once the download completes.
+    """
+    hash_sha256 = hashlib.sha256()
+    file_size = 0
+    
+    # Size the object with a HEAD so large files are fetched only once
+    content_length = s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+    
+    if content_length > MULTIPART_THRESHOLD:
+        s3_client.download_fileobj(bucket, key, file_obj, Config=TRANSFER_CONFIG)
+        file_obj.flush()
+        return calculate_file_hash(file_obj.name), content_length
+    
+    body = s3_client.get_object(Bucket=bucket, Key=key)['Body']
+    try:
+        for chunk in body.iter_chunks(chunk_size=HASH_CHUNK_SIZE):
+            hash_sha256.update(chunk)
+            file_obj.write(chunk)
+            file_size += len(chunk)
+    finally:
+        body.close()
+    
+    return hash_sha256.hexdigest(), file_size
+
 def scan_with_clamav(file_path: str) -> Dict[str, Any]:
-    """Scan file using ClamAV antivirus."""
+    """Scan file using the ClamAV daemon, or clamscan when no daemon is running."""
     try:
         logger.info("Running ClamAV scan")
         
+        # Fall back to forking clamscan when clamd is not available
+        if not os.path.exists(CLAMD_SOCKET_PATH):
+            return scan_with_clamscan(file_path)
+        
+        # Stream file to clamd, which keeps its signature database loaded
+        response = clamd_instream(file_path)
+        
+        threats = []
+        if response.endswith('FOUND'):  # Virus found
+            # Response format: "stream: <signature> FOUND"
+            threat_name = response.split(':', 1)[1].strip().replace(' FOUND', '')
+            threats.append({
+                'type': 'virus',
+                'name': threat_name,
+                'scanner': 'clamav'
+            })
+        elif response.endswith('ERROR'):
+            return {
+                'status': 'error',
+                'message': response,
+                'threats': []
+            }
+        
+        return {
+            'status': 'completed',
+            'response': response,
+            'threatsFound': len(threats),
+            'threats': threats,
+            'scanTime': datetime.utcnow().isoformat()
+        }
+        
+    except socket.timeout:
+        logger.error("ClamAV scan timed out")
+        return {
+            'status': 'timeout',
+            'message': 'ClamAV scan timed out after 5 minutes',
+            'threats': []
+        }
+    except Exception as e:
+        logger.error(f"ClamAV scan error: {str(e)}")
+        return {
+            'status': 'error',
+            'message': str(e),
+            'threats': []
+        }
+
+def scan_with_clamscan(file_path: str) -> Dict[str, Any]:
+    """Scan file with the clamscan command line scanner."""
+    try:
         # Check if ClamAV is available
-        try:
-            subprocess.run(['clamscan', '--version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if not shutil.which('clamscan'):
             return {
                 'status': 'unavailable',
                 'message': 'ClamAV not installed or not available',
                 'threats': []
             }
         
-        # Run ClamAV scan
+        # clamscan reloads its signature database on every run, so this is much slower than clamd
         result = subprocess.run(
             ['clamscan', '--no-summary', file_path],
             capture_output=True,
             text=True,
-            timeout=300  # 5 minute timeout
+            timeout=CLAMD_TIMEOUT_SECONDS
         )
         
         threats = []
         if result.returncode == 1:  # Virus found
             # Parse ClamAV output for threat details
             for line in result.stdout.split('\n'):
-                if 'FOUND' in line:
-                    threat_name = line.split(':')[1].strip().replace(' FOUND', '')
+                if line.endswith('FOUND'):
+                    threat_name = line.rsplit(':', 1)[1].strip().replace(' FOUND', '')
                     threats.append({
                         'type': 'virus',
                         'name': threat_name,
                         'scanner': 'clamav'
                     })
+        elif result.returncode != 0:
+            return {
+                'status': 'error',
+                'message': result.stderr.strip(),
+                'threats': []
+            }
         
         return {
             'status': 'completed',
@@ -211,8 +407,46 @@ def scan_with_clamav(file_path: str) -> Dict[str, Any]:
             'threats': []
         }
 
-def scan_with_virustotal(file_path: str, file_hash: str) -> Dict[str, Any]:
-    """Scan file using VirusTotal API."""
+def clamd_instream(file_path: str) -> str:
+    """Send a file to clamd using the INSTREAM command and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLAMD_TIMEOUT_SECONDS)
+        sock.connect(CLAMD_SOCKET_PATH)
+        sock.sendall(b'zINSTREAM\0')
+        
+        # Each chunk is prefixed with its length; a zero length ends the stream
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CLAMD_CHUNK_SIZE), b""):
+                sock.sendall(struct.pack('!L', len(chunk)) + chunk)
+        sock.sendall(struct.pack('!L', 0))
+        
+        response = b''
+        while not response.endswith(b'\0'):
+            data = sock.recv(4096)
+            if not data:
+                break
+            response += data
+    
+    return response.rstrip(b'\0').decode('utf-8', errors='replace').strip()
+
+def should_consult_virustotal(scanners: Dict[str, Any]) -> bool:
+    """Check whether the file still needs a VirusTotal lookup after the local scanners.
+    
+    The lookup is skipped only when ClamAV actually scanned the file and
+    neither it nor the custom checks found anything. If ClamAV was
+    unavailable, failed or timed out, VirusTotal is the only antivirus
+    verdict, so it is always consulted.
+    """
+    if scanners.get('clamav', {}).get('status') != 'completed':
+        return True
+    
+    return any(
+        scanners.get(name, {}).get('threatsFound', 0) > 0
+        for name in ('clamav', 'custom')
+    )
+
+def scan_with_virustotal(file_hash: str) -> Dict[str, Any]:
+    """Look up file hash in VirusTotal without uploading the file."""
     try:
         logger.info("Running VirusTotal scan")
         
@@ -223,28 +457,25 @@ def scan_with_virustotal(file_path: str, file_hash: str) -> Dict[str, Any]:
                 'threats': []
             }
         
-        # First, check if hash already exists in VirusTotal
+        # Reuse a recent verdict for the same content
+        cached_result = get_cached_virustotal_result(file_hash)
+        if cached_result:
+            return cached_result
+        
+        # Check if hash already exists in VirusTotal
         hash_report = get_virustotal_hash_report(file_hash)
         
         if hash_report and hash_report.get('response_code') == 1:
             # Hash found, use existing report
-            return parse_virustotal_report(hash_report)
-        
-        # Hash not found, upload file for scanning
-        upload_result = upload_to_virustotal(file_path)
-        
-        if upload_result.get('response_code') == 1:
-            # File uploaded successfully, but report may not be ready immediately
-            return {
-                'status': 'submitted',
-                'message': 'File submitted to VirusTotal for analysis',
-                'scan_id': upload_result.get('scan_id'),
-                'threats': []
-            }
+            virustotal_result = parse_virustotal_report(hash_report)
+            if virustotal_result['status'] == 'completed':
+                cache_virustotal_result(file_hash, virustotal_result)
+            return virustotal_result
         
+        # Hash not found, the upload is queued once the file's final location is known
         return {
-            'status': 'error',
-            'message': 'Failed to submit file to VirusTotal',
+            'status': 'not_found',
+            'message': 'File hash not known to VirusTotal',
             'threats': []
         }
         
@@ -256,6 +487,43 @@ def scan_with_virustotal(file_path: str, file_hash: str) -> Dict[str, Any]:
             'threats': []
         }
 
+def get_cached_virustotal_result(file_hash: str) -> Optional[Dict[str, Any]]:
+    """Get a cached VirusTotal verdict for file hash, if one has not expired."""
+    try:
+        if not vt_cache_table:
+            return None
+        
+        response = vt_cache_table.get_item(Key={'fileHash': file_hash})
+        item = response.get('Item')
+        
+        # TTL deletion is lazy, so expired items can still be returned
+        if not item or item.get('ttl', 0) <= datetime.utcnow().timestamp():
+            return None
+        
+        cached_result = json.loads(item['result'])
+        cached_result['cached'] = True
+        return cached_result
+        
+    except Exception as e:
+        logger.error(f"Error reading VirusTotal cache: {str(e)}")
+        return None
+
+def cache_virustotal_result(file_hash: str, virustotal_result: Dict[str, Any]):
+    """Cache a completed VirusTotal verdict for file hash."""
+    try:
+        if not vt_cache_table:
+            return
+        
+        vt_cache_table.put_item(Item={
+            'fileHash': file_hash,
+            'result': json.dumps(virustotal_result),
+            'cachedAt': datetime.utcnow().isoformat(),
+            'ttl': int((datetime.utcnow() + timedelta(days=VT_CACHE_TTL_DAYS)).timestamp())
+        })
+        
+    except Exception as e:
+        logger.error(f"Error caching VirusTotal result: {str(e)}")
+
 def get_virustotal_hash_report(file_hash: str) -> Optional[Dict[str, Any]]:
     """Get existing VirusTotal report for file hash."""
     try:
@@ -265,7 +533,7 @@ def get_virustotal_hash_report(file_hash: str) -> Optional[Dict[str, Any]]:
             'resource': file_hash
         }
         
-        response = requests.get(url, params=params, timeout=30)
+        response = vt_session.get(url, params=params, timeout=30)
         response.raise_for_status()
         
         return response.json()
@@ -274,23 +542,28 @@ def get_virustotal_hash_report(file_hash: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Error getting VirusTotal hash report: {str(e)}")
         return None
 
-def upload_to_virustotal(file_path: str) -> Dict[str, Any]:
-    """Upload file to VirusTotal for scanning."""
+def queue_virustotal_upload(media_id: str, file_hash: str, s3_location: Dict[str, str]) -> bool:
+    """Queue a file for asynchronous upload to VirusTotal."""
     try:
-        url = "https://www.virustotal.com/vtapi/v2/file/scan"
+        if not VT_UPLOAD_QUEUE_URL:
+            logger.warning("VirusTotal upload queue not configured")
+            return False
+        
+        sqs_client.send_message(
+            QueueUrl=VT_UPLOAD_QUEUE_URL,
+            MessageBody=json.dumps({
+                'mediaId': media_id,
+                'fileHash': file_hash,
+                's3Location': s3_location
+            })
+        )
+        
+        logger.info(f"Queued {media_id} for VirusTotal upload")
+        return True
         
-        with open(file_path, 'rb') as f:
-            files = {'file': f}
-            params = {'apikey': VIRUSTOTAL_API_KEY}
-            
-            response = requests.post(url, files=files, params=params, timeout=60)
-            response.raise_for_status()
-            
-            return response.json()
-            
     except Exception as e:
-        logger.error(f"Error uploading to VirusTotal: {str(e)}")
-        return {'response_code': 0, 'error': str(e)}
+        logger.error(f"Error queueing VirusTotal upload: {str(e)}")
+        return False
 
 def parse_virustotal_report(report: Dict[str, Any]) -> Dict[str, Any]:
     """Parse VirusTotal scan report."""
@@ -395,22 +668,8 @@ def check_extension_mismatch(file_path: str, s3_key: str) -> Optional[Dict[str,
 
 def detect_file_type_from_header(header: bytes) -> Optional[str]:
     """Detect file type from file header bytes."""
-    # Common file signatures
-    signatures = {
-        b'\xFF\xD8\xFF': 'jpeg',
-        b'\x89PNG\r\n\x1a\n': 'png',
-        b'GIF87a': 'gif',
-        b'GIF89a': 'gif',
-        b'\x00\x00\x00\x18ftypmp4': 'mp4',
-        b'\x00\x00\x00\x20ftypM4V': 'mp4',
-        b'RIFF': 'avi',  # Could also be WAV
-        b'ID3': 'mp3',
-        b'\xFF\xFB': 'mp3',
-        b'MZ': 'exe',
-        b'PK\x03\x04': 'zip'
-    }
-    
-    for signature, file_type in signatures.items():
+    # Only signatures sharing the header's first two bytes can match
+    for signature, file_type in _FILE_SIGNATURES_BY_PREFIX.get(header[:2], ()):
         if header.startswith(signature):
             return file_type
     
@@ -436,32 +695,15 @@ def check_suspicious_patterns(file_path: str) -> List[Dict[str, Any]]:
     threats = []
     
     try:
-        # Check for executable signatures in media files
+        # Check for executable and script signatures in media files
         with open(file_path, 'rb') as f:
             content = f.read(1024)  # Read first 1KB
-            
-            # Look for executable patterns
-            if b'MZ' in content:  # Windows executable
-                threats.append({
-                    'type': 'embedded_executable',
-                    'description': 'Windows executable signature found in media file',
-                    'severity': 'high'
-                })
-            
-            if b'\x7fELF' in content:  # Linux executable
-                threats.append({
-                    'type': 'embedded_executable',
-                    'description': 'Linux executable signature found in media file',
-                    'severity': 'high'
-                })
-            
-            # Look for script patterns
-            if b'<script' in content.lower():
-                threats.append({
-                    'type': 'embedded_script',
-                    'description': 'Script tags found in media file',
-                    'severity': 'medium'
-                })
+        
+        matched = {match.lastindex - 1 for match in _SUSPICIOUS_SIGNATURE_RE.finditer(content)}
+        threats.extend(
+            dict(threat) for index, (_, threat) in enumerate(SUSPICIOUS_SIGNATURES)
+            if index in matched
+        )
     
     except Exception as e:
         logger.error(f"Suspicious pattern check error: {str(e)}")
@@ -479,18 +721,14 @@ def check_embedded_executables(file_path: str) -> List[Dict[str, Any]]:
         if file_size > 100 * 1024 * 1024:  # 100MB
             return threats
         
-        with open(file_path, 'rb') as f:
-            content = f.read()
-            
+        # Empty files cannot be mapped and have nothing to search
+        if file_size == 0:
+            return threats
+        
+        # Map the file rather than reading it, so only touched pages are loaded
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
             # Look for PE header (Windows executable)
-            pe_positions = []
-            pos = 0
-            while True:
-                pos = content.find(b'MZ', pos)
-                if pos == -1:
-                    break
-                pe_positions.append(pos)
-                pos += 1
+            pe_positions = [match.start() for match in _PE_SIGNATURE_RE.finditer(content)]
             
             if len(pe_positions) > 1:  # More than one PE header suggests embedded executable
                 threats.append({
@@ -547,11 +785,14 @@ def check_size_anomalies(file_path: str, s3_key: str) -> Optional[Dict[str, Any]
 def calculate_file_hash(file_path: str) -> str:
     """Calculate SHA-256 hash of the file."""
     try:
-        hash_sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            if _HAS_FILE_DIGEST:
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            
+            hash_sha256 = hashlib.sha256()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
                 hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+            return hash_sha256.hexdigest()
     except Exception as e:
         logger.error(f"Error calculating file hash: {str(e)}")
         return ""
@@ -604,15 +845,20 @@ def process_scan_results(media_id: str, bucket: str, key: str, scan_results: Dic
             
             # Copy to quarantine bucket
             copy_source = {'Bucket': bucket, 'Key': key}
-            s3_client.copy_object(
-                CopySource=copy_source,
-                Bucket=QUARANTINE_BUCKET_NAME,
-                Key=quarantine_key,
-                MetadataDirective='COPY'
+            s3_client.copy(
+                copy_source,
+                QUARANTINE_BUCKET_NAME,
+                quarantine_key,
+                ExtraArgs={'MetadataDirective': 'COPY'},
+                Config=TRANSFER_CONFIG
             )
             
             # Delete from original bucket
             s3_client.delete_object(Bucket=bucket, Key=key)
+            scan_results['quarantineLocation'] = {
+                'bucket': QUARANTINE_BUCKET_NAME,
+                'key': quarantine_key
+            }
             
             logger.info(f"File {media_id} quarantined due to {threat_level} threat level")
             return 'quarantined'
@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import Mock, patch
+import hashlib
+import io
+import json
+import os
+import subprocess
+import tempfile
+
+# Mock environment variables
+os.environ['AUDIT_TABLE_NAME'] = 'test-audit-table'
+os.environ['MEDIA_BUCKET_NAME'] = 'test-media-bucket'
+os.environ['QUARANTINE_BUCKET_NAME'] = 'test-quarantine-bucket'
+
+# Import after setting environment variables
+from index import (
+    handler, download_and_hash, scan_with_clamav, should_consult_virustotal,
+    MULTIPART_THRESHOLD
+)
+
+class StreamingBody:
+    """Minimal stand-in for botocore's StreamingBody."""
+
+    def __init__(self, data: bytes):
+        self.stream = io.BytesIO(data)
+        self.closed = False
+
+    def iter_chunks(self, chunk_size):
+        while True:
+            chunk = self.stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+class TestSecurityScanner(unittest.TestCase):
+
+    @patch('index.s3_client')
+    def test_download_and_hash_small_object_streams_once(self, mock_s3):
+        """Test that small objects are hashed while a single GET streams them to disk."""
+        data = b'\xFF\xD8\xFF\xE0' + b'x' * 5000
+        body = StreamingBody(data)
+        mock_s3.head_object.return_value = {'ContentLength': len(data)}
+        mock_s3.get_object.return_value = {'Body': body, 'ContentLength': len(data)}
+        
+        with tempfile.NamedTemporaryFile() as temp_file:
+            file_hash, file_size = download_and_hash('bucket', 'key', temp_file)
+            temp_file.flush()
+        
+            with open(temp_file.name, 'rb') as f:
+                self.assertEqual(f.read(), data)
+        
+        self.assertEqual(file_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(file_size, len(data))
+        self.assertTrue(body.closed)
+        mock_s3.get_object.assert_called_once_with(Bucket='bucket', Key='key')
+        mock_s3.download_fileobj.assert_not_called()
+
+    @patch('index.s3_client')
+    def test_download_and_hash_large_object_skips_get_object(self, mock_s3):
+        """Test that large objects are sized with HEAD and fetched only by the transfer manager."""
+        data = b'y' * 1024
+        mock_s3.head_object.return_value = {'ContentLength': MULTIPART_THRESHOLD + 1}
+        mock_s3.download_fileobj.side_effect = lambda bucket, key, file_obj, Config: file_obj.write(data)
+        
+        with tempfile.NamedTemporaryFile() as temp_file:
+            file_hash, file_size = download_and_hash('bucket', 'key', temp_file)
+        
+        self.assertEqual(file_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(file_size, MULTIPART_THRESHOLD + 1)
+        mock_s3.get_object.assert_not_called()
+        mock_s3.download_fileobj.assert_called_once()
+
+    @patch('index.CLAMD_SOCKET_PATH', '/nonexistent/clamd.sock')
+    @patch('index.subprocess.run')
+    @patch('index.shutil.which', return_value='/opt/bin/clamscan')
+    def test_scan_with_clamav_falls_back_to_clamscan(self, mock_which, mock_run):
+        """Test that clamscan is used when no clamd socket exists."""
+        mock_run.return_value = Mock(
+            returncode=1,
+            stdout='/tmp/upload: Eicar-Signature FOUND\n',
+            stderr=''
+        )
+        
+        result = scan_with_clamav('/tmp/upload')
+        
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual(result['threatsFound'], 1)
+        self.assertEqual(result['threats'][0]['name'], 'Eicar-Signature')
+        self.assertEqual(mock_run.call_args[0][0], ['clamscan', '--no-summary', '/tmp/upload'])
+
+    @patch('index.CLAMD_SOCKET_PATH', '/nonexistent/clamd.sock')
+    @patch('index.subprocess.run')
+    @patch('index.shutil.which', return_value=None)
+    def test_scan_with_clamav_unavailable(self, mock_which, mock_run):
+        """Test that ClamAV reports unavailable when neither clamd nor clamscan exists."""
+        result = scan_with_clamav('/tmp/upload')
+        
+        self.assertEqual(result['status'], 'unavailable')
+        mock_run.assert_not_called()
+
+    @patch('index.CLAMD_SOCKET_PATH', '/nonexistent/clamd.sock')
+    @patch('index.subprocess.run', side_effect=subprocess.TimeoutExpired('clamscan', 300))
+    @patch('index.shutil.which', return_value='/opt/bin/clamscan')
+    def test_scan_with_clamav_clamscan_timeout(self, mock_which, mock_run):
+        """Test that a clamscan timeout is reported rather than raised."""
+        result = scan_with_clamav('/tmp/upload')
+        
+        self.assertEqual(result['status'], 'timeout')
+
+    def test_should_consult_virustotal_when_clamav_did_not_run(self):
+        """Test that VirusTotal is consulted whenever ClamAV produced no verdict."""
+        for status in ('unavailable', 'error', 'timeout'):
+            scanners = {
+                'clamav': {'status': status, 'threats': []},
+                'custom': {'status': 'completed', 'threatsFound': 0, 'threats': []}
+            }
+            self.assertTrue(should_consult_virustotal(scanners), status)
+
+    def test_should_consult_virustotal_after_clean_clamav_scan(self):
+        """Test that VirusTotal is skipped only when a completed ClamAV scan and the custom checks are clean."""
+        clean_clamav = {'status': 'completed', 'threatsFound': 0, 'threats': []}
+        
+        self.assertFalse(should_consult_virustotal({
+            'clamav': clean_clamav,
+            'custom': {'status': 'completed', 'threatsFound': 0, 'threats': []}
+        }))
+        self.assertTrue(should_consult_virustotal({
+            'clamav': clean_clamav,
+            'custom': {'status': 'completed', 'threatsFound': 1, 'threats': [{'type': 'embedded_script'}]}
+        }))
+        self.assertTrue(should_consult_virustotal({
+            'clamav': {'status': 'completed', 'threatsFound': 1, 'threats': [{'type': 'virus'}]},
+            'custom': {'status': 'completed', 'threatsFound': 0, 'threats': []}
+        }))
+
+    @patch('index.VT_UPLOAD_QUEUE_URL', 'https://sqs.us-east-1.amazonaws.com/123456789012/vt-uploads')
+    @patch('index.VIRUSTOTAL_API_KEY', 'test-key')
+    @patch('index.get_virustotal_hash_report', return_value={'response_code': 0})
+    @patch('index.perform_custom_threat_analysis')
+    @patch('index.scan_with_clamav')
+    @patch('index.audit_table')
+    @patch('index.sqs_client')
+    @patch('index.s3_client')
+    def test_handler_queues_unknown_file_when_clamav_unavailable(self, mock_s3, mock_sqs, mock_audit_table,
+                                                                 mock_clamav, mock_custom, mock_hash_report):
+        """Test that a clean-looking file is still looked up and queued for upload without ClamAV."""
+        data = b'\xFF\xD8\xFF\xE0' + b'x' * 5000
+        mock_s3.head_object.return_value = {'ContentLength': len(data)}
+        mock_s3.get_object.return_value = {'Body': StreamingBody(data), 'ContentLength': len(data)}
+        mock_clamav.return_value = {'status': 'unavailable', 'message': 'ClamAV not installed', 'threats': []}
+        mock_custom.return_value = {'status': 'completed', 'threatsFound': 0, 'threats': []}
+        
+        result = handler({'mediaId': 'media-1', 's3Location': {'bucket': 'bucket', 'key': 'uploads/a.jpg'}}, None)
+        
+        body = json.loads(result['body'])
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(body['scanResults']['scanners']['virustotal']['status'], 'queued')
+        mock_hash_report.assert_called_once_with(hashlib.sha256(data).hexdigest())
+        message = json.loads(mock_sqs.send_message.call_args[1]['MessageBody'])
+        self.assertEqual(message['mediaId'], 'media-1')
+        self.assertEqual(message['s3Location'], {'bucket': 'bucket', 'key': 'uploads/a.jpg'})
+
+if __name__ == '__main__':
+    unittest.main()
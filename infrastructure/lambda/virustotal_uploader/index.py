@@ -0,0 +1,233 @@
+import json
+import boto3
+import os
+import tempfile
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+import logging
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+s3_client = boto3.client('s3')
+sqs_client = boto3.client('sqs')
+dynamodb = boto3.resource('dynamodb')
+
+# Environment variables
+AUDIT_TABLE_NAME = os.environ['AUDIT_TABLE_NAME']
+VT_UPLOAD_QUEUE_URL = os.environ['VT_UPLOAD_QUEUE_URL']
+VIRUSTOTAL_API_KEY = os.environ.get('VIRUSTOTAL_API_KEY')
+VT_CACHE_TABLE_NAME = os.environ.get('VT_CACHE_TABLE_NAME')
+
+# DynamoDB tables
+audit_table = dynamodb.Table(AUDIT_TABLE_NAME)
+vt_cache_table = dynamodb.Table(VT_CACHE_TABLE_NAME) if VT_CACHE_TABLE_NAME else None
+
+# VirusTotal settings
+VT_MAX_UPLOAD_SIZE = 32 * 1024 * 1024  # 32MB public API limit
+VT_POLL_DELAY_SECONDS = 300  # 5 minutes between report checks
+VT_MAX_POLLS = 12  # Give up after about an hour
+VT_CACHE_TTL_DAYS = 7
+
+# The public API allows 4 requests per minute; the event source runs at most
+# VT_WORKER_CONCURRENCY workers, so each spaces its own calls to share that budget
+VT_REQUESTS_PER_MINUTE = 4
+VT_WORKER_CONCURRENCY = int(os.environ.get('VT_WORKER_CONCURRENCY', '2'))
+VT_MIN_REQUEST_INTERVAL_SECONDS = 60.0 * VT_WORKER_CONCURRENCY / VT_REQUESTS_PER_MINUTE
+
+# Monotonic time of this worker's last VirusTotal call, kept across warm invocations
+_last_vt_request_at: Optional[float] = None
+
+# Shared VirusTotal session so warm invocations reuse the TLS connection
+vt_session = requests.Session()
+vt_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+def handler(event, context):
+    """
+    VirusTotal upload worker.
+    Uploads files the security scanner could not find by hash, then polls for
+    the report by re-queueing itself with a delay and records the verdict.
+    """
+    logger.info(f"Processing {len(event.get('Records', []))} VirusTotal upload messages")
+    
+    failures = []
+    for record in event.get('Records', []):
+        try:
+            process_upload_message(json.loads(record['body']))
+        except Exception as e:
+            logger.error(f"Error processing VirusTotal message {record.get('messageId')}: {str(e)}")
+            failures.append({'itemIdentifier': record['messageId']})
+    
+    return {'batchItemFailures': failures}
+
+def process_upload_message(message: Dict[str, Any]):
+    """Upload a file to VirusTotal or check on a previous upload."""
+    media_id = message['mediaId']
+    file_hash = message['fileHash']
+    
+    if not VIRUSTOTAL_API_KEY:
+        logger.warning("VirusTotal API key not configured, dropping upload request")
+        return
+    
+    if not message.get('scanId'):
+        s3_location = message['s3Location']
+        wait_for_virustotal_slot()
+        upload_result = upload_to_virustotal(s3_location['bucket'], s3_location['key'])
+        
+        if upload_result.get('response_code') != 1:
+            store_virustotal_audit(media_id, file_hash, {
+                'status': 'error',
+                'message': upload_result.get('error', 'Failed to submit file to VirusTotal'),
+                'threats': []
+            })
+            return
+        
+        logger.info(f"Submitted {media_id} to VirusTotal: {upload_result.get('scan_id')}")
+        requeue_message({**message, 'scanId': upload_result.get('scan_id'), 'pollCount': 0})
+        return
+    
+    wait_for_virustotal_slot()
+    report = get_virustotal_hash_report(file_hash)
+    
+    if report and report.get('response_code') == 1:
+        virustotal_result = parse_virustotal_report(report)
+        cache_virustotal_result(file_hash, virustotal_result)
+        store_virustotal_audit(media_id, file_hash, virustotal_result)
+        return
+    
+    poll_count = message.get('pollCount', 0) + 1
+    if poll_count >= VT_MAX_POLLS:
+        store_virustotal_audit(media_id, file_hash, {
+            'status': 'timeout',
+            'message': 'VirusTotal report not available after upload',
+            'scan_id': message['scanId'],
+            'threats': []
+        })
+        return
+    
+    requeue_message({**message, 'pollCount': poll_count})
+
+def wait_for_virustotal_slot():
+    """Sleep until this worker may make its next VirusTotal request."""
+    global _last_vt_request_at
+    
+    now = time.monotonic()
+    if _last_vt_request_at is not None:
+        wait_seconds = _last_vt_request_at + VT_MIN_REQUEST_INTERVAL_SECONDS - now
+        if wait_seconds > 0:
+            logger.info(f"Waiting {wait_seconds:.1f}s for the VirusTotal rate limit")
+            time.sleep(wait_seconds)
+            now = time.monotonic()
+    _last_vt_request_at = now
+
+def requeue_message(message: Dict[str, Any]):
+    """Send a message back to the upload queue to be checked again later."""
+    sqs_client.send_message(
+        QueueUrl=VT_UPLOAD_QUEUE_URL,
+        MessageBody=json.dumps(message),
+        DelaySeconds=VT_POLL_DELAY_SECONDS
+    )
+
+def upload_to_virustotal(bucket: str, key: str) -> Dict[str, Any]:
+    """Download a file from S3 and upload it to VirusTotal for scanning."""
+    try:
+        file_size = s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+        if file_size > VT_MAX_UPLOAD_SIZE:
+            return {'response_code': 0, 'error': f'File size {file_size} exceeds VirusTotal upload limit'}
+        
+        url = "https://www.virustotal.com/vtapi/v2/file/scan"
+        
+        with tempfile.TemporaryFile() as f:
+            s3_client.download_fileobj(bucket, key, f)
+            f.seek(0)
+            
+            files = {'file': (key.split('/')[-1], f)}
+            params = {'apikey': VIRUSTOTAL_API_KEY}
+            
+            response = vt_session.post(url, files=files, params=params, timeout=60)
+            response.raise_for_status()
+            
+            return response.json()
+            
+    except Exception as e:
+        logger.error(f"Error uploading to VirusTotal: {str(e)}")
+        return {'response_code': 0, 'error': str(e)}
+
+def get_virustotal_hash_report(file_hash: str) -> Optional[Dict[str, Any]]:
+    """Get existing VirusTotal report for file hash."""
+    try:
+        url = "https://www.virustotal.com/vtapi/v2/file/report"
+        params = {
+            'apikey': VIRUSTOTAL_API_KEY,
+            'resource': file_hash
+        }
+        
+        response = vt_session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        
+        return response.json()
+        
+    except Exception as e:
+        logger.error(f"Error getting VirusTotal hash report: {str(e)}")
+        return None
+
+def parse_virustotal_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse VirusTotal scan report."""
+    threats = []
+    
+    for scanner, result in report.get('scans', {}).items():
+        if result.get('detected'):
+            threats.append({
+                'type': 'malware',
+                'name': result.get('result', 'Unknown'),
+                'scanner': f'virustotal_{scanner}'
+            })
+    
+    return {
+        'status': 'completed',
+        'positives': report.get('positives', 0),
+        'total': report.get('total', 0),
+        'threatsFound': len(threats),
+        'threats': threats,
+        'scanDate': report.get('scan_date'),
+        'permalink': report.get('permalink')
+    }
+
+def cache_virustotal_result(file_hash: str, virustotal_result: Dict[str, Any]):
+    """Cache the verdict so the security scanner can skip the lookup next time."""
+    if not vt_cache_table:
+        return
+    
+    vt_cache_table.put_item(Item={
+        'fileHash': file_hash,
+        'result': json.dumps(virustotal_result),
+        'cachedAt': datetime.utcnow().isoformat(),
+        'ttl': int((datetime.utcnow() + timedelta(days=VT_CACHE_TTL_DAYS)).timestamp())
+    })
+
+def store_virustotal_audit(media_id: str, file_hash: str, virustotal_result: Dict[str, Any]):
+    """Record the VirusTotal verdict in the audit trail."""
+    audit_record = {
+        'mediaId': media_id,
+        'timestamp': datetime.utcnow().isoformat(),
+        'eventType': 'virustotal_scan',
+        'eventSource': 'hlekkr:virustotal_uploader',
+        'data': {
+            'fileHash': file_hash,
+            'virustotal': virustotal_result,
+            'threatsFound': virustotal_result.get('threatsFound', 0)
+        }
+    }
+    
+    audit_table.put_item(Item=audit_record)
+    logger.info(f"Stored VirusTotal audit record for {media_id}: {virustotal_result['status']}")
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+import os
+
+# Mock environment variables
+os.environ['AUDIT_TABLE_NAME'] = 'test-audit-table'
+os.environ['VT_UPLOAD_QUEUE_URL'] = 'https://sqs.us-east-1.amazonaws.com/123456789012/test-vt-uploads'
+
+# Import after setting environment variables
+import index
+from index import process_upload_message, wait_for_virustotal_slot, VT_MIN_REQUEST_INTERVAL_SECONDS
+
+class TestVirusTotalUploader(unittest.TestCase):
+    
+    def setUp(self):
+        index._last_vt_request_at = None
+
+    def test_min_request_interval_shares_rate_limit(self):
+        """Test that the default worker concurrency keeps calls within 4 per minute."""
+        self.assertEqual(VT_MIN_REQUEST_INTERVAL_SECONDS, 30.0)
+
+    @patch('index.time.sleep')
+    @patch('index.time.monotonic')
+    def test_wait_for_virustotal_slot_spaces_calls(self, mock_monotonic, mock_sleep):
+        """Test that consecutive calls are spaced by the minimum request interval."""
+        mock_monotonic.side_effect = [100.0, 110.0, 130.0, 200.0]
+        
+        wait_for_virustotal_slot()
+        mock_sleep.assert_not_called()
+        
+        wait_for_virustotal_slot()
+        mock_sleep.assert_called_once_with(20.0)
+        
+        mock_sleep.reset_mock()
+        wait_for_virustotal_slot()
+        mock_sleep.assert_not_called()
+
+    @patch('index.VIRUSTOTAL_API_KEY', 'test-key')
+    @patch('index.requeue_message')
+    @patch('index.upload_to_virustotal')
+    @patch('index.wait_for_virustotal_slot')
+    def test_process_upload_message_paces_upload(self, mock_wait, mock_upload, mock_requeue):
+        """Test that uploads wait for a rate limit slot before calling VirusTotal."""
+        mock_upload.return_value = {'response_code': 1, 'scan_id': 'scan-1'}
+        
+        process_upload_message({
+            'mediaId': 'media-1',
+            'fileHash': 'abc123',
+            's3Location': {'bucket': 'bucket', 'key': 'uploads/a.jpg'}
+        })
+        
+        mock_wait.assert_called_once()
+        mock_upload.assert_called_once_with('bucket', 'uploads/a.jpg')
+        self.assertEqual(mock_requeue.call_args[0][0]['scanId'], 'scan-1')
+
+    @patch('index.VIRUSTOTAL_API_KEY', 'test-key')
+    @patch('index.store_virustotal_audit')
+    @patch('index.cache_virustotal_result')
+    @patch('index.get_virustotal_hash_report', return_value={'response_code': 1, 'scans': {}, 'positives': 0, 'total': 60})
+    @patch('index.wait_for_virustotal_slot')
+    def test_process_upload_message_paces_poll(self, mock_wait, mock_report, mock_cache, mock_audit):
+        """Test that report polls also wait for a rate limit slot."""
+        process_upload_message({'mediaId': 'media-1', 'fileHash': 'abc123', 'scanId': 'scan-1', 'pollCount': 2})
+        
+        mock_wait.assert_called_once()
+        mock_report.assert_called_once_with('abc123')
+        self.assertEqual(mock_audit.call_args[0][2]['status'], 'completed')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ import * as lambda from 'aws-cdk-lib/aws-lambda';
 import * as s3 from 'aws-cdk-lib/aws-s3';
 import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
 import * as iam from 'aws-cdk-lib/aws-iam';
+import * as stepfunctions from 'aws-cdk-lib/aws-stepfunctions';
+import * as stepfunctionsTasks from 'aws-cdk-lib/aws-stepfunctions-tasks';
 import { Construct } from 'constructs';
 
 export interface HlekkrApiStackProps extends cdk.StackProps {
@@ -94,6 +96,93 @@ export class HlekkrApiStack extends cdk.Stack {
     props.auditTable.grantReadWriteData(trustScoreCalculator);
     props.auditTable.grantReadWriteData(reviewWorkflowTrigger);
 
+    // Step Functions State Machine for the review workflow started by the trigger
+    const reviewDeepfakeDetectionTask = new stepfunctionsTasks.LambdaInvoke(this, 'ReviewDeepfakeDetectionTask', {
+      lambdaFunction: deepfakeDetector,
+      payload: stepfunctions.TaskInput.fromObject({
+        httpMethod: 'POST',
+        resource: '/media/{mediaId}/analyze',
+        pathParameters: { mediaId: stepfunctions.JsonPath.stringAt('$.mediaId') },
+        workflowId: stepfunctions.JsonPath.stringAt('$.workflowId')
+      }),
+      resultSelector: { 'statusCode.$': '$.Payload.statusCode' },
+      resultPath: '$.deepfakeDetection',
+      retryOnServiceExceptions: true,
+      timeout: cdk.Duration.minutes(10)
+    });
+
+    const reviewTrustScoreTask = new stepfunctionsTasks.LambdaInvoke(this, 'ReviewTrustScoreTask', {
+      lambdaFunction: trustScoreCalculator,
+      payload: stepfunctions.TaskInput.fromObject({
+        mediaId: stepfunctions.JsonPath.stringAt('$.mediaId'),
+        workflowId: stepfunctions.JsonPath.stringAt('$.workflowId')
+      }),
+      resultSelector: { 'statusCode.$': '$.Payload.statusCode' },
+      resultPath: '$.trustScore',
+      retryOnServiceExceptions: true,
+      timeout: cdk.Duration.minutes(5)
+    });
+
+    const reviewDeepfakeDetectionFailed = new stepfunctions.Fail(this, 'ReviewDeepfakeDetectionFailed', {
+      comment: 'Deepfake detection failed',
+      cause: 'Deepfake detection encountered an error'
+    });
+
+    const reviewTrustScoreFailed = new stepfunctions.Fail(this, 'ReviewTrustScoreFailed', {
+      comment: 'Trust score calculation failed',
+      cause: 'Trust score calculation encountered an error'
+    });
+
+    reviewDeepfakeDetectionTask.addCatch(reviewDeepfakeDetectionFailed, {
+      errors: ['States.ALL'],
+      resultPath: '$.error'
+    });
+
+    reviewTrustScoreTask.addCatch(reviewTrustScoreFailed, {
+      errors: ['States.ALL'],
+      resultPath: '$.error'
+    });
+
+    // Both handlers report errors as {'statusCode': 500} instead of raising, so the
+    // catches above only see invocation failures; anything outside 2xx is routed to Fail.
+    // resultSelector guarantees statusCode is present once the task has succeeded.
+    const isSuccessStatus = (statusCodePath: string) => stepfunctions.Condition.and(
+      stepfunctions.Condition.isNumeric(statusCodePath),
+      stepfunctions.Condition.numberGreaterThanEquals(statusCodePath, 200),
+      stepfunctions.Condition.numberLessThan(statusCodePath, 300)
+    );
+
+    const reviewWorkflowComplete = new stepfunctions.Succeed(this, 'ReviewWorkflowComplete', {
+      comment: 'Review workflow completed successfully'
+    });
+
+    const reviewTrustScoreChoice = new stepfunctions.Choice(this, 'ReviewTrustScoreChoice')
+      .when(isSuccessStatus('$.trustScore.statusCode'), reviewWorkflowComplete)
+      .otherwise(reviewTrustScoreFailed);
+
+    const reviewDeepfakeDetectionChoice = new stepfunctions.Choice(this, 'ReviewDeepfakeDetectionChoice')
+      .when(isSuccessStatus('$.deepfakeDetection.statusCode'), reviewTrustScoreTask.next(reviewTrustScoreChoice))
+      .otherwise(reviewDeepfakeDetectionFailed);
+
+    const reviewWorkflowDefinition = reviewDeepfakeDetectionTask
+      .next(reviewDeepfakeDetectionChoice);
+
+    const reviewWorkflowStateMachine = new stepfunctions.StateMachine(this, 'HlekkrReviewWorkflow', {
+      stateMachineName: `hlekkr-review-workflow-${this.account}-${this.region}`,
+      definition: reviewWorkflowDefinition,
+      timeout: cdk.Duration.minutes(30),
+      tracingEnabled: true
+    });
+
+    // The workflow trigger starts executions and fans batches out to itself
+    reviewWorkflowStateMachine.grantStartExecution(reviewWorkflowTrigger);
+    reviewWorkflowTrigger.addEnvironment('REVIEW_STATE_MACHINE_ARN', reviewWorkflowStateMachine.stateMachineArn);
+    reviewWorkflowTrigger.addToRolePolicy(new iam.PolicyStatement({
+      effect: iam.Effect.ALLOW,
+      actions: ['lambda:InvokeFunction'],
+      resources: [`arn:aws:lambda:${this.region}:${this.account}:function:hlekkr-review-workflow-trigger-${this.account}-${this.region}`]
+    }));
+
     // Add Bedrock permissions for deepfake detection
     deepfakeDetector.addToRolePolicy(new iam.PolicyStatement({
       effect: iam.Effect.ALLOW,
@@ -2,6 +2,7 @@ import * as cdk from 'aws-cdk-lib';
 import * as s3 from 'aws-cdk-lib/aws-s3';
 import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
 import * as s3n from 'aws-cdk-lib/aws-s3-notifications';
 import * as iam from 'aws-cdk-lib/aws-iam';
 import * as sns from 'aws-cdk-lib/aws-sns';
@@ -264,7 +265,11 @@ export class HlekkrMvpStack extends cdk.Stack {
         MEDIA_BUCKET_NAME: this.mediaUploadsBucket.bucketName,
         QUARANTINE_BUCKET_NAME: this.quarantineBucket.bucketName,
         SECURITY_ALERTS_TOPIC_ARN: this.securityAlertsTopic.topicArn,
-        VIRUSTOTAL_API_KEY: '' // Set this via environment variable or parameter store
+        VIRUSTOTAL_API_KEY: '', // Set this via environment variable or parameter store
+        // Socket a clamd daemon would listen on. No daemon is provisioned yet (the ClamAV
+        // layer below ships Python helpers only), so the scanner falls back to clamscan when
+        // it is on PATH and otherwise reports ClamAV as unavailable
+        CLAMD_SOCKET_PATH: '/tmp/clamd.sock'
       },
       layers: [
         // Add layer for ClamAV if needed
@@ -298,6 +303,69 @@ export class HlekkrMvpStack extends cdk.Stack {
     this.auditTable.grantWriteData(this.securityScanner);
     this.securityAlertsTopic.grantPublish(this.securityScanner);
 
+    // Cache of VirusTotal verdicts keyed by file SHA-256
+    const virusTotalCacheTable = new dynamodb.Table(this, 'HlekkrVirusTotalCacheTable', {
+      tableName: `hlekkr-virustotal-cache-${this.account}-${this.region}`,
+      partitionKey: { name: 'fileHash', type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      encryption: dynamodb.TableEncryption.AWS_MANAGED,
+      timeToLiveAttribute: 'ttl',
+      removalPolicy: cdk.RemovalPolicy.DESTROY // Entries can be rebuilt from VirusTotal
+    });
+
+    this.securityScanner.addEnvironment('VT_CACHE_TABLE_NAME', virusTotalCacheTable.tableName);
+    virusTotalCacheTable.grantReadWriteData(this.securityScanner);
+
+    // Queue of files unknown to VirusTotal, uploaded off the scan's critical path
+    const virusTotalUploadQueue = new sqs.Queue(this, 'HlekkrVirusTotalUploadQueue', {
+      queueName: `hlekkr-virustotal-upload-queue-${this.account}-${this.region}`,
+      visibilityTimeout: cdk.Duration.minutes(6), // Longer than the worker timeout
+      retentionPeriod: cdk.Duration.days(4),
+      deadLetterQueue: {
+        queue: new sqs.Queue(this, 'HlekkrVirusTotalUploadDLQ', {
+          queueName: `hlekkr-virustotal-upload-dlq-${this.account}-${this.region}`,
+          retentionPeriod: cdk.Duration.days(14),
+          encryption: sqs.QueueEncryption.SQS_MANAGED
+        }),
+        maxReceiveCount: 3
+      },
+      encryption: sqs.QueueEncryption.SQS_MANAGED
+    });
+
+    // VirusTotal upload worker Lambda function. The event source caps how many workers
+    // run at once and each worker spaces its API calls to match, staying within the
+    // public API's 4 requests per minute without throttling the SQS poller
+    const virusTotalWorkerConcurrency = 2; // Lowest maxConcurrency SQS event sources accept
+    const virusTotalUploader = new lambda.Function(this, 'HlekkrVirusTotalUploader', {
+      functionName: `hlekkr-virustotal-uploader-${this.account}-${this.region}`,
+      runtime: lambda.Runtime.PYTHON_3_9,
+      handler: 'index.handler',
+      code: lambda.Code.fromAsset('../lambda/virustotal_uploader'),
+      timeout: cdk.Duration.minutes(5),
+      memorySize: 512,
+      environment: {
+        AUDIT_TABLE_NAME: this.auditTable.tableName,
+        VT_UPLOAD_QUEUE_URL: virusTotalUploadQueue.queueUrl,
+        VT_WORKER_CONCURRENCY: String(virusTotalWorkerConcurrency),
+        VT_CACHE_TABLE_NAME: virusTotalCacheTable.tableName,
+        VIRUSTOTAL_API_KEY: '' // Set this via environment variable or parameter store
+      }
+    });
+
+    virusTotalUploader.addEventSource(new lambdaEventSources.SqsEventSource(virusTotalUploadQueue, {
+      batchSize: 1,
+      maxConcurrency: virusTotalWorkerConcurrency,
+      reportBatchItemFailures: true
+    }));
+
+    this.securityScanner.addEnvironment('VT_UPLOAD_QUEUE_URL', virusTotalUploadQueue.queueUrl);
+    virusTotalUploadQueue.grantSendMessages(this.securityScanner);
+    virusTotalUploadQueue.grantSendMessages(virusTotalUploader);
+    this.mediaUploadsBucket.grantRead(virusTotalUploader);
+    this.quarantineBucket.grantRead(virusTotalUploader);
+    this.auditTable.grantWriteData(virusTotalUploader);
+    virusTotalCacheTable.grantWriteData(virusTotalUploader);
+
     // Grant permissions to metadata extractor
     this.mediaUploadsBucket.grantRead(this.metadataExtractor);
     this.auditTable.grantWriteData(this.metadataExtractor);
@@ -965,6 +1033,21 @@ export class HlekkrMvpStack extends cdk.Stack {
     // HITL Review Workflow Infrastructure
     // ========================================
 
+    // DynamoDB creates at most one GSI per table update, so on a stack that
+    // predates the sparse review queue indexes they go out in separate deploys:
+    //   1. cdk deploy -c reviewQueueIndexStage=1   (adds ModeratorActiveIndex)
+    //   2. cdk deploy                              (adds TimeoutShardIndex)
+    // New stacks create every index together with the table.
+    const reviewQueueIndexStage = Number(this.node.tryGetContext('reviewQueueIndexStage') ?? 2);
+
+    // Switched on with -c reviewQueueSparseIndexesReady=true once both indexes
+    // exist and the lifecycle manager's backfill_review_index_keys action has
+    // run; until then workload counts and the timeout sweep use the original indexes
+    const reviewQueueSparseIndexesReady = String(this.node.tryGetContext('reviewQueueSparseIndexesReady')) === 'true';
+    if (reviewQueueSparseIndexesReady && reviewQueueIndexStage < 2) {
+      throw new Error('reviewQueueSparseIndexesReady requires both sparse review queue indexes (reviewQueueIndexStage 2)');
+    }
+
     // Review Queue DynamoDB Table
     this.reviewQueueTable = new dynamodb.Table(this, 'HlekkrReviewQueue', {
       tableName: `hlekkr-review-queue-${this.account}-${this.region}`,
@@ -989,6 +1072,28 @@ export class HlekkrMvpStack extends cdk.Stack {
       sortKey: { name: 'createdAt', type: dynamodb.AttributeType.STRING }
     });
 
+    // Sparse index of active assignments: activeSortKey is only set while a
+    // review is assigned or in progress, so workload counts skip finished reviews
+    this.reviewQueueTable.addGlobalSecondaryIndex({
+      indexName: 'ModeratorActiveIndex',
+      partitionKey: { name: 'assignedModerator', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'activeSortKey', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.KEYS_ONLY
+    });
+
+    // Sparse, sharded index of active review deadlines: timeoutShard is only
+    // set while a review is assigned, so the timeout sweep reads just the
+    // overdue reviews and can query the shards in parallel
+    if (reviewQueueIndexStage >= 2) {
+      this.reviewQueueTable.addGlobalSecondaryIndex({
+        indexName: 'TimeoutShardIndex',
+        partitionKey: { name: 'timeoutShard', type: dynamodb.AttributeType.NUMBER },
+        sortKey: { name: 'timeoutAtEpoch', type: dynamodb.AttributeType.NUMBER },
+        projectionType: dynamodb.ProjectionType.INCLUDE,
+        nonKeyAttributes: ['assignedModerator', 'priority', 'mediaId']
+      });
+    }
+
     this.reviewQueueTable.addGlobalSecondaryIndex({
       indexName: 'PriorityIndex',
       partitionKey: { name: 'priority', type: dynamodb.AttributeType.STRING },
@@ -1190,13 +1295,18 @@ export class HlekkrMvpStack extends cdk.Stack {
       runtime: lambda.Runtime.PYTHON_3_9,
       handler: 'index.handler',
       code: lambda.Code.fromAsset('../lambda/review_lifecycle_manager'),
+      // Graviton: faster cold starts and cheaper duration for the pure-Python paths;
+      // if orjson is ever bundled into the asset its wheel must be built for aarch64
+      // (without bundling the handler falls back to stdlib json)
+      architecture: lambda.Architecture.ARM_64,
       timeout: cdk.Duration.minutes(10),
       memorySize: 1024,
       environment: {
         REVIEW_QUEUE_TABLE_NAME: this.reviewQueueTable.tableName,
         MODERATOR_PROFILE_TABLE_NAME: this.moderatorProfileTable.tableName,
         REVIEW_DECISION_TABLE_NAME: this.reviewDecisionTable.tableName,
-        MODERATOR_ALERTS_TOPIC_ARN: this.moderatorAlertsTopic.topicArn
+        MODERATOR_ALERTS_TOPIC_ARN: this.moderatorAlertsTopic.topicArn,
+        REVIEW_QUEUE_SPARSE_INDEXES_READY: String(reviewQueueSparseIndexesReady)
       }
     });
 
@@ -1206,6 +1316,18 @@ export class HlekkrMvpStack extends cdk.Stack {
     this.reviewDecisionTable.grantReadWriteData(this.reviewLifecycleManager);
     this.moderatorAlertsTopic.grantPublish(this.reviewLifecycleManager);
 
+    // Cheap calls used to open the DynamoDB and SNS connections during init
+    this.reviewLifecycleManager.addToRolePolicy(new iam.PolicyStatement({
+      effect: iam.Effect.ALLOW,
+      actions: ['dynamodb:DescribeEndpoints'],
+      resources: ['*']
+    }));
+    this.reviewLifecycleManager.addToRolePolicy(new iam.PolicyStatement({
+      effect: iam.Effect.ALLOW,
+      actions: ['sns:GetTopicAttributes'],
+      resources: [this.moderatorAlertsTopic.topicArn]
+    }));
+
     // Grant EventBridge permissions for scheduling
     this.reviewLifecycleManager.addToRolePolicy(new iam.PolicyStatement({
       effect: iam.Effect.ALLOW,
@@ -1218,6 +1340,21 @@ export class HlekkrMvpStack extends cdk.Stack {
       resources: ['*']
     }));
 
+    // Hourly reset of moderator workload counters that drifted from the review queue;
+    // the handler dispatches scheduled tasks on the detail-type
+    const workloadReconcileRule = new events.Rule(this, 'HlekkrWorkloadReconcileRule', {
+      ruleName: `hlekkr-workload-reconcile-${this.account}-${this.region}`,
+      description: 'Hourly moderator workload counter reconciliation',
+      schedule: events.Schedule.rate(cdk.Duration.hours(1))
+    });
+
+    workloadReconcileRule.addTarget(new eventsTargets.LambdaFunction(this.reviewLifecycleManager, {
+      event: events.RuleTargetInput.fromObject({
+        source: 'aws.events',
+        'detail-type': 'workload-reconcile'
+      })
+    }));
+
     // Review Completion Validator Lambda Function
     this.reviewCompletionValidator = new lambda.Function(this, 'HlekkrReviewCompletionValidator', {
       functionName: `hlekkr-review-completion-validator-${this.account}-${this.region}`,
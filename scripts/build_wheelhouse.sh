@@ -0,0 +1,24 @@
+#!/bin/bash
+
+# Test Dependency Wheelhouse Builder
+# Downloads the integration test dependencies once so run_integration_tests.py
+# can install them offline. The wheelhouse is keyed on the requirements hash;
+# cache infrastructure/lambda/.wheelhouse/ between CI runs.
+
+set -e
+
+cd "$(dirname "$0")/../infrastructure/lambda"
+
+REQUIREMENTS=requirements-test.txt
+REQUIREMENTS_HASH=$(sha256sum "$REQUIREMENTS" | cut -c1-16)
+WHEELHOUSE=".wheelhouse/$REQUIREMENTS_HASH"
+
+if [ -d "$WHEELHOUSE" ]; then
+  echo "✅ Wheelhouse up to date: $WHEELHOUSE"
+  exit 0
+fi
+
+echo "📦 Building wheelhouse $WHEELHOUSE..."
+pip download -d "$WHEELHOUSE.tmp" -r "$REQUIREMENTS"
+mv "$WHEELHOUSE.tmp" "$WHEELHOUSE"
+echo "✅ Wheelhouse ready: $WHEELHOUSE"